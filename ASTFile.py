@@ -0,0 +1,597 @@
+#!/usr/bin/env python2
+
+import os
+import gc
+import math
+import zlib
+import struct
+from StringIO import StringIO
+import AST
+from Exceptions import ASTFileError
+
+# Programs parsed ahead of time, in a compact binary file. The file holds a header and the
+# top-level statements, each preceded by its size, so that a Decoder hands out every statement
+# as soon as its bytes are read:
+#
+#   'MAST', version, then line of the program, (size, statement) for each statement and 0
+#
+# A node is a byte of kind followed by its fields. Sizes, counts and lines are varints; a line
+# is written as the difference from the line written before it, zigzag encoded, plus one (0 is
+# None), and only for nodes not on that line, which have the top bit of their kind set. Names and strings go to one table and operators to another:
+# the first occurrence of a text writes its index, which is the size of the table, and the
+# text; the following ones only its index. An int is a varint, a float is written as decimal
+# digits and exponent, two varints, from its shortest repr. Vectors and matrices of number
+# literals, possibly negated, are packed: one line for all their numbers, then the numbers, with
+# the lowest bit of every int or of the digits of every float set when it is negated.
+#
+# All but the header is compressed with zlib.
+
+magic = 'MAST'
+version = 1
+
+header = struct.Struct('<4sB')
+new_line = 0x80
+double = struct.Struct('<d')
+
+(NONE, INSTRUCTIONS, BLOCK, FLOW_KEYWORD, PRINT, RETURN, STRING, VECTOR, MATRIX, REFERENCE,
+ FUNCTION_CALL, WHILE, FOR, VARIABLE, IF, BIN_EXPR, ARITHMETIC_OPERATION, ASSIGNMENT, COMPARISON,
+ INT_NUM, FLOAT_NUM, UNARY_EXPR, ERROR, INT_VECTOR, FLOAT_VECTOR, INT_MATRIX, FLOAT_MATRIX,
+ DOUBLE_NUM) = range(28)
+
+binary_kinds = {
+    AST.BinExpr: BIN_EXPR,
+    AST.ArithmeticOperation: ARITHMETIC_OPERATION,
+    AST.Assignment: ASSIGNMENT,
+    AST.Comparison: COMPARISON
+}
+
+
+def zigzag(n):
+    return n << 1 if n >= 0 else (-n << 1) - 1
+
+
+def finite(value):
+    return not (math.isinf(value) or math.isnan(value))
+
+
+def decimal(value):
+    # (digits, exponent) of the shortest decimal form of finite float <value> without its sign
+    mantissa, _, exponent = repr(abs(value)).partition('e')
+    whole, _, fraction = mantissa.partition('.')
+    digits = int(whole + fraction)
+    exponent = int(exponent or 0) - len(fraction)
+    if digits == 0:
+        return 0, 0
+    while digits % 10 == 0:
+        digits //= 10
+        exponent += 1
+    return digits, exponent
+
+
+def literal(node):
+    # (class, number, negated, line of the number) of a number literal or of its negation on
+    # the same line, None for any other node
+    negated = isinstance(node, AST.UnaryExpr) and node.operation == 'NEGATE'
+    number = node.operand if negated else node
+    if number.__class__ is AST.IntNum:
+        if type(number.value) not in (int, long) or number.value < 0:
+            return None
+    elif number.__class__ is AST.FloatNum:
+        if type(number.value) is not float or math.copysign(1, number.value) < 0 or not finite(number.value):
+            return None
+    else:
+        return None
+    if negated and number.lineno != node.lineno:
+        return None
+    return number.__class__, number.value, negated, number.lineno
+
+
+def packed_rows(rows):
+    # (class, line, literals) when <rows> are lists of literals of one class on one line and
+    # of one size, None otherwise
+    literals = [literal(e) for row in rows for e in row]
+    if not literals or None in literals or any(len(row) != len(rows[0]) for row in rows):
+        return None
+    number_class, _, _, lineno = literals[0]
+    if any(l[0] is not number_class or l[3] != lineno for l in literals):
+        return None
+    return number_class, lineno, literals
+
+
+class Encoder(object):
+
+    def __init__(self):
+        self.out = bytearray()
+        self.lineno = 0
+        self.strings = {}
+        self.operators = {}
+
+    def varint(self, n):
+        out = self.out
+        while n > 0x7f:
+            out.append(n & 0x7f | 0x80)
+            n >>= 7
+        out.append(n)
+
+    def line(self, lineno):
+        if lineno is None:
+            self.out.append(0)
+        else:
+            self.varint(zigzag(lineno - self.lineno) + 1)
+            self.lineno = lineno
+
+    def text(self, table, value):
+        index = table.get(value)
+        if index is not None:
+            self.varint(index)
+            return
+        table[value] = len(table)
+        self.varint(table[value])
+        self.varint(len(value))
+        self.out.extend(value)
+
+    def start(self, kind, node):
+        if node.lineno == self.lineno:
+            self.out.append(kind)
+        else:
+            self.out.append(kind | new_line)
+            self.line(node.lineno)
+
+    def node(self, node):
+        if node is None:
+            self.out.append(NONE)
+        else:
+            getattr(self, 'encode_' + node.__class__.__name__)(node)
+
+    def nodes(self, nodes):
+        self.varint(len(nodes))
+        for n in nodes:
+            self.node(n)
+
+    def real(self, value, negated):
+        digits, exponent = decimal(value)
+        self.varint(digits << 1 | negated)
+        self.varint(zigzag(exponent))
+
+    def numbers(self, number_class, literals):
+        if number_class is AST.IntNum:
+            for _, value, negated, _ in literals:
+                self.varint(value << 1 | negated)
+        else:
+            for _, value, negated, _ in literals:
+                self.real(value, negated)
+
+    def encode_Instructions(self, node):
+        self.start(INSTRUCTIONS, node)
+        self.nodes(node.nodes)
+
+    def encode_Block(self, node):
+        self.start(BLOCK, node)
+        self.node(node.content)
+
+    def encode_FlowKeyword(self, node):
+        self.start(FLOW_KEYWORD, node)
+        self.text(self.operators, node.keyword)
+
+    def encode_Print(self, node):
+        self.start(PRINT, node)
+        self.nodes(node.arguments)
+
+    def encode_Return(self, node):
+        self.start(RETURN, node)
+        self.node(node.value)
+
+    def encode_String(self, node):
+        self.start(STRING, node)
+        self.text(self.strings, node.value)
+
+    def encode_Vector(self, node):
+        packed = packed_rows([node.elements])
+        if packed is None:
+            self.start(VECTOR, node)
+            self.nodes(node.elements)
+            return
+        number_class, lineno, literals = packed
+        self.start(INT_VECTOR if number_class is AST.IntNum else FLOAT_VECTOR, node)
+        self.line(lineno)
+        self.varint(len(literals))
+        self.numbers(number_class, literals)
+
+    def encode_Matrix(self, node):
+        rows = node.elements
+        packed = None
+        if rows and all(row.__class__ is AST.Vector and row.lineno == rows[0].lineno for row in rows):
+            packed = packed_rows([row.elements for row in rows])
+        if packed is None:
+            self.start(MATRIX, node)
+            self.nodes(rows)
+            return
+        number_class, lineno, literals = packed
+        self.start(INT_MATRIX if number_class is AST.IntNum else FLOAT_MATRIX, node)
+        self.line(rows[0].lineno)
+        self.line(lineno)
+        self.varint(len(rows))
+        self.varint(len(rows[0].elements))
+        self.numbers(number_class, literals)
+
+    def encode_Reference(self, node):
+        self.start(REFERENCE, node)
+        self.node(node.container)
+        self.nodes(node.coords)
+
+    def encode_FunctionCall(self, node):
+        self.start(FUNCTION_CALL, node)
+        self.text(self.operators, node.name)
+        # the arguments are an Error node after a syntax error in them
+        if isinstance(node.arguments, list):
+            self.varint(len(node.arguments) + 1)
+            for n in node.arguments:
+                self.node(n)
+        else:
+            self.varint(0)
+            self.node(node.arguments)
+
+    def encode_While(self, node):
+        self.start(WHILE, node)
+        self.node(node.condition)
+        self.node(node.body)
+
+    def encode_For(self, node):
+        self.start(FOR, node)
+        self.node(node.iterator)
+        self.node(node.range.start)
+        self.node(node.range.end)
+        self.node(node.body)
+
+    def encode_Variable(self, node):
+        self.start(VARIABLE, node)
+        self.text(self.strings, node.name)
+
+    def encode_If(self, node):
+        self.start(IF, node)
+        self.node(node.condition)
+        self.node(node.body)
+        self.node(node.else_body)
+
+    def encode_BinExpr(self, node):
+        self.start(binary_kinds[node.__class__], node)
+        self.text(self.operators, node.op)
+        self.node(node.left)
+        self.node(node.right)
+
+    encode_ArithmeticOperation = encode_Assignment = encode_Comparison = encode_BinExpr
+
+    def encode_IntNum(self, node):
+        self.start(INT_NUM, node)
+        self.varint(zigzag(node.value))
+
+    def encode_FloatNum(self, node):
+        if not finite(node.value):
+            self.start(DOUBLE_NUM, node)
+            self.out.extend(double.pack(node.value))
+            return
+        self.start(FLOAT_NUM, node)
+        self.real(node.value, math.copysign(1, node.value) < 0)
+
+    def encode_UnaryExpr(self, node):
+        self.start(UNARY_EXPR, node)
+        self.text(self.operators, node.operation)
+        self.node(node.operand)
+
+    def encode_Error(self, node):
+        self.out.append(ERROR)
+
+
+def write(out, ast):
+    """Writes the program <ast>, an Instructions node as parsed, to file <out>."""
+    encoder = Encoder()
+    compressor = zlib.compressobj()
+    out.write(header.pack(magic, version))
+    encoder.line(ast.lineno)
+    out.write(compressor.compress(str(encoder.out)))
+    for statement in ast.nodes:
+        encoder.out = bytearray()
+        encoder.node(statement)
+        body = encoder.out
+        encoder.out = bytearray()
+        encoder.varint(len(body))
+        out.write(compressor.compress(str(encoder.out + body)))
+    out.write(compressor.compress('\0'))
+    out.write(compressor.flush())
+
+
+def encode(ast):
+    out = StringIO()
+    write(out, ast)
+    return out.getvalue()
+
+
+class Decoder(object):
+    """Iterator over the top-level statements of the program in file <stream>, decoded as
+    their bytes are read. lineno is the line of the program's Instructions node."""
+
+    chunk = 1 << 16
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.inflater = zlib.decompressobj()
+        self.data = bytearray()
+        self.position = 0
+        self.end = False  # of the stream
+        self.done = False  # with the statements
+        self.lineno = 0
+        self.strings = []
+        self.operators = []
+        self.readers = [getattr(self, 'read_' + name.lower()) for name in (
+            'none', 'instructions', 'block', 'flow_keyword', 'print', 'return', 'string', 'vector',
+            'matrix', 'reference', 'function_call', 'while', 'for', 'variable', 'if', 'bin_expr',
+            'arithmetic_operation', 'assignment', 'comparison', 'int_num', 'float_num', 'unary_expr',
+            'error', 'int_vector', 'float_vector', 'int_matrix', 'float_matrix', 'double_num')]
+        start = stream.read(header.size)
+        if len(start) < header.size or not start.startswith(magic):
+            raise ASTFileError("not a compiled program")
+        file_version = header.unpack(start)[1]
+        if file_version != version:
+            raise ASTFileError("compiled program version {} is not supported".format(file_version))
+        self.fill(10)
+        self.program_lineno = self.line()
+
+    def fill(self, size):
+        # reads until <size> bytes follow the position, False if the stream ends before
+        data = self.data
+        if self.position:
+            del data[:self.position]
+            self.position = 0
+        while len(data) < size and not self.end:
+            part = self.stream.read(self.chunk)
+            try:
+                if part:
+                    data.extend(self.inflater.decompress(part))
+                else:
+                    data.extend(self.inflater.flush())
+                    self.end = True
+            except zlib.error:
+                raise ASTFileError("corrupt compiled program")
+        return len(data) >= size
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        if self.done:
+            raise StopIteration
+        self.fill(10)
+        try:
+            size = self.varint()
+        except IndexError:
+            raise ASTFileError("compiled program ends too early")
+        if size == 0:
+            self.done = True
+            raise StopIteration
+        if not self.fill(size):
+            raise ASTFileError("compiled program ends too early")
+        try:
+            statement = self.node()
+        except (IndexError, ValueError, struct.error):
+            raise ASTFileError("corrupt compiled program")
+        if self.position != size:
+            raise ASTFileError("corrupt compiled program")
+        return statement
+
+    # Fields
+
+    def varint(self):
+        data = self.data
+        position = self.position
+        byte = data[position]
+        position += 1
+        if byte < 0x80:
+            self.position = position
+            return byte
+        result, shift = byte & 0x7f, 7
+        while byte & 0x80:
+            byte = data[position]
+            position += 1
+            result |= (byte & 0x7f) << shift
+            shift += 7
+        self.position = position
+        return result
+
+    def line(self):
+        delta = self.varint()
+        if delta == 0:
+            return None
+        delta -= 1
+        self.lineno += delta >> 1 if not delta & 1 else -((delta + 1) >> 1)
+        return self.lineno
+
+    def real(self):
+        # (float, whether negated)
+        n = self.varint()
+        exponent = self.varint()
+        exponent = exponent >> 1 if not exponent & 1 else -((exponent + 1) >> 1)
+        return float('{}e{}'.format(n >> 1, exponent)), n & 1
+
+    def take(self, size):
+        start = self.position
+        self.position += size
+        if self.position > len(self.data):
+            raise IndexError()
+        return str(self.data[start:self.position])
+
+    def text(self, table):
+        index = self.varint()
+        if index < len(table):
+            return table[index]
+        if index != len(table):
+            raise ValueError()
+        table.append(self.take(self.varint()))
+        return table[index]
+
+    def node(self):
+        position = self.position
+        kind = self.data[position]
+        self.position = position + 1
+        if kind & new_line:
+            return self.readers[kind & ~new_line](self.line())
+        return self.readers[kind](self.lineno)
+
+    def nodes(self):
+        node = self.node
+        return [node() for _ in xrange(self.varint())]
+
+    def numbers(self, kind, lineno, count):
+        # the number literals of a packed vector or matrix, negated ones as UnaryExpr nodes
+        if kind in (INT_VECTOR, INT_MATRIX):
+            values = []
+            for _ in xrange(count):
+                n = self.varint()
+                values.append((int(n >> 1), n & 1))
+            number_class = AST.IntNum
+        else:
+            values = [self.real() for _ in xrange(count)]
+            number_class = AST.FloatNum
+        return [AST.UnaryExpr(lineno, 'NEGATE', number_class(lineno, value)) if negated
+                else number_class(lineno, value) for value, negated in values]
+
+    # Nodes
+
+    def read_none(self, lineno):
+        return None
+
+    def read_instructions(self, lineno):
+        return AST.Instructions(lineno, self.nodes())
+
+    def read_block(self, lineno):
+        return AST.Block(lineno, self.node())
+
+    def read_flow_keyword(self, lineno):
+        return AST.FlowKeyword(lineno, self.text(self.operators))
+
+    def read_print(self, lineno):
+        return AST.Print(lineno, self.nodes())
+
+    def read_return(self, lineno):
+        return AST.Return(lineno, self.node())
+
+    def read_string(self, lineno):
+        return AST.String(lineno, self.text(self.strings))
+
+    def read_vector(self, lineno):
+        return AST.Vector(lineno, self.nodes())
+
+    def read_matrix(self, lineno):
+        return AST.Matrix(lineno, self.nodes())
+
+    def read_reference(self, lineno):
+        container = self.node()
+        return AST.Reference(lineno, container, self.nodes())
+
+    def read_function_call(self, lineno):
+        name = self.text(self.operators)
+        count = self.varint()
+        arguments = [self.node() for _ in xrange(count - 1)] if count else self.node()
+        return AST.FunctionCall(lineno, name, arguments)
+
+    def read_while(self, lineno):
+        condition = self.node()
+        return AST.While(lineno, condition, self.node())
+
+    def read_for(self, lineno):
+        iterator = self.node()
+        start = self.node()
+        end = self.node()
+        return AST.For(lineno, iterator, start, end, self.node())
+
+    def read_variable(self, lineno):
+        return AST.Variable(lineno, self.text(self.strings))
+
+    def read_if(self, lineno):
+        condition = self.node()
+        body = self.node()
+        return AST.If(lineno, condition, body, self.node())
+
+    def binary(self, lineno, node_class):
+        op = self.text(self.operators)
+        left = self.node()
+        return node_class(lineno, op, left, self.node())
+
+    def read_bin_expr(self, lineno):
+        return self.binary(lineno, AST.BinExpr)
+
+    def read_arithmetic_operation(self, lineno):
+        return self.binary(lineno, AST.ArithmeticOperation)
+
+    def read_assignment(self, lineno):
+        return self.binary(lineno, AST.Assignment)
+
+    def read_comparison(self, lineno):
+        return self.binary(lineno, AST.Comparison)
+
+    def read_int_num(self, lineno):
+        n = self.varint()
+        return AST.IntNum(lineno, int(n >> 1 if not n & 1 else -((n + 1) >> 1)))
+
+    def read_float_num(self, lineno):
+        value, negated = self.real()
+        return AST.FloatNum(lineno, -value if negated else value)
+
+    def read_double_num(self, lineno):
+        return AST.FloatNum(lineno, double.unpack(self.take(double.size))[0])
+
+    def read_unary_expr(self, lineno):
+        operation = self.text(self.operators)
+        return AST.UnaryExpr(lineno, operation, self.node())
+
+    def read_error(self, lineno):
+        return AST.Error()
+
+    def read_int_vector(self, lineno):
+        return self.packed_vector(lineno, INT_VECTOR)
+
+    def read_float_vector(self, lineno):
+        return self.packed_vector(lineno, FLOAT_VECTOR)
+
+    def packed_vector(self, lineno, kind):
+        element_lineno = self.line()
+        return AST.Vector(lineno, self.numbers(kind, element_lineno, self.varint()))
+
+    def read_int_matrix(self, lineno):
+        return self.packed_matrix(lineno, INT_MATRIX)
+
+    def read_float_matrix(self, lineno):
+        return self.packed_matrix(lineno, FLOAT_MATRIX)
+
+    def packed_matrix(self, lineno, kind):
+        row_lineno = self.line()
+        element_lineno = self.line()
+        rows = self.varint()
+        columns = self.varint()
+        elements = self.numbers(kind, element_lineno, rows * columns)
+        return AST.Matrix(lineno, [AST.Vector(row_lineno, elements[i * columns:(i + 1) * columns])
+                                   for i in xrange(rows)])
+
+
+def decode(stream):
+    """The program in file <stream>, decoded whole. None for a program without statements, as
+    the parsers give."""
+    decoder = Decoder(stream)
+    # the nodes make no cycles, collecting garbage while they are built would only walk them
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        statements = list(decoder)
+    finally:
+        if collecting:
+            gc.enable()
+    if not statements:
+        return None
+    return AST.Instructions(decoder.program_lineno, statements)
+
+
+def save(path, ast):
+    """Writes the program <ast> to file <path>, replacing the file only once it is complete."""
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as out:
+        write(out, ast)
+    os.rename(temporary, path)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python2
+
+import AST
+
+# Generic queries over AST subtrees shared by the analysis and optimization passes.
+
+# attributes holding child nodes, in evaluation order
+node_fields = {
+    AST.Instructions: ('nodes',),
+    AST.Block: ('content',),
+    AST.FlowKeyword: (),
+    AST.Print: ('arguments',),
+    AST.Return: ('value',),
+    AST.String: (),
+    AST.Vector: ('elements',),
+    AST.Matrix: ('elements',),
+    AST.Reference: ('container', 'coords'),
+    AST.FunctionCall: ('arguments',),
+    AST.While: ('condition', 'body'),
+    AST.For: ('iterator', 'range', 'body'),
+    AST.Range: ('start', 'end'),
+    AST.Variable: (),
+    AST.If: ('condition', 'body', 'else_body'),
+    AST.BinExpr: ('left', 'right'),
+    AST.ArithmeticOperation: ('left', 'right'),
+    AST.Assignment: ('left', 'right'),
+    AST.Comparison: ('left', 'right'),
+    AST.IntNum: (),
+    AST.FloatNum: (),
+    AST.UnaryExpr: ('operand',),
+    AST.Error: ()
+}
+
+
+def children(node):
+    result = []
+    for field in node_fields[node.__class__]:
+        value = getattr(node, field)
+        if isinstance(value, list):
+            result += [v for v in value if isinstance(v, AST.Node)]
+        elif isinstance(value, AST.Node):
+            result.append(value)
+    return result
+
+
+def walk(node):
+    # <node> and all nodes below it, parents first
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack += reversed(children(node))
+
+
+def assigned_names(node):
+    # names of variables (re)bound anywhere in <node>, including for loop iterators
+    names = set()
+    for n in walk(node):
+        if isinstance(n, AST.Assignment) and isinstance(n.left, AST.Variable):
+            names.add(n.left.name)
+        elif isinstance(n, AST.For):
+            names.add(n.iterator.name)
+    return names
+
+
+def written_names(node):
+    # assigned_names, and the names of matrices whose elements are written anywhere in <node>
+    names = assigned_names(node)
+    names.update(n.left.container.name for n in walk(node)
+                 if isinstance(n, AST.Assignment) and isinstance(n.left, AST.Reference))
+    return names
+
+
+def replace_child(parent, old, new):
+    # puts <new> where <parent> refers to its child <old>
+    for field in node_fields[parent.__class__]:
+        value = getattr(parent, field)
+        if value is old:
+            setattr(parent, field, new)
+            return
+        if isinstance(value, list) and any(v is old for v in value):
+            value[[v is old for v in value].index(True)] = new
+            return
+    raise ValueError("{} is not a child of {}".format(old.__class__.__name__, parent.__class__.__name__))
+
+
+def read_names(node):
+    # names of variables whose values are read when evaluating expression <node>
+    return set(n.name for n in walk(node) if isinstance(n, AST.Variable))
+
+
+def file_access(node):
+    # whether evaluating <node> reads or writes a matrix file, which no pass may repeat or skip
+    return any(isinstance(n, AST.FunctionCall) and n.name in ('load', 'save') for n in walk(node))
+
+
+def independent_groups(statements):
+    """Partitions a sequence of statements into groups such that a variable written by a
+    statement of one group is neither read nor written by another. Returns lists of indices
+    into <statements>, each in order."""
+    parent = range(len(statements))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    touching = {}  # name -> indices of the statements reading or writing it
+    written = set()
+    for index, statement in enumerate(statements):
+        names = set()
+        for n in walk(statement):
+            if isinstance(n, AST.Variable):
+                names.add(n.name)
+            elif isinstance(n, AST.Assignment) and isinstance(n.left, AST.Reference):
+                # element writes, the other writes are to variables found by the walk
+                written.add(n.left.container.name)
+            elif isinstance(n, AST.Assignment):
+                written.add(n.left.name)
+            elif isinstance(n, AST.For):
+                written.add(n.iterator.name)
+        for name in names:
+            touching.setdefault(name, []).append(index)
+    for name in written:
+        indices = touching[name]
+        for index in indices[1:]:
+            parent[root(index)] = root(indices[0])
+
+    groups = {}
+    for index in range(len(statements)):
+        groups.setdefault(root(index), []).append(index)
+    return sorted(groups.values())
+
+
+class Liveness(object):
+    """Backward liveness of variables over the statements of a program. Every statement gets
+    node.live_out, the names whose current values may still be read after it. Names are not
+    resolved to scopes, a name read anywhere after a statement is live in every scope. An
+    assignment inside a Block or For goes to their frame, so it does not end the liveness of
+    the name after them."""
+
+    def __init__(self):
+        self.loops = []  # (live at the loop head, live after the loop) of enclosing loops
+
+    def run(self, node):
+        return self.live(node, set())
+
+    def live(self, node, out):
+        # returns the names live before <node> given those live after it
+        node.live_out = out
+        return getattr(self, 'live_' + node.__class__.__name__)(node, out)
+
+    def live_Instructions(self, node, out):
+        for n in reversed(node.nodes):
+            out = self.live(n, out)
+        return out
+
+    def live_Block(self, node, out):
+        return self.live(node.content, out) | out
+
+    def live_FlowKeyword(self, node, out):
+        if not self.loops:
+            return out
+        head, after = self.loops[-1]
+        return set(head) if node.keyword == "CONTINUE" else set(after)
+
+    def live_Print(self, node, out):
+        return out | set().union(*[read_names(a) for a in node.arguments])
+
+    def live_Return(self, node, out):
+        # the program ends here
+        return read_names(node.value) if node.value is not None else set()
+
+    def live_FunctionCall(self, node, out):
+        return out | read_names(node)
+
+    def live_Assignment(self, node, out):
+        if isinstance(node.left, AST.Variable):
+            if node.op == "=":
+                return (out - set([node.left.name])) | read_names(node.right)
+            return out | set([node.left.name]) | read_names(node.right)
+        return out | read_names(node.left) | read_names(node.right)
+
+    def live_If(self, node, out):
+        # sets stored as live_out are shared between nodes, never update them in place
+        result = self.live(node.body, out)
+        result = result | (self.live(node.else_body, out) if node.else_body is not None else out)
+        return result | read_names(node.condition)
+
+    def live_While(self, node, out):
+        condition = read_names(node.condition)
+        head = condition | out
+        while True:
+            self.loops.append((head, out))
+            new_head = condition | out | self.live(node.body, head)
+            self.loops.pop()
+            if new_head == head:
+                return head
+            head = new_head
+
+    def live_For(self, node, out):
+        # the iterator is compared and incremented on every iteration
+        iterator = set([node.iterator.name])
+        head = iterator | out
+        while True:
+            self.loops.append((head, out))
+            new_head = iterator | out | self.live(node.body, head)
+            self.loops.pop()
+            if new_head == head:
+                break
+            head = new_head
+        return (head - iterator) | out | read_names(node.range)
+
+    def live_Error(self, node, out):
+        return out
+
+
+def writes_frame(node):
+    # whether <node> assigns to a variable or an element in the innermost frame open around it,
+    # the blocks and for loops in it opening frames of their own
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, AST.Assignment):
+            return True
+        if n is node or not isinstance(n, (AST.Block, AST.For)):
+            stack += children(n)
+    return False
+
+
+def mark_frameless(node):
+    # flags blocks whose statements write to no variable of their own frame, which would stay
+    # empty: they run in the frame around them. An element write in a block still gets a frame,
+    # as it fails there for a matrix of an outer frame
+    for n in walk(node):
+        if isinstance(n, AST.Block) and not writes_frame(n.content):
+            n.frameless = True
+
+
+def mark_in_place(node):
+    # for assignments X = L op R with an element-wise op on matrices, picks an operand variable
+    # whose storage may take the result: one that is dead afterwards, or X itself
+    for n in walk(node):
+        if not (isinstance(n, AST.Assignment) and n.op == "=" and isinstance(n.left, AST.Variable)):
+            continue
+        expr = n.right
+        if not (isinstance(expr, AST.ArithmeticOperation) and expr.op[0] == '.'):
+            continue
+        for operand in (expr.left, expr.right):
+            if not isinstance(operand, AST.Variable):
+                continue
+            if getattr(getattr(operand, 'inferred', None), 'type', None) != 'matrix':
+                continue
+            if operand.name == n.left.name or operand.name not in n.live_out:
+                n.in_place = operand
+                break
+
+
+def mark_borrowed(node):
+    # flags variables and operations read by an operation that only inspects their value or
+    # builds a new one from it, so the Interpreter may hand out a matrix's rows without giving
+    # them up, and an operation may write its next result over the value it gave
+    for n in walk(node):
+        if isinstance(n, AST.Assignment):
+            borrowing = n.op not in ("=", "+=")
+        elif isinstance(n, AST.ArithmeticOperation):
+            # '+' concatenates, the result refers to the rows of the operands
+            borrowing = n.op != '+'
+        else:
+            # a transposed matrix may be a view of the operand
+            borrowing = isinstance(n, (AST.Comparison, AST.Print)) or \
+                isinstance(n, AST.UnaryExpr) and n.operation != 'TRANSPOSE'
+        if borrowing:
+            for child in children(n):
+                if isinstance(child, (AST.Variable, AST.ArithmeticOperation)):
+                    child.borrowed = True
@@ -0,0 +1,261 @@
+#!/usr/bin/env python2
+
+import os
+import sys
+import time
+import struct
+import hashlib
+from array import array
+from Matrix import Matrix, ArrayMatrix, SparseMatrix, ConstantMatrix
+from Memory import Memory
+from MatrixFile import MappedMatrix
+from Exceptions import CheckpointError
+
+# Checkpoints of an Engine.Execution: its program counter, its step count and the frames of its
+# MemoryStack, in a binary file. Numbers are written in little endian; a list of ints or of
+# floats, a rectangular nested list of them and the matrices held in arrays are written in
+# bulk, as the bytes of an array in the byte order of the machine. Handles sharing a matrix
+# share it again once restored. A checkpoint carries the fingerprint of its program and only
+# resumes that program.
+#
+#   'MCKP', version, byte order, size of an int, fingerprint (20 bytes), pc, steps, frames
+#   frame: number of variables, then (name, value) for each
+
+magic = 'MCKP'
+version = 2
+
+header = struct.Struct('<4sBBB20sQQI')
+count = struct.Struct('<I')
+integer = struct.Struct('<q')
+real = struct.Struct('<d')
+byte_orders = {'little': 0, 'big': 1}
+
+
+def fingerprint(text, optimize):
+    # the pc refers to the program as compiled from <text> at optimization level <optimize>
+    return hashlib.sha1('{}\0{}'.format(optimize, text)).digest()
+
+
+def bulk_code(values):
+    # array typecode of a list of all ints or all floats, which arrays give back unchanged
+    if not values:
+        return None
+    for value_type, code in ((int, 'l'), (float, 'd')):
+        if all(type(v) is value_type for v in values):
+            return code
+    return None
+
+
+class Writer(object):
+
+    def __init__(self, out):
+        self.out = out
+        self.handles = {}  # storage id -> index of the first handle written
+
+    def string(self, value):
+        self.out.write(count.pack(len(value)) + value)
+
+    def data(self, values):
+        self.out.write(count.pack(len(values)))
+        values.tofile(self.out)
+
+    def value(self, value):
+        write = self.out.write
+        value_type = type(value)
+        if value_type is bool:
+            write('b' + chr(value))
+        elif value_type is int:
+            write('i' + integer.pack(value))
+        elif value_type is long:
+            write('I')
+            self.string(str(value))
+        elif value_type is float:
+            write('f' + real.pack(value))
+        elif value_type is str:
+            write('s')
+            self.string(value)
+        elif value is None:
+            write('n')
+        elif value_type is list:
+            self.sequence(value)
+        elif value_type is Matrix:
+            storage = value.storage
+            if id(storage) in self.handles:
+                write('r' + count.pack(self.handles[id(storage)]))
+            else:
+                self.handles[id(storage)] = len(self.handles)
+                write('M')
+                self.value(storage.rows)
+        elif value_type is ArrayMatrix or value_type is MappedMatrix:
+            data = value.flat()
+            write('A' + data.typecode + count.pack(value.rows) + count.pack(value.columns))
+            self.data(data)
+        elif value_type is SparseMatrix:
+            write('S' + count.pack(value.rows) + count.pack(value.columns))
+            keys = sorted(value.cells)
+            self.data(array('l', [c for key in keys for c in key]))
+            self.value([value.cells[key] for key in keys])
+        elif value_type is ConstantMatrix:
+            write('C' + count.pack(value.rows) + count.pack(value.columns) + chr(value.identity))
+            self.value(value.fill)
+        else:
+            raise CheckpointError("cannot checkpoint a {}".format(value_type.__name__))
+
+    def sequence(self, values):
+        write = self.out.write
+        code = bulk_code(values)
+        if code is not None:
+            write('V' + code)
+            self.data(array(code, values))
+            return
+        if values and all(type(row) is list and len(row) == len(values[0]) for row in values):
+            code = bulk_code(values[0])
+            if code is not None and all(bulk_code(row) == code for row in values):
+                write('W' + code + count.pack(len(values)) + count.pack(len(values[0])))
+                self.data(array(code, [v for row in values for v in row]))
+                return
+        write('l' + count.pack(len(values)))
+        for value in values:
+            self.value(value)
+
+
+class Reader(object):
+
+    def __init__(self, data, swap):
+        self.input = data
+        self.position = 0
+        self.swap = swap
+        self.handles = []
+
+    def take(self, size):
+        start = self.position
+        self.position += size
+        if self.position > len(self.input):
+            raise CheckpointError("checkpoint ends too early")
+        return self.input[start:self.position]
+
+    def unpack(self, format):
+        return format.unpack(self.take(format.size))[0]
+
+    def string(self):
+        return self.take(self.unpack(count))
+
+    def data(self, code):
+        values = array(code)
+        size = self.unpack(count)
+        values.fromstring(self.take(size * values.itemsize))
+        if self.swap:
+            values.byteswap()
+        return values
+
+    def value(self):
+        tag = self.take(1)
+        if tag == 'b':
+            return bool(ord(self.take(1)))
+        if tag == 'i':
+            return self.unpack(integer)
+        if tag == 'I':
+            return long(self.string())
+        if tag == 'f':
+            return self.unpack(real)
+        if tag == 's':
+            return self.string()
+        if tag == 'n':
+            return None
+        if tag == 'V':
+            return self.data(self.take(1)).tolist()
+        if tag == 'W':
+            code = self.take(1)
+            rows, columns = self.unpack(count), self.unpack(count)
+            return ArrayMatrix(self.data(code), rows, columns).tolist()
+        if tag == 'l':
+            return [self.value() for _ in range(self.unpack(count))]
+        if tag == 'M':
+            handle = Matrix(None, spine_owned=True, rows_owned=False)
+            self.handles.append(handle)
+            rows = self.value()
+            handle.storage.rows = rows
+            if isinstance(rows, list):
+                handle.storage.owned_rows = set(range(len(rows)))
+            return handle
+        if tag == 'r':
+            return self.handles[self.unpack(count)].share()
+        if tag == 'A':
+            code = self.take(1)
+            rows, columns = self.unpack(count), self.unpack(count)
+            return ArrayMatrix(self.data(code), rows, columns)
+        if tag == 'S':
+            rows, columns = self.unpack(count), self.unpack(count)
+            keys = self.data('l')
+            values = self.value()
+            return SparseMatrix(dict(zip(zip(keys[::2], keys[1::2]), values)), rows, columns)
+        if tag == 'C':
+            rows, columns = self.unpack(count), self.unpack(count)
+            identity = bool(ord(self.take(1)))
+            return ConstantMatrix(self.value(), rows, columns, identity)
+        raise CheckpointError("unknown value tag {!r} in checkpoint".format(tag))
+
+
+def save(path, execution, program):
+    """Writes the state of <execution> of the program with fingerprint <program> to <path>,
+    replacing the file only once the checkpoint is complete."""
+    frames = execution.interpreter.memories.stack
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as out:
+        out.write(header.pack(magic, version, byte_orders[sys.byteorder], array('l').itemsize, program,
+                              execution.pc, execution.steps, len(frames)))
+        writer = Writer(out)
+        for frame in frames:
+            variables = sorted(frame.variables.items())
+            out.write(count.pack(len(variables)))
+            for name, value in variables:
+                writer.string(name)
+                writer.value(value)
+    os.rename(temporary, path)
+
+
+def restore(path, execution, program):
+    """Puts <execution> of the program with fingerprint <program> back in the state saved to
+    <path>. Raises CheckpointError for a checkpoint of another program or machine."""
+    try:
+        with open(path, 'rb') as checkpoint:
+            data = checkpoint.read()
+    except IOError as e:
+        raise CheckpointError("cannot read checkpoint {}: {}".format(path, e.strerror))
+    if len(data) < header.size or data[:4] != magic:
+        raise CheckpointError("{} is not a checkpoint".format(path))
+    _, file_version, byte_order, int_size, file_program, pc, steps, frame_count = header.unpack_from(data)
+    if file_version != version:
+        raise CheckpointError("checkpoint version {} is not supported".format(file_version))
+    if int_size != array('l').itemsize:
+        raise CheckpointError("checkpoint written on a machine with other ints")
+    if file_program != program:
+        raise CheckpointError("checkpoint of another program")
+    reader = Reader(data, byte_order != byte_orders[sys.byteorder])
+    reader.position = header.size
+    frames = []
+    for _ in range(frame_count):
+        frame = Memory()
+        for _ in range(reader.unpack(count)):
+            name = reader.string()
+            frame.variables[name] = reader.value()
+        frames.append(frame)
+    memories = execution.interpreter.memories
+    memories.stack = frames
+    memories.versions.clear()
+    execution.pc, execution.steps = pc, steps
+
+
+def run(execution, path, program, steps=None, seconds=None):
+    """Runs <execution> of the program with fingerprint <program> to its end, saving it to
+    <path> every <steps> steps and every <seconds> seconds."""
+    slice = steps
+    if seconds is not None:
+        # the clock is read every slice
+        slice = min(steps or 1000, 1000)
+    saved, saved_steps = time.time(), execution.steps
+    for done in execution.run(slice):
+        now = time.time()
+        if steps is not None and done - saved_steps >= steps or seconds is not None and now - saved >= seconds:
+            save(path, execution, program)
+            saved, saved_steps = now, done
@@ -0,0 +1,154 @@
+#!/usr/bin/env python2
+
+import os
+import sys
+import json
+import signal
+import socket
+import struct
+import tempfile
+import time
+import threading
+import traceback
+import SocketServer
+
+# Long-lived interpreter serving scripts over a unix domain socket, so that a run pays for
+# neither the start of Python nor the imports and the parser tables. A client sends a JSON
+# object {"argv": command line of main.py, "cwd": its working directory} and shuts down its
+# side of the connection. The server runs the script like main.py would in that directory and
+# streams back frames: a kind byte, the length of the data (4 bytes, big endian) and the data.
+# 'o' frames carry standard output, 'e' frames standard error; the last frame, 'x', carries
+# the exit status in decimal. Scripts run one at a time in the server process, each with a
+# fresh MemoryStack and SymbolTable.
+
+default_socket = os.path.join(tempfile.gettempdir(), 'mlang-{}.sock'.format(os.getuid()))
+
+header = struct.Struct('>cI')
+
+
+def send_frame(out, kind, data):
+    out.write(header.pack(kind, len(data)) + data)
+    out.flush()
+
+
+class FrameWriter(object):
+    # file object writing <kind> frames: every buffer_size bytes, and at the end of a line once
+    # the previous frame is <latency> seconds old
+
+    buffer_size = 1 << 16
+    latency = 0.05
+
+    def __init__(self, out, kind):
+        self.out = out
+        self.kind = kind
+        self.pending = []
+        self.size = 0
+        self.sent = time.time()
+
+    def write(self, data):
+        self.pending.append(data)
+        self.size += len(data)
+        if self.size >= self.buffer_size or '\n' in data and time.time() - self.sent >= self.latency:
+            self.flush()
+
+    def flush(self):
+        data = ''.join(self.pending)
+        self.pending = []
+        self.size = 0
+        self.sent = time.time()
+        if data:
+            send_frame(self.out, self.kind, data)
+
+
+class ScriptHandler(SocketServer.StreamRequestHandler):
+
+    def handle(self):
+        request = json.loads(self.rfile.read())
+        stdout, stderr = sys.stdout, sys.stderr
+        directory = os.getcwd()
+        sys.stdout = FrameWriter(self.wfile, 'o')
+        sys.stderr = FrameWriter(self.wfile, 'e')
+        try:
+            os.chdir(request['cwd'])
+            try:
+                args = self.server.argparser.parse_args(request['argv'])
+            except SystemExit as e:
+                # a wrong command line, reported by argparse
+                args, status = None, e.code
+            if args is not None:
+                status = self.server.main(args)
+        except Exception:
+            # the server outlives failing scripts
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            sys.stdout, sys.stderr = stdout, stderr
+            os.chdir(directory)
+        send_frame(self.wfile, 'x', str(status or 0))
+
+
+class ScriptServer(SocketServer.UnixStreamServer):
+
+    def __init__(self, path, main, argparser):
+        SocketServer.UnixStreamServer.__init__(self, path, ScriptHandler)
+        self.main = main
+        self.argparser = argparser
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], socket.error):
+            # a client gone before reading everything is no error of the server
+            SocketServer.UnixStreamServer.handle_error(self, request, client_address)
+
+
+def serve(path, main, argparser):
+    """Runs scripts with main(args), args parsed with argparser from the command line a client
+    sends, until interrupted."""
+    if os.path.exists(path):
+        os.unlink(path)
+    server = ScriptServer(path, main, argparser)
+
+    def stop(signum, frame):
+        # serve_forever returns once the request being served, if any, is done; shutdown waits
+        # for that, so it cannot be called from the thread serving
+        threading.Thread(target=server.shutdown).start()
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
+
+
+def receive(connection, size):
+    data = []
+    while size:
+        chunk = connection.recv(size)
+        if not chunk:
+            raise EOFError("connection closed by the server")
+        data.append(chunk)
+        size -= len(chunk)
+    return ''.join(data)
+
+
+def submit(argv, path=default_socket, stdout=sys.stdout, stderr=sys.stderr):
+    """Runs main.py <argv> in the server listening at <path>, in the current directory, copying
+    its output as it comes. Returns the exit status."""
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+        connection.sendall(json.dumps({'argv': argv, 'cwd': os.getcwd()}))
+        connection.shutdown(socket.SHUT_WR)
+        outputs = {'o': stdout, 'e': stderr}
+        while True:
+            kind, size = header.unpack(receive(connection, header.size))
+            data = receive(connection, size)
+            if kind == 'x':
+                return int(data)
+            outputs[kind].write(data)
+            outputs[kind].flush()
+    finally:
+        connection.close()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python2
+
+import scanner
+import AST
+
+# Hand-written alternative to Mparser.parser. Statements are parsed by recursive descent and
+# numeric expressions by precedence climbing, building the same AST nodes with the same line
+# numbers as the LALR parser run with tracking=True (a node gets the line of the first token
+# of its leftmost symbol).
+
+# levels of binary numeric operators, as in Mparser.precedence (all left associative)
+binary_precedence = {
+    '+': 1, '-': 1,
+    'DOTADD': 2, 'DOTSUB': 2,
+    '*': 3, '/': 3,
+    'DOTMUL': 4, 'DOTDIV': 4
+}
+
+# nonassociative and looser than every numeric operator
+comparison_operators = ('<', '>', 'EQUAL', 'NOTEQUAL', 'LE', 'GE')
+
+assignment_operators = ('=', 'ADDASSIGN', 'SUBASSIGN', 'MULASSIGN', 'DIVASSIGN')
+
+function_names = ('EYE', 'ZEROS', 'ONES', 'LOAD', 'SAVE')
+
+instruction_start = ('{', 'IF', 'WHILE', 'FOR', 'ID', 'BREAK', 'CONTINUE', 'RETURN', 'PRINT') + function_names
+
+# after an error, errors on the next tokens are not reported (like yacc's error_count)
+error_count = 3
+
+
+class ParseError(Exception):
+    pass
+
+
+class UnclosedBlockError(ParseError):
+    # recovery reached the '}' closing a block whose first instruction failed
+    pass
+
+
+class EndOfInputError(ParseError):
+    pass
+
+
+class DescentParser(object):
+
+    def __init__(self):
+        self.lexer = None
+        self.token = None
+        self.type = '$end'
+        self.errorcount = 0
+
+    def parse(self, text, lexer=None, tracking=True, consume=None):
+        # tracking is accepted for compatibility with yacc, line numbers are always tracked.
+        # consume is called with every top-level instruction as soon as it is parsed
+        self.lexer = lexer if lexer is not None else scanner.lexer
+        self.lexer.input(text)
+        self.errorcount = 0
+        self.advance()
+        try:
+            # with nothing parsed yet there is no error state to fall back to, yacc drops the token
+            while self.type not in instruction_start:
+                try:
+                    self.error()
+                except ParseError:
+                    if self.type == '$end':
+                        raise EndOfInputError()
+                    self.discard()
+            return self.parse_instructions(consume=consume)
+        except EndOfInputError:
+            return None
+
+    # Token stream
+
+    def advance(self):
+        if self.errorcount:
+            self.errorcount -= 1
+        self.discard()
+
+    def discard(self):
+        self.token = self.lexer.token()
+        self.type = self.token.type if self.token is not None else '$end'
+
+    def take(self):
+        token = self.token
+        self.advance()
+        return token
+
+    def expect(self, type):
+        if self.type != type:
+            self.error()
+        return self.take()
+
+    def error(self):
+        self.lexer.encountered_error = True
+        if not self.errorcount:
+            token = self.token
+            if token is not None:
+                print("Syntax error at line {0}, column {1}: LexToken({2}, '{3}')"
+                      .format(token.lineno, scanner.find_column(self.lexer.lexdata, token),
+                              token.type, token.value))
+                budget = getattr(self.lexer, 'error_budget', None)
+                if budget is not None:
+                    budget.spend()
+            else:
+                print("Unexpected end of input")
+        self.errorcount = error_count
+        raise ParseError()
+
+    def skip_to(self, *types):
+        # the error symbol has been shifted, every discarded token restarts the error count
+        self.errorcount = error_count - 1
+        while self.type not in types:
+            if self.type == '$end':
+                raise EndOfInputError()
+            self.discard()
+            self.errorcount = error_count
+
+    # Instructions
+
+    def parse_instructions(self, in_block=False, consume=None):
+        # instructions is right recursive, so the node gets the line of the last instruction
+        end = '}' if in_block else '$end'
+        nodes = []
+        while not nodes or self.type != end:
+            lineno = self.token.lineno if self.token is not None else None
+            nodes.append(self.parse_instruction(in_block and not nodes))
+            if consume is not None:
+                consume(nodes[-1])
+        return AST.Instructions(lineno, nodes)
+
+    def parse_instruction(self, first_in_block=False):
+        try:
+            if self.type == '{':
+                return self.parse_block()
+            elif self.type == 'IF':
+                return self.parse_if()
+            elif self.type == 'WHILE':
+                return self.parse_while()
+            elif self.type == 'FOR':
+                return self.parse_for()
+            node = self.parse_statement()
+            self.expect(';')
+            return node
+        except (UnclosedBlockError, EndOfInputError):
+            raise
+        except ParseError:
+            # instruction : error ';' and, for the first instruction of a block, block : '{' error '}'
+            if first_in_block:
+                self.skip_to(';', '}')
+                if self.type == '}':
+                    raise UnclosedBlockError()
+            else:
+                self.skip_to(';')
+            self.advance()
+            return AST.Error()
+
+    def parse_block(self):
+        lineno = self.take().lineno
+        try:
+            content = self.parse_instructions(in_block=True)
+        except UnclosedBlockError:
+            content = AST.Error()
+        self.expect('}')
+        return AST.Block(lineno, content)
+
+    def parse_if(self):
+        lineno = self.take().lineno
+        condition = self.parse_condition()
+        body = self.parse_instruction()
+        else_body = None
+        if self.type == 'ELSE':
+            self.advance()
+            else_body = self.parse_instruction()
+        return AST.If(lineno, condition, body, else_body)
+
+    def parse_while(self):
+        lineno = self.take().lineno
+        condition = self.parse_condition()
+        return AST.While(lineno, condition, self.parse_instruction())
+
+    def parse_condition(self):
+        self.expect('(')
+        condition = self.parse_expression()
+        self.expect(')')
+        return condition
+
+    def parse_for(self):
+        lineno = self.take().lineno
+        iterator = self.expect('ID').value
+        self.expect('=')
+        start = self.parse_numeric()[0]
+        self.expect(':')
+        end = self.parse_numeric()[0]
+        body = self.parse_instruction()
+        return AST.For(lineno, AST.Variable(lineno, iterator), start, end, body)
+
+    # Statements
+
+    def parse_statement(self):
+        if self.type == 'ID':
+            return self.parse_assignment()
+        elif self.type in ('BREAK', 'CONTINUE'):
+            token = self.take()
+            return AST.FlowKeyword(token.lineno, token.value)
+        elif self.type == 'RETURN':
+            lineno = self.take().lineno
+            if self.type == ';':
+                return AST.Return(lineno)
+            return AST.Return(lineno, self.parse_expression())
+        elif self.type == 'PRINT':
+            lineno = self.take().lineno
+            arguments = [self.parse_expression()]
+            while self.type == ',':
+                self.advance()
+                arguments.append(self.parse_expression())
+            return AST.Print(lineno, arguments)
+        elif self.type in function_names:
+            return self.parse_function()
+        self.error()
+
+    def parse_assignment(self):
+        target = self.parse_var(assignment=True)
+        if self.type not in assignment_operators:
+            self.error()
+        op = self.take().value
+        return AST.Assignment(target.lineno, op, target, self.parse_expression())
+
+    def parse_var(self, assignment=False):
+        token = self.take()
+        node = AST.Variable(token.lineno, token.value)
+        while self.type == '[':
+            self.advance()
+            first = self.parse_numeric()[0]
+            if assignment and self.type == ',':
+                # array_range : var '[' numeric_expression ',' numeric_expression ']', ends the target
+                self.advance()
+                second = self.parse_numeric()[0]
+                self.expect(']')
+                return AST.Reference(token.lineno, node, [first, second])
+            coords = self.parse_vector_body(first)
+            self.expect(']')
+            node = AST.Reference(token.lineno, node, coords)
+        return node
+
+    # Expressions
+    # parse_* methods for numeric expressions return the node together with the line of its
+    # first token, which differs from node.lineno for parenthesized expressions
+
+    def parse_expression(self):
+        left, lineno = self.parse_numeric(allow_comparison=True)
+        if self.type in comparison_operators and not isinstance(left, AST.Comparison):
+            op = self.take().value
+            right = self.parse_numeric()[0]
+            return AST.Comparison(lineno, op, left, right)
+        return left
+
+    def parse_numeric(self, min_level=1, allow_comparison=False):
+        # allow_comparison: the expression may be a parenthesized comparison, which then
+        # cannot be an operand of anything
+        left, lineno = self.parse_unary(allow_comparison)
+        level = binary_precedence.get(self.type)
+        while level is not None and level >= min_level:
+            if isinstance(left, AST.Comparison):
+                self.error()
+            op = self.take().value
+            right = self.parse_numeric(level + 1)[0]
+            left = AST.ArithmeticOperation(lineno, op, left, right)
+            level = binary_precedence.get(self.type)
+        return left, lineno
+
+    def parse_unary(self, allow_comparison=False):
+        if self.type == '-':
+            lineno = self.take().lineno
+            # UMINUS binds tighter than every binary operator but looser than transposition
+            operand = self.parse_unary()[0]
+            return AST.UnaryExpr(lineno, "NEGATE", operand), lineno
+        return self.parse_postfix(allow_comparison)
+
+    def parse_postfix(self, allow_comparison=False):
+        node, lineno = self.parse_primary(allow_comparison)
+        while self.type == "'":
+            if isinstance(node, AST.Comparison):
+                self.error()
+            self.advance()
+            node = AST.UnaryExpr(lineno, "TRANSPOSE", node)
+        return node, lineno
+
+    def parse_primary(self, allow_comparison=False):
+        type = self.type
+        if type == 'ID':
+            node = self.parse_var()
+            return node, node.lineno
+        token = self.token
+        if type == 'INTNUM':
+            self.advance()
+            return AST.IntNum(token.lineno, token.value), token.lineno
+        elif type == 'FLOATNUM':
+            self.advance()
+            return AST.FloatNum(token.lineno, token.value), token.lineno
+        elif type == 'STRING':
+            self.advance()
+            return AST.String(token.lineno, token.value[1:-1]), token.lineno
+        elif type == '[':
+            return self.parse_matrix(), token.lineno
+        elif type in function_names:
+            return self.parse_function(), token.lineno
+        elif type == '(':
+            self.advance()
+            if allow_comparison:
+                node = self.parse_expression()
+            else:
+                node = self.parse_numeric()[0]
+            self.expect(')')
+            return node, token.lineno
+        self.error()
+
+    def parse_vector_body(self, first=None):
+        # vector_body : numeric_expression | vector_body ',' numeric_expression
+        if first is None:
+            first = self.parse_numeric()[0]
+        elements = [first]
+        while self.type == ',':
+            self.advance()
+            elements.append(self.parse_numeric()[0])
+        return elements
+
+    def parse_matrix(self):
+        lineno = self.take().lineno
+        if self.type == ']':
+            self.advance()
+            return AST.Vector(lineno, [])
+        first, row_lineno = self.parse_numeric()
+        body = self.parse_vector_body(first)
+        if self.type != ';':
+            self.expect(']')
+            return AST.Vector(lineno, body)
+        # every row gets the line of the first row, as matrix_body is left recursive
+        rows = [AST.Vector(row_lineno, body)]
+        while self.type == ';':
+            self.advance()
+            rows.append(AST.Vector(row_lineno, self.parse_vector_body()))
+        self.expect(']')
+        return AST.Matrix(lineno, rows)
+
+    def parse_function(self):
+        token = self.take()
+        self.expect('(')
+        try:
+            arguments = self.parse_vector_body()
+            self.expect(')')
+        except (UnclosedBlockError, EndOfInputError):
+            raise
+        except ParseError:
+            # function : function_name '(' error ')'
+            self.skip_to(')')
+            self.advance()
+            arguments = AST.Error()
+        return AST.FunctionCall(token.lineno, token.value, arguments)
+
+
+parser = DescentParser()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python2
+
+from collections import deque
+import AST
+from Interpreter import Interpreter
+from Exceptions import StepBudgetExceeded
+
+# Flattened execution of a program. The control flow of the statements (blocks, conditionals,
+# loops, break and continue) is compiled into a list of closures run by a program counter,
+# each returning the index of the next instruction, None for the one after it. Expressions and
+# the other statements are evaluated by the Interpreter as usual. A run is therefore a loop
+# that may stop after any instruction and be resumed later, all of its state being the
+# MemoryStack and the program counter: the end of the range of a for loop is kept in the
+# loop's frame as well. Every instruction run is a step.
+
+
+class Label(object):
+    __slots__ = ('pc',)
+
+
+class Loop(object):
+    # where continue and break go in a loop, and the number of frames open around its body
+
+    def __init__(self, depth):
+        self.depth = depth
+        self.next = Label()
+        self.exit = Label()
+
+
+class Execution(object):
+    """A run of the program <ast> by <interpreter>, in steps. The budget caps the steps of the
+    whole run."""
+
+    def __init__(self, ast, interpreter=None, step_budget=None):
+        self.interpreter = interpreter if interpreter is not None else Interpreter()
+        self.code = []
+        self.pc = 0
+        self.steps = 0
+        self.step_budget = step_budget if step_budget is not None else float('+inf')
+        self.compile(ast, [], 0)
+
+    def run(self, slice=None):
+        """Generator running the program from where it stopped, yielding the number of steps
+        run so far every <slice> steps (never when None). Raises StepBudgetExceeded once the
+        budget is spent, and whatever the program raises, like ReturnValueException."""
+        code = self.code
+        end = len(code)
+        while self.pc < end:
+            pc, steps = self.pc, self.steps
+            stop = min(steps + slice if slice is not None else float('+inf'), self.step_budget)
+            try:
+                while pc < end and steps < stop:
+                    next_pc = code[pc]()
+                    pc = pc + 1 if next_pc is None else next_pc
+                    steps += 1
+            finally:
+                self.pc, self.steps = pc, steps
+            if pc < end:
+                if steps >= self.step_budget:
+                    raise StepBudgetExceeded(self.step_budget)
+                yield steps
+
+    def finish(self):
+        for _ in self.run():
+            pass
+
+    # Compilation, <loops> are the loops around the node and <depth> the frames open in it
+
+    def label(self, label):
+        label.pc = len(self.code)
+
+    def compile(self, node, loops, depth):
+        getattr(self, 'compile_' + node.__class__.__name__, self.compile_statement)(node, loops, depth)
+
+    def compile_statement(self, node, loops, depth):
+        interpreter = self.interpreter
+        accept = node.accept
+
+        def statement():
+            accept(interpreter)
+        self.code.append(statement)
+
+    def compile_Instructions(self, node, loops, depth):
+        for n in node.nodes:
+            self.compile(n, loops, depth)
+
+    def compile_Block(self, node, loops, depth):
+        if getattr(node, 'frameless', False):
+            return self.compile(node.content, loops, depth)
+        interpreter = self.interpreter
+
+        def push():
+            interpreter.memories.push()
+
+        def pop():
+            interpreter.memories.pop()
+        self.code.append(push)
+        self.compile(node.content, loops, depth + 1)
+        self.code.append(pop)
+
+    def compile_FlowKeyword(self, node, loops, depth):
+        if not loops:
+            # raises like the Interpreter does
+            return self.compile_statement(node, loops, depth)
+        interpreter = self.interpreter
+        loop = loops[-1]
+        target = loop.exit if node.keyword == "BREAK" else loop.next
+        frames = depth - loop.depth
+
+        def jump():
+            for _ in range(frames):
+                interpreter.memories.pop()
+            return target.pc
+        self.code.append(jump)
+
+    def branch(self, condition, target):
+        # to <target> when <condition> is false
+        interpreter = self.interpreter
+        accept = condition.accept
+
+        def branch():
+            if not accept(interpreter):
+                return target.pc
+        self.code.append(branch)
+
+    def jump(self, target):
+        self.code.append(lambda: target.pc)
+
+    def compile_If(self, node, loops, depth):
+        otherwise, end = Label(), Label()
+        self.branch(node.condition, otherwise)
+        self.compile(node.body, loops, depth)
+        if node.else_body is not None:
+            self.jump(end)
+        self.label(otherwise)
+        if node.else_body is not None:
+            self.compile(node.else_body, loops, depth)
+        self.label(end)
+
+    def compile_While(self, node, loops, depth):
+        loop = Loop(depth)
+        self.label(loop.next)
+        self.branch(node.condition, loop.exit)
+        self.compile(node.body, loops + [loop], depth)
+        self.jump(loop.next)
+        self.label(loop.exit)
+
+    def compile_For(self, node, loops, depth):
+        interpreter = self.interpreter
+        iterator = node.iterator
+        bound = AST.Variable(node.lineno, 'end#')
+        loop = Loop(depth + 1)
+        test = Label()
+
+        def start():
+            memories = interpreter.memories
+            memories.push()
+            start, end = node.range.accept(interpreter)
+            memories.insert(iterator, start)
+            memories.insert(bound, end)
+
+        def check():
+            memories = interpreter.memories
+            if not memories.get(iterator) < memories.get(bound):
+                return loop.exit.pc
+
+        def increment():
+            memories = interpreter.memories
+            memories.set(iterator, memories.get(iterator) + 1)
+            return test.pc
+
+        def pop():
+            interpreter.memories.pop()
+        self.code.append(start)
+        self.label(test)
+        self.code.append(check)
+        self.compile(node.body, loops + [loop], depth + 1)
+        self.label(loop.next)
+        self.code.append(increment)
+        self.label(loop.exit)
+        self.code.append(pop)
+
+
+def time_slice(executions, slice):
+    """Runs <executions> in turns of <slice> steps until they all end. Yields every execution
+    as it ends, with the exception that ended it, or None when it ran to its end."""
+    runs = deque((execution, execution.run(slice)) for execution in executions)
+    while runs:
+        execution, run = runs.popleft()
+        try:
+            next(run)
+            runs.append((execution, run))
+        except StopIteration:
+            yield execution, None
+        except Exception as e:
+            yield execution, e
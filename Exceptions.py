@@ -13,3 +13,40 @@ class BreakException(Exception):
 
 class ContinueException(Exception):
     pass
+
+
+class StepBudgetExceeded(Exception):
+
+    def __init__(self, steps):
+        Exception.__init__(self, "step budget of {} exceeded".format(steps))
+        self.steps = steps
+
+
+class CheckpointError(Exception):
+    pass
+
+
+class ErrorBudgetExceeded(Exception):
+    pass
+
+
+class ErrorBudget(object):
+    # diagnostics a run may print, shared by the parser and the TypeChecker; spending the last
+    # one raises ErrorBudgetExceeded, which abandons the rest of the run
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.spent = 0
+
+    def spend(self):
+        self.spent += 1
+        if self.limit is not None and self.spent >= self.limit:
+            raise ErrorBudgetExceeded()
+
+
+class MatrixFileError(Exception):
+    pass
+
+
+class ASTFileError(Exception):
+    pass
@@ -0,0 +1,151 @@
+#!/usr/bin/env python2
+
+from array import array
+from itertools import repeat, chain, izip, imap
+import AST
+from Analysis import walk, children
+from Matrix import ArrayMatrix, ConstantMatrix, SparseMatrix, typecode
+from Instrumentation import counters
+
+# Expression templates for element-wise matrix expressions. A tree of dot operators and
+# transpositions, like (A .+ B) .* C', is evaluated in a single pass over its leaf matrices that
+# writes one output array, or one nested list for operands in nested lists, instead of
+# allocating a matrix for every operation. Transpositions are pushed down to the leaves, where
+# they only change the order the elements are read in.
+
+numbers = frozenset((int, long, float))
+
+dot_op_to_symbol = {
+    '.+': '+',
+    '.-': '-',
+    '.*': '*',
+    './': '//'
+}
+
+
+def matrix_typed(node):
+    return getattr(getattr(node, 'inferred', None), 'type', None) == 'matrix'
+
+
+def fusible(node):
+    if isinstance(node, AST.ArithmeticOperation):
+        return node.op in dot_op_to_symbol and matrix_typed(node)
+    if isinstance(node, AST.UnaryExpr):
+        return node.operation == 'TRANSPOSE' and matrix_typed(node)
+    return False
+
+
+class ElementWiseTemplate(object):
+    """Element-wise expression rooted at a node, compiled into a function of one element of
+    every leaf. leaves holds the subexpressions evaluated as usual, each read transposed when an
+    odd number of transpositions lies above it."""
+
+    # below as many operations, the kernels of constant and sparse matrices, which skip most
+    # elements, are faster than a single pass over all of them
+    special_operations = 5
+
+    def __init__(self, node):
+        self.node = node
+        self.leaves = []
+        self.transposed = []
+        self.operations = 0
+        source = self.build(node, False)
+        arguments = ', '.join('a{}'.format(i) for i in range(len(self.leaves)))
+        self.kernel = eval('lambda {}: {}'.format(arguments, source))
+
+    def build(self, node, transposed):
+        if fusible(node):
+            self.operations += 1
+            if isinstance(node, AST.UnaryExpr):
+                return self.build(node.operand, not transposed)
+            return '({} {} {})'.format(self.build(node.left, transposed), dot_op_to_symbol[node.op],
+                                       self.build(node.right, transposed))
+        self.leaves.append(node)
+        self.transposed.append(transposed)
+        return 'a{}'.format(len(self.leaves) - 1)
+
+    def evaluate(self, interpreter):
+        # the leaves are evaluated once: when they do not fit a single pass, the operations are
+        # applied one by one to their values, like without the template
+        values = [leaf.accept(interpreter) for leaf in self.leaves]
+        result = self.fused(values)
+        if result is None:
+            return self.eager(interpreter, self.node, iter(values))
+        counters['fused operations'] += self.operations
+        counters['intermediates avoided'] += self.operations - 1
+        return result
+
+    def eager(self, interpreter, node, values):
+        # the value of <node> from <values>, those of the leaves under it in order
+        if not fusible(node):
+            return next(values)
+        if isinstance(node, AST.UnaryExpr):
+            return interpreter.apply(node, self.eager(interpreter, node.operand, values))
+        left = self.eager(interpreter, node.left, values)
+        return interpreter.apply(node, left, self.eager(interpreter, node.right, values))
+
+    def fused(self, values):
+        # the result in a single pass, None unless the leaves are matrices of numbers of one
+        # shape. Nested lists are read as they are and give nested lists, like the element-wise
+        # operators
+        operands = []  # (rows, columns, typecode or None for nested lists, elements)
+        for value, transposed in zip(values, self.transposed):
+            if isinstance(value, (ConstantMatrix, SparseMatrix)) and self.operations < self.special_operations:
+                return None
+            if isinstance(value, ConstantMatrix) and not value.identity:
+                # ones and zeros are read as their fill, without being allocated
+                if typecode(value.fill) is None:
+                    return None
+                rows, columns = (value.columns, value.rows) if transposed else (value.rows, value.columns)
+                operands.append((rows, columns, typecode(value.fill), repeat(value.fill, rows * columns)))
+                continue
+            if isinstance(value, list):
+                operand = nested_operand(value, transposed)
+                if operand is None:
+                    return None
+                operands.append(operand)
+                continue
+            matrix = ArrayMatrix.from_rows(value)
+            if matrix is None:
+                return None
+            if transposed:
+                matrix = matrix.transpose()
+            operands.append((matrix.rows, matrix.columns, matrix.data.typecode, matrix.elements()))
+        rows, columns = operands[0][:2]
+        if any(operand[:2] != (rows, columns) for operand in operands):
+            return None
+        values = map(self.kernel, *[operand[3] for operand in operands])
+        codes = [operand[2] for operand in operands]
+        if None in codes:
+            return [values[start:start + columns] for start in xrange(0, rows * columns, columns)]
+        try:
+            return ArrayMatrix(array('d' if 'd' in codes else 'l', values), rows, columns)
+        except OverflowError:
+            return None
+
+def nested_operand(rows, transposed):
+    # operand of a template for a nested list of numbers, None for anything else
+    if not rows or not isinstance(rows[0], list):
+        return None
+    columns = len(rows[0])
+    if any(not isinstance(row, list) or len(row) != columns for row in rows):
+        return None
+    elements = list(chain.from_iterable(izip(*rows) if transposed else rows))
+    if not numbers.issuperset(imap(type, elements)):
+        return None
+    return (columns, len(rows), None, elements) if transposed else (len(rows), columns, None, elements)
+
+
+def mark_fused(node):
+    # attaches node.template to the roots of element-wise expressions with more than one
+    # operation, at least one of them binary
+    parents = {}
+    for n in walk(node):
+        for child in children(n):
+            parents[child] = n
+    for n in walk(node):
+        if not fusible(n) or fusible(parents.get(n)):
+            continue
+        template = ElementWiseTemplate(n)
+        if template.operations > 1 and len(template.leaves) > 1:
+            n.template = template
@@ -0,0 +1,12 @@
+#!/usr/bin/env python2
+
+import sys
+from collections import Counter
+
+# Event counters bumped by the interpreter and the optimization passes, printed by main.py --stats.
+counters = Counter()
+
+
+def report(out=sys.stderr):
+    for name, count in sorted(counters.items()):
+        out.write("{}: {}\n".format(name, count))
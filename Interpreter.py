@@ -5,12 +5,22 @@ import SymbolTable
 from Memory import *
 from Exceptions import  *
 from visit import *
+from Instrumentation import counters
+from Matrix import Matrix, ArrayMatrix, SparseMatrix, ConstantMatrix, matmul_values, element_wise_values, \
+    sparse_matmul, sparse_element_wise, constant_matmul, constant_element_wise
+import Parallel
+import MatrixFile
 import sys
 import operator
 
 sys.setrecursionlimit(10000)
 
+# values computed as vectors or matrices
+sequence_types = (list, ArrayMatrix, SparseMatrix, ConstantMatrix)
+
 def transpose(matrix):
+    if isinstance(matrix, (ArrayMatrix, SparseMatrix, ConstantMatrix)):
+        return matrix.transpose()
     dim1 = len(matrix[0])
     dim2 = len(matrix)
 
@@ -25,45 +35,122 @@ def transpose(matrix):
 def ones(dim1, dim2=None):
     if dim2 is None:
         dim2 = dim1
-    return [[1] * dim2 for _ in range(dim1)]
+    return ConstantMatrix(1, dim1, dim2)
 
 def zeros(dim1, dim2=None):
     if dim2 is None:
         dim2 = dim1
-    return [[0] * dim2 for _ in range(dim1)]
+    return ConstantMatrix(0, dim1, dim2)
 
 def eye(dim1, dim2=None):
     if dim2 is None:
         dim2 = dim1
-
-    new_matrix = [[0] * dim2 for _ in range(dim1)]
-
-    for i in range(min(dim1, dim2)):
-        new_matrix[i][i] = 1
-
-    return new_matrix
+    return ConstantMatrix(0, dim1, dim2, identity=True)
 
 def mul(var1, var2):
-    if not (isinstance(var1, list) and isinstance(var2, list)):
+    if not (isinstance(var1, sequence_types) and isinstance(var2, sequence_types)):
         return var1 * var2
-
-    # else matrix multiplication
+    return matmul(var1, var2)
+
+def matmul(var1, var2):
+    if isinstance(var1, ConstantMatrix) or isinstance(var2, ConstantMatrix):
+        result = constant_matmul(var1, var2)
+        if result is not None:
+            return result
+        var1, var2 = materialized(var1), materialized(var2)
+    if isinstance(var1, SparseMatrix) or isinstance(var2, SparseMatrix):
+        left, right = sparse_operands(var1, var2)
+        result = sparse_matmul(left, right) if left is not None else None
+        if result is not None:
+            return result
+        var1, var2 = dense(var1), dense(var2)
+    if isinstance(var1, ArrayMatrix) or isinstance(var2, ArrayMatrix):
+        left, right = ArrayMatrix.from_rows(var1), ArrayMatrix.from_rows(var2)
+        if left is not None and right is not None:
+            result = Parallel.matmul(left, right)
+            if result is not None:
+                return result
     dim1, dim2 = len(var1), len(var2[0])
     transposed_var2 = transpose(var2)
-    result_matrix = zeros(dim1, dim2)
+    result_matrix = [[0] * dim2 for _ in range(dim1)]
     for i in range(dim1):
         for j in range(dim2):
             result_matrix[i][j] = sum(x * y for x, y in zip(var1[i], transposed_var2[j]))
     return result_matrix
 
+def matmul_into(result, var1, var2):
+    # writes var1 * var2 into result, which may be var1, False when it cannot hold the product
+    if isinstance(result, ArrayMatrix):
+        left, right = ArrayMatrix.from_rows(var1), ArrayMatrix.from_rows(var2)
+        product = matmul_values(left, right) if left is not None and right is not None else None
+        return product is not None and result.assign(*product)
+    if not isinstance(result, list):
+        return False
+    columns = zip(*var2)
+    mul = operator.mul
+    for result_row, row in zip(result, var1):
+        result_row[:] = [sum(map(mul, row, column)) for column in columns]
+    return True
+
+def sparse_operands(left, right):
+    # the operands of an operation with a SparseMatrix, the dense one as an ArrayMatrix if it fits
+    if not isinstance(left, SparseMatrix):
+        left = ArrayMatrix.from_rows(left) or left
+    if not isinstance(right, SparseMatrix):
+        right = ArrayMatrix.from_rows(right) or right
+    if isinstance(left, list) or isinstance(right, list):
+        return None, None
+    return left, right
+
+def dense(matrix):
+    return matrix.dense() if isinstance(matrix, SparseMatrix) else matrix
+
+def materialized(matrix):
+    return matrix.materialize() if isinstance(matrix, ConstantMatrix) else matrix
+
 def element_wise(operation):
     def fun(left, right):
-        if isinstance(left, list):
+        if isinstance(left, ConstantMatrix) or isinstance(right, ConstantMatrix):
+            result = constant_element_wise(operation, bin_op_to_fun[operation[1]], left, right)
+            if result is not None:
+                return result
+            left, right = materialized(left), materialized(right)
+        if isinstance(left, SparseMatrix) or isinstance(right, SparseMatrix):
+            result = sparse_element_wise(bin_op_to_fun[operation[1]], left, right) if operation != './' else None
+            if result is not None:
+                return result
+            left, right = dense(left), dense(right)
+        if isinstance(left, ArrayMatrix) and isinstance(right, ArrayMatrix):
+            result = Parallel.element_wise(bin_op_to_fun[operation[1]], left, right)
+            if result is not None:
+                return result
+        if isinstance(left, sequence_types):
             return [fun(l, r) for l, r in zip(left, right)]
         else:
             return bin_op_to_fun[operation[1]](left, right)
     return fun
 
+def matrix_element_wise(operation):
+    # element_wise for two dimensional matrices of numbers, without probing the operands
+    op_fun = bin_op_to_fun[operation[1]]
+    def fun(left, right):
+        if isinstance(left, ConstantMatrix) or isinstance(right, ConstantMatrix):
+            result = constant_element_wise(operation, op_fun, left, right)
+            if result is not None:
+                return result
+            left, right = materialized(left), materialized(right)
+        if isinstance(left, SparseMatrix) or isinstance(right, SparseMatrix):
+            result = sparse_element_wise(op_fun, left, right) if operation != './' else None
+            if result is not None:
+                return result
+            left, right = dense(left), dense(right)
+        if isinstance(left, ArrayMatrix) and isinstance(right, ArrayMatrix):
+            result = Parallel.element_wise(op_fun, left, right)
+            if result is not None:
+                return result
+        return [[op_fun(l, r) for l, r in zip(left_row, right_row)] for left_row, right_row in zip(left, right)]
+    return fun
+
 bin_op_to_fun = {
     '+': operator.add,
     '-': operator.sub,
@@ -82,15 +169,153 @@ un_op_to_fun = {
     'TRANSPOSE': transpose
 }
 
+def matrix_element_wise_into(operation):
+    # like matmul_into
+    op_fun = bin_op_to_fun[operation[1]]
+    def fun(result, left, right):
+        if isinstance(result, ArrayMatrix):
+            if not (isinstance(left, ArrayMatrix) and isinstance(right, ArrayMatrix)):
+                return False
+            values = element_wise_values(op_fun, left, right)
+            return values is not None and result.assign(*values)
+        if not isinstance(result, list):
+            return False
+        for result_row, left_row, right_row in zip(result, left, right):
+            result_row[:] = map(op_fun, left_row, right_row)
+        return True
+    return fun
+
+
+class BufferedOp(object):
+    """Matrix operation whose result shape is known before running. The result is written into
+    a buffer allocated on the first call and overwritten by later calls once the buffer is free
+    again: read by a borrowing consumer (node.borrowed), which keeps nothing, or held by a
+    variable that gave it up or is being assigned the new result. Which handles hold the buffer
+    is told by the ownership of their storage, like for the other updates in place."""
+
+    def __init__(self, kernel, fallback, shape, memories, target=None, borrowed=False):
+        self.kernel = kernel  # kernel(result, left, right) fills result in place, or returns False
+        self.fallback = fallback
+        self.rows, self.columns = shape
+        self.memories = memories
+        self.target = target
+        self.borrowed = borrowed
+        self.buffer = None
+        self.holder = None  # the storage of the handles holding the buffer, once assigned
+
+    def __call__(self, left, right):
+        if not self.fits(left, right):
+            return self.fallback(left, right)
+
+        buffer = self.buffer
+        if buffer is not None and self.reusable(buffer) and self.kernel(buffer, left, right):
+            counters['buffers reused'] += 1
+        else:
+            buffer = self.buffer = self.fallback(left, right)
+            counters['buffers allocated'] += 1
+        self.holder = None
+        return buffer
+
+    def hold(self, storage):
+        # the result was stored in <storage>
+        self.holder = storage
+
+    def fits(self, left, right):
+        if isinstance(left, (SparseMatrix, ConstantMatrix)) or isinstance(right, (SparseMatrix, ConstantMatrix)):
+            # their own kernels do not allocate a dense result
+            return False
+        if self.kernel is matmul_into:
+            return len(left) == self.rows and len(right[0]) == self.columns and len(left[0]) == len(right)
+        return min(len(left), len(right)) == self.rows and min(len(left[0]), len(right[0])) == self.columns
+
+    def reusable(self, buffer):
+        if self.borrowed:
+            return True
+        holder = self.holder
+        if holder is None or holder.rows is not buffer or not holder.spine_owned or \
+                len(holder.owned_rows) != len(buffer):
+            # handed to an operation that may keep it, or out of the hands of its variables
+            return False
+        if holder.refs == 0:
+            # every variable that held it is gone
+            return True
+        # the variable holding it alone is the target, whose value the new result replaces
+        value = self.memories.stack[-1].get(self.target) if self.target is not None else None
+        return holder.refs == 1 and isinstance(value, Matrix) and value.storage is holder
+
+
+
+# operators on ints, floats and strings
+scalar_op_to_fun = dict(bin_op_to_fun, **{'*': operator.mul})
+scalar_types = ('int', 'float', 'string')
+
+def generic_op(op):
+    if op[0] == '.':
+        return element_wise(op)
+    return bin_op_to_fun[op]
+
+def inferred_type(node):
+    return getattr(getattr(node, 'inferred', None), 'type', None)
+
+def scalars(left, right):
+    return not isinstance(left, sequence_types) and not isinstance(right, sequence_types)
+
+def two_dimensional(value):
+    if isinstance(value, (ArrayMatrix, SparseMatrix, ConstantMatrix)):
+        return True
+    return isinstance(value, list) and all(isinstance(row, list) for row in value[:1])
+
+def matrices(left, right):
+    return two_dimensional(left) and two_dimensional(right)
+
+def specialized_op(op, left, right):
+    """Implementation of binary <op> for operand nodes <left> and <right>, chosen from the types
+    the TypeChecker inferred for them, and the check the operand values must pass to use it.
+    Falls back to the generic implementation, which needs no check, when unknown."""
+    left_type = inferred_type(left)
+    right_type = inferred_type(right)
+
+    if left_type in scalar_types and right_type in scalar_types and op[0] != '.':
+        # only '*' differs from the generic operator, which multiplies matrices
+        return scalar_op_to_fun[op], scalars if op == '*' else None
+    if left_type == right_type == 'matrix':
+        if op == '*':
+            return matmul, matrices
+        elif op[0] == '.':
+            return matrix_element_wise(op), matrices
+    return generic_op(op), None
+
+def result_ownership(node, value):
+    # which parts of <value> computed by <node> nothing else refers to, as (outer list, rows)
+    if isinstance(value, ArrayMatrix) and value.base is not None:
+        # a transposed view shares the data of its base
+        return False, False
+    if isinstance(node, (AST.FunctionCall, AST.UnaryExpr)):
+        return True, True
+    if isinstance(node, (AST.Vector, AST.Matrix)):
+        return True, False
+    if isinstance(node, (AST.ArithmeticOperation, AST.Assignment)):
+        # '+' concatenates the rows of its operands, the other operators compute new rows
+        return True, node.op[0] != '+'
+    return False, False
+
 builtin_op_to_fun = {
     'ones': ones,
     'zeros': zeros,
-    'eye': eye
+    'eye': eye,
+    'load': MatrixFile.load,
+    'save': MatrixFile.save
 }
 
 
 class Interpreter(object):
-    memories = MemoryStack()
+
+    def __init__(self, step_budget=None):
+        # every program runs on a stack of its own
+        self.memories = MemoryStack()
+        # loop iterations run and allowed, StepBudgetExceeded is raised past the budget
+        self.steps = 0
+        self.step_budget = step_budget if step_budget is not None else float('+inf')
 
     #indicates that next variable reference should not be resolved to its value
     lvalue = False
@@ -106,6 +331,9 @@ class Interpreter(object):
 
     @when(AST.Block)
     def visit(self, node):
+        if getattr(node, 'frameless', False):
+            node.content.accept(self)
+            return
         self.memories.push()
         try:
             node.content.accept(self)
@@ -124,7 +352,7 @@ class Interpreter(object):
         result = []
         for arg in node.arguments:
             arg = arg.accept(self)
-            if isinstance(arg, list):
+            if isinstance(arg, sequence_types):
                 result += ["[" + "\n ".join(str(a) for a in arg) + "]"]
             else:
                 result += [str(arg)]
@@ -161,13 +389,18 @@ class Interpreter(object):
 
     @when(AST.FunctionCall)
     def visit(self, node):
-        arguments = [arg.accept(self) for arg in node.arguments]
-        function = builtin_op_to_fun[node.name]
-        return function(*arguments)
+        if hasattr(node, 'template'):
+            result = node.template.evaluate(self)
+            if result is not None:
+                return result
+        return self.compute(node)
 
     @when(AST.While)
     def visit(self, node):
         while node.condition.accept(self):
+            self.steps += 1
+            if self.steps > self.step_budget:
+                raise StepBudgetExceeded(self.step_budget)
             try:
                 node.body.accept(self)
             except ContinueException:
@@ -187,6 +420,9 @@ class Interpreter(object):
             self.memories.insert(iterator_ref, start)
 
             while self.memories.get(iterator_ref) < end:
+                self.steps += 1
+                if self.steps > self.step_budget:
+                    raise StepBudgetExceeded(self.step_budget)
                 try:
                     node.body.accept(self)
                 except ContinueException:
@@ -208,7 +444,11 @@ class Interpreter(object):
     def visit(self, node):
         if self.lvalue:
             return node
-        return self.memories.get(node)
+        value = self.memories.get(node)
+        if isinstance(value, Matrix):
+            # the consumer gets the rows, a borrowing one promises not to keep them
+            return value.rows if getattr(node, 'borrowed', False) else value.leak()
+        return value
 
     @when(AST.If)
     def visit(self, node):
@@ -219,14 +459,61 @@ class Interpreter(object):
 
     @when(AST.ArithmeticOperation)
     def visit(self, node):
-        left = node.left.accept(self)
-        right = node.right.accept(self)
-        if node.op[0] == '.':
-            op_fun = element_wise(node.op)
-        else:
-            op_fun = bin_op_to_fun[node.op]
+        if hasattr(node, 'template'):
+            result = node.template.evaluate(self)
+            if result is not None:
+                return result
+        return self.compute(node)
+
+    def compute(self, node):
+        # the value of operation <node> without its template
+        if isinstance(node, AST.ArithmeticOperation):
+            left = node.left.accept(self)
+            return self.apply(node, left, node.right.accept(self))
+        if isinstance(node, AST.UnaryExpr):
+            return self.apply(node, node.operand.accept(self))
+        arguments = [arg.accept(self) for arg in node.arguments]
+        function = builtin_op_to_fun[node.name]
+        return function(*arguments)
+
+    def apply(self, node, *operands):
+        # operation <node> on the values of its operands
+        if isinstance(node, AST.ArithmeticOperation):
+            return self.binary_op(node, node.op, *operands)
+        try:
+            op_fun = node.op_fun
+        except AttributeError:
+            op_fun = node.op_fun = un_op_to_fun[node.operation]
+        return op_fun(*operands)
+
+    def binary_op(self, node, op, left, right):
+        # the implementation is chosen on the first evaluation of <node> and kept on it
+        try:
+            op_fun = node.op_fun
+        except AttributeError:
+            op_fun = node.op_fun = self.specialize(node, op)
+        check = node.op_check
+        if check is not None and not check(left, right):
+            # the inferred types did not hold for these values, <node> keeps the generic implementation
+            op_fun = node.op_fun = generic_op(op)
+            node.op_check = None
+            counters['operations despecialized'] += 1
         return op_fun(left, right)
 
+    def specialize(self, node, op):
+        op_fun, node.op_check = specialized_op(op, node.left, node.right)
+        shape = getattr(node, 'shape', None)
+        if isinstance(node, AST.ArithmeticOperation) and shape is not None and len(shape) == 2:
+            if op_fun is matmul:
+                kernel = matmul_into
+            elif op[0] == '.' and inferred_type(node.left) == inferred_type(node.right) == 'matrix':
+                kernel = matrix_element_wise_into(op)
+            else:
+                return op_fun
+            return BufferedOp(kernel, op_fun, shape, self.memories, getattr(node, 'assigned_to', None),
+                              getattr(node, 'borrowed', False))
+        return op_fun
+
     @when(AST.Assignment)
     def visit(self, node):
         self.lvalue = True
@@ -234,15 +521,77 @@ class Interpreter(object):
         self.lvalue = False
 
         if node.op == "=":
-            value = node.right.accept(self)
+            if isinstance(node.right, AST.Variable) and isinstance(target_ref, AST.Variable):
+                # O(1), the rows are copied on the first write through either variable
+                value = self.memories.get(node.right)
+                if isinstance(value, Matrix):
+                    value = value.share()
+            elif hasattr(node, 'in_place') and not hasattr(node.right, 'template'):
+                # a fused expression allocates nothing but its result already
+                value = self.element_wise_in_place(node)
+            else:
+                value = self.stored(node.right, target_ref, node.right.accept(self))
             self.memories.insert(target_ref, value)
         else:
-            op_fun = bin_op_to_fun[node.op[0]]
-
             right = node.right.accept(self)
-            left = node.left.accept(self)
-            value = op_fun(left, right)
-            self.memories.insert(target_ref, value)
+            left = self.memories.get(target_ref)
+            if isinstance(left, Matrix):
+                if self.update_in_place(target_ref, node.op[0], left, right):
+                    counters['in-place updates'] += 1
+                    self.memories.stamp(target_ref)
+                    return
+                left = left.leak() if node.op[0] == '+' else left.rows
+            value = self.binary_op(node, node.op[0], left, right)
+            self.memories.insert(target_ref, self.stored(node, target_ref, value))
+
+    def stored(self, node, target_ref, value):
+        # the value a variable holds for the result of <node>
+        if isinstance(value, sequence_types) and isinstance(target_ref, AST.Variable):
+            handle = Matrix(value, *result_ownership(node, value))
+            op_fun = getattr(node, 'op_fun', None)
+            if isinstance(op_fun, BufferedOp) and op_fun.buffer is value:
+                # the variable owns the buffer until it gives it up
+                op_fun.hold(handle.storage)
+            return handle
+        return value
+
+    def update_in_place(self, target_ref, op, left, right):
+        # A += B and A *= B on a value stored in the frame the result would be inserted into,
+        # done in place when no other variable shares it (nor its rows, for *=)
+        if not isinstance(target_ref, AST.Variable) or not self.memories.stack[-1].has_key(target_ref):
+            return False
+        rows = left.rows
+        if right is rows:
+            return False
+        if op == '+':
+            if not (isinstance(rows, list) and left.owns_spine()):
+                return False
+            rows.extend(right)
+            return True
+        if op == '*' and inferred_type(target_ref) == 'matrix' and isinstance(right, sequence_types):
+            if len(right) != len(rows[0]) or not left.exclusive():
+                return False
+            return matmul_into(rows, rows, right)
+        return False
+
+    def element_wise_in_place(self, node):
+        # X = L op R, with op element-wise, written into the value of the operand node.in_place,
+        # which liveness found dead afterwards unless it is X stored in the current frame
+        expr = node.right
+        operand = node.in_place
+        same = operand.name == node.left.name
+        handle = self.memories.get(operand)
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        if same and not self.memories.stack[-1].has_key(operand):
+            handle = None
+        if isinstance(handle, Matrix) and isinstance(left, sequence_types) and isinstance(right, sequence_types) \
+                and left and len(left) == len(right) and len(left[0]) == len(right[0]) and handle.exclusive() \
+                and matrix_element_wise_into(expr.op)(handle.rows, left, right):
+            counters['in-place updates'] += 1
+            self.memories.stamp(operand)
+            return handle if same else handle.share()
+        return self.stored(expr, node.left, self.binary_op(expr, expr.op, left, right))
 
     @when(AST.IntNum)
     def visit(self, node):
@@ -254,9 +603,11 @@ class Interpreter(object):
 
     @when(AST.UnaryExpr)
     def visit(self, node):
-        op_fun = un_op_to_fun[node.operation]
-        operand = node.operand.accept(self)
-        return op_fun(operand)
+        if hasattr(node, 'template'):
+            result = node.template.evaluate(self)
+            if result is not None:
+                return result
+        return self.compute(node)
 
     @when(AST.Comparison)
     def visit(self, node):
@@ -0,0 +1,785 @@
+#!/usr/bin/env python2
+
+import operator
+from array import array
+from itertools import imap, chain, repeat
+from Instrumentation import counters
+
+# Vector and matrix values held by variables. Expressions work on nested lists and ArrayMatrix
+# objects; a variable holds a Matrix handle around them, so that A = B only shares the value and
+# copying is deferred to the first element write through either variable, and then limited to
+# the row written (an ArrayMatrix is copied whole, in one contiguous block).
+
+
+def typecode(value):
+    # array typecode able to hold <value> without changing how it prints
+    value_type = type(value)
+    if value_type is int or value_type is long:
+        return 'l'
+    if value_type is float:
+        return 'd'
+    return None
+
+
+def result_typecode(left, right):
+    return 'd' if 'd' in (left.data.typecode, right.data.typecode) else 'l'
+
+
+class ArrayMatrix(object):
+    """Two dimensional matrix of ints ('l') or floats ('d') in a single array. Element (i, j) is
+    data[offset + i * row_stride + j * column_stride]. transpose() returns a view sharing the
+    data, base is then the matrix owning it. Reading a row gives a list, like a nested list."""
+
+    __slots__ = ('data', 'rows', 'columns', 'offset', 'row_stride', 'column_stride', 'base')
+
+    def __init__(self, data, rows, columns, row_stride=None, column_stride=1, offset=0, base=None):
+        self.data = data
+        self.rows = rows
+        self.columns = columns
+        self.row_stride = columns if row_stride is None else row_stride
+        self.column_stride = column_stride
+        self.offset = offset
+        self.base = base
+
+    @classmethod
+    def filled(cls, rows, columns, value):
+        rows, columns = max(rows, 0), max(columns, 0)
+        return cls(array(typecode(value), [value]) * (rows * columns), rows, columns)
+
+    @classmethod
+    def from_rows(cls, rows):
+        # <rows> as an ArrayMatrix, None unless it is a rectangular nested list of all ints or
+        # all floats (or a SparseMatrix of ints)
+        if isinstance(rows, ArrayMatrix):
+            return rows
+        if isinstance(rows, ConstantMatrix):
+            rows = rows.materialize()
+        if isinstance(rows, SparseMatrix):
+            rows = rows.dense()
+            return rows if isinstance(rows, ArrayMatrix) else None
+        if not isinstance(rows, list) or not rows or not isinstance(rows[0], list):
+            return None
+        columns = len(rows[0])
+        codes = set()
+        for row in rows:
+            if not isinstance(row, list) or len(row) != columns:
+                return None
+            codes.update(imap(typecode, row))
+        if len(codes) != 1 or None in codes:
+            return None
+        data = array(codes.pop())
+        try:
+            for row in rows:
+                data.fromlist(row)
+        except OverflowError:
+            # longs beyond the range of a C long
+            return None
+        return cls(data, len(rows), columns)
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        for i in xrange(self.rows):
+            yield self.row_array(i).tolist()
+
+    def __getitem__(self, i):
+        return self.row_array(self.index(i, self.rows)).tolist()
+
+    def __eq__(self, other):
+        if isinstance(other, ArrayMatrix):
+            other = other.tolist()
+        return self.tolist() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __lt__(self, other):
+        # nested lists order row by row
+        if isinstance(other, ArrayMatrix):
+            other = other.tolist()
+        return self.tolist() < other
+
+    def __le__(self, other):
+        if isinstance(other, ArrayMatrix):
+            other = other.tolist()
+        return self.tolist() <= other
+
+    def __gt__(self, other):
+        if isinstance(other, ArrayMatrix):
+            other = other.tolist()
+        return self.tolist() > other
+
+    def __ge__(self, other):
+        if isinstance(other, ArrayMatrix):
+            other = other.tolist()
+        return self.tolist() >= other
+
+    __hash__ = None
+
+    def __add__(self, other):
+        # '+' concatenates rows, as it does for nested lists
+        if isinstance(other, ArrayMatrix):
+            if other.columns == self.columns and other.data.typecode == self.data.typecode:
+                return ArrayMatrix(self.flat() + other.flat(), self.rows + other.rows, self.columns)
+            other = other.tolist()
+        return self.tolist() + other
+
+    def __radd__(self, other):
+        return other + self.tolist()
+
+    @staticmethod
+    def index(i, size):
+        if i < 0:
+            i += size
+        if not 0 <= i < size:
+            raise IndexError("matrix index out of range")
+        return i
+
+    def contiguous(self):
+        return self.column_stride == 1 and self.row_stride == self.columns
+
+    def row_array(self, i):
+        start = self.offset + i * self.row_stride
+        step = self.column_stride
+        return self.data[start:start + self.columns * step:step]
+
+    def flat(self):
+        # the elements in row-major order, the data itself when it holds just them
+        size = self.rows * self.columns
+        if self.contiguous():
+            if self.offset == 0 and len(self.data) == size:
+                return self.data
+            return self.data[self.offset:self.offset + size]
+        result = array(self.data.typecode)
+        for i in xrange(self.rows):
+            result.extend(self.row_array(i))
+        return result
+
+    def elements(self):
+        # iterable over the elements in row-major order, reading strided data in place
+        size = self.rows * self.columns
+        data = self.data
+        if self.offset == 0 and len(data) == size and self.contiguous():
+            return data
+        if size == 0:
+            return ()
+        step, columns = self.column_stride, self.columns
+        starts = xrange(self.offset, self.offset + self.rows * self.row_stride, self.row_stride)
+        indices = chain.from_iterable(xrange(start, start + columns * step, step) for start in starts)
+        return imap(data.__getitem__, indices)
+
+    def tolist(self):
+        return [self.row_array(i).tolist() for i in xrange(self.rows)]
+
+    def copy(self):
+        data = self.flat()
+        return ArrayMatrix(data[:] if data is self.data else data, self.rows, self.columns)
+
+    def transpose(self):
+        return ArrayMatrix(self.data, self.columns, self.rows, self.column_stride, self.row_stride,
+                           self.offset, self.base or self)
+
+    def get(self, i, j):
+        i = self.index(i, self.rows)
+        j = self.index(j, self.columns)
+        return self.data[self.offset + i * self.row_stride + j * self.column_stride]
+
+    def set(self, i, j, value):
+        # False when <value> cannot be stored without changing how the matrix prints
+        i = self.index(i, self.rows)
+        j = self.index(j, self.columns)
+        if typecode(value) != self.data.typecode:
+            return False
+        try:
+            self.data[self.offset + i * self.row_stride + j * self.column_stride] = value
+        except OverflowError:
+            return False
+        return True
+
+    def assign(self, code, values):
+        # overwrites every element with <values> in row-major order, False when they do not fit
+        size = self.rows * self.columns
+        if code != self.data.typecode or self.base is not None or not self.contiguous():
+            return False
+        try:
+            values = array(code, values)
+        except OverflowError:
+            return False
+        if len(values) != size:
+            return False
+        self.data[self.offset:self.offset + size] = values
+        return True
+
+
+def matmul_values(left, right):
+    # (typecode, elements) of left * right, None when the list kernel has to handle it
+    if left.columns != right.rows or left.columns == 0:
+        return None
+    mul = operator.mul
+    columns = right.transpose().tolist()
+    values = []
+    for i in xrange(left.rows):
+        row = left.row_array(i).tolist()
+        values.extend([sum(imap(mul, row, column)) for column in columns])
+    return result_typecode(left, right), values
+
+
+def element_wise_values(op_fun, left, right):
+    if left.rows != right.rows or left.columns != right.columns:
+        # zip stops at the shorter operand, left to the list kernel
+        return None
+    return result_typecode(left, right), map(op_fun, left.flat(), right.flat())
+
+
+def array_result(rows, columns, result):
+    if result is None:
+        return None
+    code, values = result
+    try:
+        return ArrayMatrix(array(code, values), rows, columns)
+    except OverflowError:
+        return None
+
+
+def array_matmul(left, right):
+    return array_result(left.rows, right.columns, matmul_values(left, right))
+
+
+def array_element_wise(op_fun, left, right):
+    return array_result(left.rows, left.columns, element_wise_values(op_fun, left, right))
+
+
+def zero(value):
+    # cells holding the int 0 are left out of a SparseMatrix
+    return type(value) is int and value == 0
+
+
+class SparseMatrix(object):
+    """Two dimensional matrix holding only the cells that are not the int 0, in a dictionary
+    of keys (i, j). Like ArrayMatrix, reading a row gives a list."""
+
+    __slots__ = ('cells', 'rows', 'columns')
+
+    # below this many cells a matrix is kept dense
+    min_size = 1024
+    # fraction of cells set above which a matrix is converted to a dense one
+    max_density = 0.1
+
+    def __init__(self, cells, rows, columns):
+        self.cells = cells
+        self.rows = rows
+        self.columns = columns
+
+    @classmethod
+    def eye(cls, rows, columns):
+        rows, columns = max(rows, 0), max(columns, 0)
+        return cls(dict(((i, i), 1) for i in xrange(min(rows, columns))), rows, columns)
+
+    @classmethod
+    def worthwhile(cls, rows, columns):
+        return rows * columns >= cls.min_size
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        for i in xrange(self.rows):
+            yield self.row(i)
+
+    def __getitem__(self, i):
+        return self.row(ArrayMatrix.index(i, self.rows))
+
+    def __eq__(self, other):
+        if isinstance(other, (ArrayMatrix, SparseMatrix)):
+            other = other.tolist()
+        return self.tolist() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __lt__(self, other):
+        # nested lists order row by row
+        if isinstance(other, (ArrayMatrix, SparseMatrix)):
+            other = other.tolist()
+        return self.tolist() < other
+
+    def __le__(self, other):
+        if isinstance(other, (ArrayMatrix, SparseMatrix)):
+            other = other.tolist()
+        return self.tolist() <= other
+
+    def __gt__(self, other):
+        if isinstance(other, (ArrayMatrix, SparseMatrix)):
+            other = other.tolist()
+        return self.tolist() > other
+
+    def __ge__(self, other):
+        if isinstance(other, (ArrayMatrix, SparseMatrix)):
+            other = other.tolist()
+        return self.tolist() >= other
+
+    __hash__ = None
+
+    def __add__(self, other):
+        # '+' concatenates rows
+        if isinstance(other, SparseMatrix) and other.columns == self.columns:
+            cells = dict(self.cells)
+            cells.update(((i + self.rows, j), v) for (i, j), v in other.cells.iteritems())
+            return SparseMatrix(cells, self.rows + other.rows, self.columns)
+        if isinstance(other, (ArrayMatrix, SparseMatrix)):
+            other = other.tolist()
+        return self.tolist() + other
+
+    def __radd__(self, other):
+        return other + self.tolist()
+
+    def row(self, i):
+        cells = self.cells
+        return [cells.get((i, j), 0) for j in xrange(self.columns)]
+
+    def tolist(self):
+        result = [[0] * self.columns for _ in xrange(self.rows)]
+        for (i, j), value in self.cells.iteritems():
+            result[i][j] = value
+        return result
+
+    def dense(self):
+        # the same matrix as an ArrayMatrix, or as nested lists when the values do not fit one
+        counters['sparse matrices densified'] += 1
+        if self.integral():
+            matrix = ArrayMatrix.filled(self.rows, self.columns, 0)
+            try:
+                for (i, j), value in self.cells.iteritems():
+                    matrix.data[i * self.columns + j] = value
+                return matrix
+            except OverflowError:
+                pass
+        return self.tolist()
+
+    def too_dense(self):
+        return len(self.cells) > self.max_density * self.rows * self.columns
+
+    def integral(self):
+        return all(type(value) is int for value in self.cells.itervalues())
+
+    def copy(self):
+        return SparseMatrix(dict(self.cells), self.rows, self.columns)
+
+    def transpose(self):
+        return SparseMatrix(dict(((j, i), v) for (i, j), v in self.cells.iteritems()), self.columns, self.rows)
+
+    def get(self, i, j):
+        return self.cells.get((ArrayMatrix.index(i, self.rows), ArrayMatrix.index(j, self.columns)), 0)
+
+    def set(self, i, j, value):
+        key = ArrayMatrix.index(i, self.rows), ArrayMatrix.index(j, self.columns)
+        if zero(value):
+            self.cells.pop(key, None)
+        else:
+            self.cells[key] = value
+        return True
+
+    def by_rows(self):
+        # row index -> [(column, value)]
+        result = {}
+        for (i, j), value in self.cells.iteritems():
+            result.setdefault(i, []).append((j, value))
+        return result
+
+
+def sparse_result(cells, rows, columns):
+    matrix = SparseMatrix(cells, rows, columns)
+    return matrix.dense() if matrix.too_dense() else matrix
+
+
+def sparse_matmul(left, right):
+    """Product of a SparseMatrix and a SparseMatrix or ArrayMatrix of ints, summing only products of nonzero
+    cells. None when a float could show up as a 0.0 of the dense product, or the sizes do not
+    match, which the dense kernels handle."""
+    if left.columns != right.rows:
+        return None
+    for operand in (left, right):
+        if isinstance(operand, SparseMatrix) and not operand.integral() or \
+                isinstance(operand, ArrayMatrix) and operand.data.typecode != 'l':
+            return None
+    if isinstance(left, SparseMatrix) and isinstance(right, SparseMatrix):
+        right_rows = right.by_rows()
+        cells = {}
+        for (i, k), a in left.cells.iteritems():
+            for j, b in right_rows.get(k, ()):
+                cells[i, j] = cells.get((i, j), 0) + a * b
+        return sparse_result(dict((key, v) for key, v in cells.iteritems() if not zero(v)), left.rows, right.columns)
+    # one dense operand, the product is dense
+    rows = [[0] * right.columns for _ in xrange(left.rows)]
+    if isinstance(left, SparseMatrix):
+        for (i, k), a in left.cells.iteritems():
+            row = rows[i]
+            for j, b in enumerate(right.row_array(k)):
+                row[j] += a * b
+    else:
+        columns = right.by_rows()
+        for i in xrange(left.rows):
+            row, left_row = rows[i], left.row_array(i)
+            for k, entries in columns.iteritems():
+                a = left_row[k]
+                for j, b in entries:
+                    row[j] += a * b
+    try:
+        return ArrayMatrix(array('l', [v for row in rows for v in row]), left.rows, right.columns)
+    except OverflowError:
+        return rows
+
+
+def sparse_element_wise(op_fun, left, right):
+    """.+, .- or .* of two SparseMatrix operands of one shape, computed on the cells set in
+    either (an absent cell holds the int 0, so op(0, 0) is 0 there). None otherwise."""
+    if not (isinstance(left, SparseMatrix) and isinstance(right, SparseMatrix)) or \
+            (left.rows, left.columns) != (right.rows, right.columns):
+        return None
+    cells = {}
+    left_cells, right_cells = left.cells, right.cells
+    for key in set(left_cells).union(right_cells):
+        value = op_fun(left_cells.get(key, 0), right_cells.get(key, 0))
+        if not zero(value):
+            cells[key] = value
+    return sparse_result(cells, left.rows, left.columns)
+
+
+class ConstantMatrix(object):
+    """Matrix made by ones, zeros or eye, every element equal to fill or, for an identity, 1 on
+    the diagonal and 0 elsewhere. Nothing is allocated until an element is written, which
+    materializes the matrix the constructor used to return."""
+
+    __slots__ = ('fill', 'identity', 'rows', 'columns')
+
+    def __init__(self, fill, rows, columns, identity=False):
+        self.fill = fill
+        self.identity = identity
+        self.rows = max(rows, 0)
+        self.columns = max(columns, 0)
+        counters['constant matrices'] += 1
+        counters['constant cells'] += self.rows * self.columns
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        for i in xrange(self.rows):
+            yield self.row(i)
+
+    def __getitem__(self, i):
+        return self.row(ArrayMatrix.index(i, self.rows))
+
+    def __eq__(self, other):
+        if isinstance(other, (ArrayMatrix, SparseMatrix, ConstantMatrix)):
+            other = other.tolist()
+        return self.tolist() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __lt__(self, other):
+        # nested lists order row by row
+        if isinstance(other, (ArrayMatrix, SparseMatrix, ConstantMatrix)):
+            other = other.tolist()
+        return self.tolist() < other
+
+    def __le__(self, other):
+        if isinstance(other, (ArrayMatrix, SparseMatrix, ConstantMatrix)):
+            other = other.tolist()
+        return self.tolist() <= other
+
+    def __gt__(self, other):
+        if isinstance(other, (ArrayMatrix, SparseMatrix, ConstantMatrix)):
+            other = other.tolist()
+        return self.tolist() > other
+
+    def __ge__(self, other):
+        if isinstance(other, (ArrayMatrix, SparseMatrix, ConstantMatrix)):
+            other = other.tolist()
+        return self.tolist() >= other
+
+    __hash__ = None
+
+    def __add__(self, other):
+        # '+' concatenates rows
+        if isinstance(other, (ArrayMatrix, SparseMatrix, ConstantMatrix)):
+            other = other.tolist()
+        return self.tolist() + other
+
+    def __radd__(self, other):
+        return other + self.tolist()
+
+    def row(self, i):
+        if not self.identity:
+            return [self.fill] * self.columns
+        row = [0] * self.columns
+        if i < self.columns:
+            row[i] = 1
+        return row
+
+    def tolist(self):
+        return [self.row(i) for i in xrange(self.rows)]
+
+    def square_identity(self):
+        return self.identity and self.rows == self.columns
+
+    def get(self, i, j):
+        i, j = ArrayMatrix.index(i, self.rows), ArrayMatrix.index(j, self.columns)
+        if self.identity:
+            return 1 if i == j else 0
+        return self.fill
+
+    def transpose(self):
+        return ConstantMatrix(self.fill, self.columns, self.rows, self.identity)
+
+    def materialize(self):
+        # the matrix ones, zeros or eye allocate
+        counters['constant matrices materialized'] += 1
+        counters['constant cells materialized'] += self.rows * self.columns
+        rows, columns = self.rows, self.columns
+        if self.identity:
+            if SparseMatrix.worthwhile(rows, columns):
+                return SparseMatrix.eye(rows, columns)
+            matrix = ArrayMatrix.filled(rows, columns, 0)
+            for i in xrange(min(rows, columns)):
+                matrix.set(i, i, 1)
+            return matrix
+        if zero(self.fill) and SparseMatrix.worthwhile(rows, columns):
+            return SparseMatrix({}, rows, columns)
+        return ArrayMatrix.filled(rows, columns, self.fill)
+
+    copy = materialize
+
+
+def shape(matrix):
+    # (rows, columns) of a two dimensional matrix, None for anything else
+    if isinstance(matrix, (ArrayMatrix, SparseMatrix, ConstantMatrix)):
+        return matrix.rows, matrix.columns
+    if isinstance(matrix, list) and matrix and isinstance(matrix[0], list):
+        return len(matrix), len(matrix[0])
+    return None
+
+
+def integral(matrix):
+    # whether every element is an int, so that adding 0 or multiplying by 1 leaves it unchanged
+    if isinstance(matrix, ArrayMatrix):
+        return matrix.data.typecode == 'l'
+    if isinstance(matrix, SparseMatrix):
+        return matrix.integral()
+    if isinstance(matrix, ConstantMatrix):
+        return matrix.identity or type(matrix.fill) is int
+    return all(type(x) is int for row in matrix for x in row)
+
+
+def unchanged(matrix):
+    # a copy of <matrix> as the result of an operation leaving it unchanged
+    if isinstance(matrix, ConstantMatrix):
+        return ConstantMatrix(matrix.fill, matrix.rows, matrix.columns, matrix.identity)
+    if isinstance(matrix, (ArrayMatrix, SparseMatrix)):
+        return matrix.copy()
+    return [list(row) for row in matrix]
+
+
+def constant_matmul(left, right):
+    """Product with a ConstantMatrix operand, when it follows without multiplying: by a square
+    identity, by zeros, or of two constant fills. Only for int matrices, whose sums of products
+    by 0 and 1 are exact. None otherwise."""
+    left_shape, right_shape = shape(left), shape(right)
+    if left_shape is None or right_shape is None or left_shape[1] != right_shape[0] or 0 in left_shape + right_shape:
+        return None
+    if not (integral(left) and integral(right)):
+        return None
+    rows, columns = left_shape[0], right_shape[1]
+    for constant, other in ((left, right), (right, left)):
+        if not isinstance(constant, ConstantMatrix):
+            continue
+        if constant.square_identity():
+            counters['constant operations simplified'] += 1
+            return unchanged(other)
+        if not constant.identity and constant.fill == 0:
+            counters['constant operations simplified'] += 1
+            return ConstantMatrix(0, rows, columns)
+    if isinstance(left, ConstantMatrix) and isinstance(right, ConstantMatrix) \
+            and not (left.identity or right.identity):
+        counters['constant operations simplified'] += 1
+        return ConstantMatrix(left.fill * right.fill * left.columns, rows, columns)
+    return None
+
+
+def constant_element_wise(op, op_fun, left, right):
+    """Element-wise operation with a ConstantMatrix operand of the shape of the other one. A
+    fill is applied like a scalar, without materializing the constant; adding zeros to or
+    multiplying them by an int matrix gives its result directly. None for an identity."""
+    left_shape = shape(left)
+    if left_shape is None or left_shape != shape(right):
+        return None
+    rows, columns = left_shape
+    constants = [m for m in (left, right) if isinstance(m, ConstantMatrix)]
+    if any(m.identity for m in constants):
+        return None
+    if len(constants) == 2:
+        fill = op_fun(left.fill, right.fill)
+        if typecode(fill) is None:
+            return None
+        counters['constant operations simplified'] += 1
+        return ConstantMatrix(fill, rows, columns)
+    constant, other = (left, right) if constants[0] is left else (right, left)
+    if zero(constant.fill) and op in ('.+', '.*') and integral(other):
+        counters['constant operations simplified'] += 1
+        return unchanged(other) if op == '.+' else ConstantMatrix(0, rows, columns)
+    fill = constant.fill
+    counters['constant operations simplified'] += 1
+
+    def applied(elements):
+        fills = repeat(fill, len(elements) if isinstance(elements, list) else rows * columns)
+        return map(op_fun, fills, elements) if constant is left else map(op_fun, elements, fills)
+
+    matrix = ArrayMatrix.from_rows(other)
+    if matrix is not None and typecode(fill) is not None:
+        code = 'd' if 'd' in (typecode(fill), matrix.data.typecode) else 'l'
+        try:
+            return ArrayMatrix(array(code, applied(matrix.elements())), rows, columns)
+        except OverflowError:
+            pass
+    return [applied(row) for row in other]
+
+
+class Storage(object):
+    """Nested list shared by the handles in refs. spine_owned tells whether the outer list is
+    referred to only by this storage, owned_rows holds the indices of the rows that are."""
+
+    __slots__ = ('rows', 'refs', 'spine_owned', 'owned_rows')
+
+    def __init__(self, rows, spine_owned, rows_owned):
+        self.rows = rows
+        self.refs = 1
+        self.spine_owned = spine_owned
+        self.owned_rows = set(range(len(rows))) if rows_owned else set()
+
+
+class Matrix(object):
+
+    __slots__ = ('storage',)
+
+    def __init__(self, rows, spine_owned=False, rows_owned=False):
+        # rows: the nested list, owned tells which parts nothing else refers to
+        self.storage = Storage(rows, spine_owned, rows_owned)
+
+    def __repr__(self):
+        return "Matrix({!r})".format(self.storage.rows)
+
+    @property
+    def rows(self):
+        # for reading only, the storage keeps claiming its rows
+        return self.storage.rows
+
+    def share(self):
+        # another handle to the same rows, for assignment of one variable to another
+        storage = self.storage
+        storage.refs += 1
+        counters['matrices shared'] += 1
+        handle = Matrix.__new__(Matrix)
+        handle.storage = storage
+        return handle
+
+    def release(self):
+        self.storage.refs -= 1
+
+    def leak(self):
+        # the rows are handed out to something that may keep them, they are no longer owned
+        storage = self.storage
+        storage.spine_owned = False
+        storage.owned_rows.clear()
+        return storage.rows
+
+    def owns_spine(self):
+        storage = self.storage
+        return storage.refs == 1 and storage.spine_owned
+
+    def exclusive(self):
+        # whether the whole value may be updated in place
+        storage = self.storage
+        return storage.refs == 1 and storage.spine_owned and len(storage.owned_rows) == len(storage.rows)
+
+    def get(self, coords):
+        storage = self.storage
+        value = storage.rows
+        if isinstance(value, (ArrayMatrix, SparseMatrix, ConstantMatrix)) and len(coords) == 2:
+            return value.get(*coords)
+        for coord in coords:
+            value = value[coord]
+            if value is None:
+                break
+        if isinstance(value, list):
+            # a row, or part of one, may now be kept elsewhere
+            storage.owned_rows.discard(coords[0])
+        return value
+
+    def put(self, coords, value):
+        rows = self.detach()
+        if isinstance(rows, ConstantMatrix):
+            rows = self.storage.rows = rows.materialize()
+        if isinstance(rows, SparseMatrix) and len(coords) == 2:
+            rows.set(coords[0], coords[1], value)
+            if rows.too_dense():
+                self.storage.rows = rows.dense()
+            return
+        if isinstance(rows, (ArrayMatrix, SparseMatrix)):
+            if len(coords) == 2 and rows.set(coords[0], coords[1], value):
+                return
+            # the value does not fit the array, continue with nested lists
+            rows = self.storage.rows = rows.tolist()
+            self.storage.owned_rows = set(range(len(rows)))
+        owned_rows = self.storage.owned_rows
+        first = coords[0]
+        if len(coords) == 1:
+            rows[first] = value
+            owned_rows.discard(first)
+            return
+        if first not in owned_rows:
+            rows[first] = list(rows[first])
+            owned_rows.add(first)
+            counters['rows copied'] += 1
+        container = rows[first]
+        for coord in coords[1:-1]:
+            # nesting deeper than rows is not tracked, copy the path
+            container[coord] = list(container[coord])
+            container = container[coord]
+        container[coords[-1]] = value
+
+    def detach(self):
+        # makes the outer list private to this handle, the rows stay shared until written
+        storage = self.storage
+        rows = storage.rows
+        if storage.refs == 1 and storage.spine_owned:
+            return rows
+        if isinstance(rows, (ArrayMatrix, SparseMatrix, ConstantMatrix)):
+            # a constant is materialized straight into the writer's storage and counts its own cells
+            copy = Storage(rows.copy(), True, True)
+            if not isinstance(rows, ConstantMatrix):
+                counters['arrays copied'] += 1
+                counters['array cells copied'] += rows.rows * rows.columns
+        else:
+            # the rows are now referred to by the copy as well
+            storage.owned_rows.clear()
+            copy = Storage(list(rows), True, False)
+        if storage.refs > 1:
+            storage.refs -= 1
+            self.storage = copy
+            counters['matrices detached'] += 1
+        else:
+            storage.rows = copy.rows
+            storage.spine_owned = True
+            storage.owned_rows = copy.owned_rows
+        return self.storage.rows
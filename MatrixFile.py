@@ -0,0 +1,128 @@
+#!/usr/bin/env python2
+
+import os
+import sys
+import mmap
+import struct
+from array import array
+from Matrix import ArrayMatrix
+from Exceptions import MatrixFileError
+from Instrumentation import counters
+
+# Matrices in binary files, for the load and save builtins. A file holds a header and the
+# elements in row-major order, as 8-byte little endian ints or doubles:
+#
+#   'MMAT', version, typecode ('l' or 'd'), two unused bytes, rows, columns
+#
+# load maps the file in memory instead of reading it. The matrix it returns reads single
+# elements and rows from the mapping; its data is copied into an array, never a list, only
+# once an operation needs all of it. save writes the file whole and then renames it over the
+# old one, so matrices loaded from the old file keep their data.
+
+magic = 'MMAT'
+version = 1
+
+header = struct.Struct('<4sBcxxII')
+elements = {'l': struct.Struct('<q'), 'd': struct.Struct('<d')}
+swapped = sys.byteorder != 'little'
+
+
+def check_machine():
+    if array('l').itemsize != 8:
+        raise MatrixFileError("matrix files hold 8-byte ints, those of this machine have {} bytes"
+                              .format(array('l').itemsize))
+
+
+class MappedMatrix(ArrayMatrix):
+    """ArrayMatrix over a matrix file mapped in memory. The data is read from the mapping into
+    an array on first use; get and row_array read from the mapping until then."""
+
+    __slots__ = ('mapping', 'code', 'loaded')
+
+    def __init__(self, mapping, code, rows, columns):
+        self.loaded = None
+        self.mapping = mapping
+        self.code = code
+        ArrayMatrix.__init__(self, None, rows, columns)
+
+    @property
+    def data(self):
+        if self.loaded is None:
+            self.loaded = self.read(0, self.rows * self.columns)
+            # the array is all the matrix needs from now on
+            self.mapping = None
+            counters['loaded matrices copied'] += 1
+        return self.loaded
+
+    @data.setter
+    def data(self, data):
+        if data is not None:
+            self.loaded = data
+
+    def read(self, start, size):
+        values = array(self.code)
+        position = header.size + start * values.itemsize
+        values.fromstring(self.mapping[position:position + size * values.itemsize])
+        if swapped:
+            values.byteswap()
+        return values
+
+    def row_array(self, i):
+        if self.loaded is not None:
+            return ArrayMatrix.row_array(self, i)
+        return self.read(i * self.columns, self.columns)
+
+    def get(self, i, j):
+        if self.loaded is not None:
+            return ArrayMatrix.get(self, i, j)
+        i = self.index(i, self.rows)
+        j = self.index(j, self.columns)
+        return elements[self.code].unpack_from(self.mapping, header.size + (i * self.columns + j) * 8)[0]
+
+
+def load(path):
+    """The matrix in file <path>, as a MappedMatrix."""
+    check_machine()
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < header.size:
+                raise MatrixFileError("{} is not a matrix file".format(path))
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (IOError, OSError) as e:
+        raise MatrixFileError("cannot read matrix file {}: {}".format(path, e.strerror))
+    file_magic, file_version, code, rows, columns = header.unpack_from(mapping)
+    if file_magic != magic:
+        raise MatrixFileError("{} is not a matrix file".format(path))
+    if file_version != version:
+        raise MatrixFileError("matrix file version {} is not supported".format(file_version))
+    if code not in elements:
+        raise MatrixFileError("{} holds elements of unknown type {!r}".format(path, code))
+    if size != header.size + rows * columns * 8:
+        raise MatrixFileError("{} does not hold {}x{} elements".format(path, rows, columns))
+    counters['matrix files loaded'] += 1
+    return MappedMatrix(mapping, code, rows, columns)
+
+
+def save(path, value):
+    """Writes matrix <value> to file <path>. Returns the number of elements written."""
+    check_machine()
+    matrix = ArrayMatrix.from_rows(value)
+    if matrix is None and hasattr(value, 'tolist'):
+        # sparse matrices of floats
+        matrix = ArrayMatrix.from_rows(value.tolist())
+    if matrix is None:
+        raise MatrixFileError("save needs a matrix of all ints or all floats")
+    data = matrix.flat()
+    if swapped:
+        data = data[:] if data is matrix.data else data
+        data.byteswap()
+    temporary = path + '.tmp'
+    try:
+        with open(temporary, 'wb') as out:
+            out.write(header.pack(magic, version, data.typecode, matrix.rows, matrix.columns))
+            data.tofile(out)
+        os.rename(temporary, path)
+    except (IOError, OSError) as e:
+        raise MatrixFileError("cannot write matrix file {}: {}".format(path, e.strerror))
+    return len(data)
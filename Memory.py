@@ -2,6 +2,15 @@
 
 import AST
 import Interpreter
+from itertools import count
+from Matrix import Matrix
+from Instrumentation import counters
+
+# version stamps, unique across memory stacks
+stamps = count(1)
+
+# popped memories a stack keeps, emptied, for the next pushes
+pool_size = 16
 
 
 class Memory:
@@ -28,6 +37,8 @@ class Memory:
             return self.variables.get(node.name)
         elif isinstance(node, Interpreter.ConcreteReference):
             value = self.get(node.container)
+            if isinstance(value, Matrix):
+                return value.get(node.coords)
             for coord in node.coords:
                 value = value[coord]
                 if value is None:
@@ -38,9 +49,15 @@ class Memory:
 
     def put(self, node, value):  # puts into memory current value of variable <name>
         if isinstance(node, AST.Variable):
+            old = self.variables.get(node.name)
+            if isinstance(old, Matrix) and old is not value:
+                old.release()
             self.variables[node.name] = value
         elif isinstance(node, Interpreter.ConcreteReference):
             container = self.variables[node.container.name]
+            if isinstance(container, Matrix):
+                container.put(node.coords, value)
+                return
             for coord in node.coords[:-1]:
                 container = container[coord]
             container[node.coords[-1]] = value
@@ -52,6 +69,8 @@ class MemoryStack:
 
     def __init__(self, memory=None):  # initialize memory stack with memory <memory>
         self.stack = [Memory()]
+        self.versions = dict()  # variable name -> stamp of the last change of what it refers to
+        self.pool = []
 
     def __str__(self):
         s = "STACK [\n"
@@ -77,8 +96,10 @@ class MemoryStack:
 
     def insert(self, node, value):  # inserts into memory stack variable <name> with value <value>
         self.stack[-1].put(node, value)
+        self.stamp(node)
 
     def set(self, node, value):  # sets variable <name> to value <value>
+        self.stamp(node)
         for elem in self.stack[::-1]:
             if elem.has_key(node):
                 elem.put(node, value)
@@ -86,11 +107,33 @@ class MemoryStack:
         else:
             self.insert(node, value)
 
-    def push(self, memory=None):  # pushes memory <memory> onto the stack
+    def push(self, memory=None):  # pushes memory <memory>, or an empty one, onto the stack
         if memory is None:
-            memory = Memory()
+            if self.pool:
+                memory = self.pool.pop()
+                counters['frames reused'] += 1
+            else:
+                memory = Memory()
+                counters['frames allocated'] += 1
         self.stack.append(memory)
 
     def pop(self):  # pops the top memory from the stack
-        return self.stack.pop()
+        memory = self.stack.pop()
+        variables = memory.variables
+        if variables:
+            for name, value in variables.iteritems():
+                if isinstance(value, Matrix):
+                    value.release()
+                # the name now refers to a variable of an outer memory, if any
+                self.versions[name] = next(stamps)
+            variables.clear()
+        if len(self.pool) < pool_size:
+            self.pool.append(memory)
+
+    def stamp(self, node):  # records a change of variable <name> or of its elements
+        name = node.name if isinstance(node, AST.Variable) else node.container.name
+        self.versions[name] = next(stamps)
+
+    def version(self, name):
+        return self.versions.get(name, 0)
 
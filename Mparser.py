@@ -29,12 +29,33 @@ def p_error(p):
         print("Syntax error at line {0}, column {1}: LexToken({2}, '{3}')"
               .format(p.lineno, scanner.find_column(p.lexer.lexdata, p),
                       p.type, p.value))
+        # with the budget spent the rest of the input is not parsed
+        budget = getattr(p.lexer, 'error_budget', None)
+        if budget is not None:
+            budget.spend()
     else:
         print("Unexpected end of input")
 
 
 # Starting point
 
+def p_program(p):
+    """program : instruction
+               | program instruction"""
+    # left recursive, so that top-level instructions are reduced in order, each handed to the
+    # lexer's consume as soon as it is parsed. The node gets the line of the last instruction,
+    # as from instructions
+    if len(p) == 2:
+        p[0] = AST.Instructions(p.lineno(1), [p[1]])
+    else:
+        p[0] = p[1]
+        p[0].nodes.append(p[2])
+        p[0].lineno = p.lineno(2)
+    consume = getattr(p.lexer, 'consume', None)
+    if consume is not None:
+        consume(p[0].nodes[-1])
+
+
 def p_instructions(p):
     """instructions : instruction
                     | instruction instructions"""
@@ -98,7 +119,8 @@ def p_statement(p):
     """statement : assignment
                  | flow_keyword
                  | return
-                 | print"""
+                 | print
+                 | function"""
     p[0] = p[1]
 
 
@@ -289,7 +311,9 @@ def p_function(p):
 def p_function_name(p):
     """function_name : EYE
                      | ZEROS
-                     | ONES"""
+                     | ONES
+                     | LOAD
+                     | SAVE"""
     p[0] = p[1]
 
 
@@ -0,0 +1,382 @@
+#!/usr/bin/env python2
+
+from collections import OrderedDict
+from itertools import count
+import AST
+from Analysis import walk, children, read_names, written_names, replace_child, file_access, Liveness
+from Matrix import ArrayMatrix, SparseMatrix
+from Interpreter import matmul, inferred_type
+from Instrumentation import counters
+
+# Optimization passes over the checked AST, run by main.py before interpretation.
+
+
+def matrix_product(node):
+    return isinstance(node, AST.ArithmeticOperation) and node.op == '*' and \
+        getattr(getattr(node, 'inferred', None), 'type', None) == 'matrix'
+
+
+def static_size(node):
+    # (rows, columns) of a matrix expression known before running, None when unknown
+    shape = getattr(node, 'shape', None)
+    if shape is not None and len(shape) == 2:
+        return shape
+    size = getattr(getattr(node, 'inferred', None), 'size', None)
+    if size and len(size) == 2 and all(isinstance(s, (int, long)) and s > 0 for s in size):
+        return tuple(size)
+    return None
+
+
+def chain_order(dims):
+    """Classic dynamic programming over a product of matrices, the i-th of size
+    dims[i] x dims[i + 1]. Returns (cost, split) where cost counts scalar multiplications and
+    split[i][j] is where the product of matrices i..j is best divided."""
+    n = len(dims) - 1
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    for length in range(1, n):
+        for i in range(n - length):
+            j = i + length
+            cost[i][j], split[i][j] = min(
+                (cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1], k) for k in range(i, j))
+    return cost[0][n - 1], split
+
+
+def left_to_right_cost(dims):
+    return sum(dims[0] * dims[k] * dims[k + 1] for k in range(1, len(dims) - 1))
+
+
+class MatrixChain(object):
+    """Product of matrices A1 * A2 * ... * An, which '*' being left associative would evaluate
+    as ((A1 * A2) * ...) * An, multiplied in the order needing the fewest scalar multiplications.
+    The order is computed from the sizes the TypeChecker and ShapeInference found, or from the
+    operands once evaluated when those are unknown. Only exact (integer) products are reordered,
+    as reassociating floating point products changes their rounding: other operands are
+    multiplied as written."""
+
+    def __init__(self, operands, node):
+        self.operands = operands
+        self.node = node  # the root of the products
+        self.orders = {}  # dims -> split table, scalar multiplications saved
+        sizes = [static_size(operand) for operand in operands]
+        if None not in sizes and self.chained(sizes):
+            self.order([size[0] for size in sizes] + [sizes[-1][1]])
+
+    @staticmethod
+    def chained(sizes):
+        return all(left[1] == right[0] for left, right in zip(sizes, sizes[1:]))
+
+    def order(self, dims):
+        dims = tuple(dims)
+        try:
+            return self.orders[dims]
+        except KeyError:
+            cost, split = chain_order(dims)
+            order = self.orders[dims] = split, left_to_right_cost(dims) - cost
+            return order
+
+    def evaluate(self, interpreter):
+        values = [operand.accept(interpreter) for operand in self.operands]
+        matrices = [ArrayMatrix.from_rows(value) for value in values]
+        if any(matrix is None or matrix.data.typecode != 'l' for matrix in matrices):
+            return self.left_to_right(interpreter, self.node, iter(values))
+        sizes = [(m.rows, m.columns) for m in matrices]
+        if 0 in sum(sizes, ()) or not self.chained(sizes):
+            # products of mismatched operands are left to the usual evaluation
+            return self.left_to_right(interpreter, self.node, iter(values))
+        split, saved = self.order([size[0] for size in sizes] + [sizes[-1][1]])
+        counters['chains reordered'] += 1
+        counters['multiplications saved'] += saved
+
+        def product(i, j):
+            if i == j:
+                return matrices[i]
+            k = split[i][j]
+            return matmul(product(i, k), product(k + 1, j))
+
+        return product(0, len(matrices) - 1)
+
+    def left_to_right(self, interpreter, node, values):
+        # the product as written, from <values>, those of the operands under <node> in order,
+        # each evaluated once
+        if not matrix_product(node):
+            return next(values)
+        left = self.left_to_right(interpreter, node.left, values)
+        return interpreter.apply(node, left, self.left_to_right(interpreter, node.right, values))
+
+
+def chain_operands(node):
+    if matrix_product(node):
+        return chain_operands(node.left) + chain_operands(node.right)
+    return [node]
+
+
+def order_chains(node):
+    # attaches node.template to the roots of products of three or more matrices
+    inner = set()
+    for n in walk(node):
+        if not matrix_product(n) or n in inner:
+            continue
+        operands = chain_operands(n)
+        if len(operands) > 2:
+            n.template = MatrixChain(operands, n)
+            inner.update(m for m in walk(n) if matrix_product(m))
+
+
+class MemoCache(object):
+    """Results of memoized operations by (node, versions of the variables it reads), the least
+    recently used dropped beyond size entries."""
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        # raises KeyError when missing
+        value = self.entries.pop(key)
+        self.entries[key] = value
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+            counters['memo evictions'] += 1
+
+
+memo_cache = MemoCache(64)
+
+
+def snapshot(value):
+    # a copy of <value> that writes to the original or to later copies do not reach
+    if isinstance(value, (ArrayMatrix, SparseMatrix)):
+        return value.copy()
+    if isinstance(value, list):
+        return [snapshot(v) for v in value]
+    # numbers, strings and constant matrices never change
+    return value
+
+
+class Memo(object):
+    """Operation in a loop whose result is reused for as long as none of the variables it
+    reads changes, as told by the version stamps of the MemoryStack. The node's own template,
+    if any, computes the result on a miss. A memo failing to hit in its first max_misses
+    evaluations stops looking up results."""
+
+    max_misses = 8
+
+    def __init__(self, node, names, template=None):
+        self.node = node
+        self.names = sorted(names)
+        self.template = template
+        self.hits = 0
+        self.misses = 0
+
+    def compute(self, interpreter):
+        result = self.template.evaluate(interpreter) if self.template is not None else None
+        return result if result is not None else interpreter.compute(self.node)
+
+    def evaluate(self, interpreter):
+        if self.misses >= self.max_misses and not self.hits:
+            return self.compute(interpreter)
+        versions = interpreter.memories.versions
+        key = self.node, tuple(versions.get(name, 0) for name in self.names)
+        try:
+            result = memo_cache.get(key)
+            self.hits += 1
+            counters['memo hits'] += 1
+            # the consumer may keep and update the result
+            return snapshot(result)
+        except KeyError:
+            pass
+        self.misses += 1
+        counters['memo misses'] += 1
+        result = self.compute(interpreter)
+        memo_cache.put(key, snapshot(result))
+        return result
+
+
+def memoizable(node):
+    return isinstance(node, (AST.ArithmeticOperation, AST.UnaryExpr, AST.FunctionCall)) and \
+        inferred_type(node) == 'matrix' and not file_access(node)
+
+
+def memoize_loops(node):
+    # attaches a Memo as node.template to operations on matrices in loop bodies, except those
+    # reading the same variables as the memoized operation around them
+    in_place = set(n.right for n in walk(node) if hasattr(n, 'in_place'))
+
+    def mark(n, names_above):
+        names = None
+        if memoizable(n) and n not in in_place:
+            names = read_names(n)
+            template = getattr(n, 'template', None)
+            if names != names_above and not isinstance(template, Memo):
+                n.template = Memo(n, names, template)
+        for child in children(n):
+            mark(child, names)
+
+    for n in walk(node):
+        if isinstance(n, (AST.While, AST.For)):
+            mark(n.body, None)
+
+
+def expression_key(node):
+    # equal for structurally identical pure expressions, None for anything else
+    if isinstance(node, AST.Variable):
+        return 'Variable', node.name
+    if isinstance(node, (AST.IntNum, AST.FloatNum, AST.String)):
+        return node.__class__.__name__, type(node.value), node.value
+    if isinstance(node, AST.ArithmeticOperation):
+        parts = node.op, expression_key(node.left), expression_key(node.right)
+    elif isinstance(node, AST.UnaryExpr):
+        parts = node.operation, expression_key(node.operand)
+    elif isinstance(node, AST.FunctionCall):
+        if node.name in ('load', 'save'):
+            return None
+        parts = (node.name,) + tuple(expression_key(a) for a in node.arguments)
+    elif isinstance(node, AST.Reference):
+        parts = (node.container.name,) + tuple(expression_key(c) for c in node.coords)
+    elif isinstance(node, (AST.Vector, AST.Matrix)):
+        parts = tuple(expression_key(e) for e in node.elements)
+    else:
+        return None
+    if None in parts:
+        return None
+    return (node.__class__.__name__,) + parts
+
+
+def evaluated_expressions(statement):
+    # the expressions a simple statement evaluates, compound statements are not looked into
+    if isinstance(statement, AST.Assignment):
+        coords = statement.left.coords if isinstance(statement.left, AST.Reference) else []
+        return [(statement.left, c) for c in coords] + [(statement, statement.right)]
+    if isinstance(statement, AST.Print):
+        return [(statement, a) for a in statement.arguments]
+    return []
+
+
+def eliminate_common_subexpressions(node):
+    """Computes operations on matrices repeated in a sequence of statements once, into a
+    temporary variable assigned before the first statement using them, as long as no statement
+    in between writes a variable they read. Repetitions inside compound statements are left
+    alone. Temporaries are named tmp#<n>, which no identifier can be, numbered from 1 in every
+    program, so a program gets the same names on every run. Returns the number of nodes no
+    longer evaluated."""
+    eliminated = 0
+    temporaries = count(1)
+    for n in list(walk(node)):
+        if isinstance(n, AST.Instructions):
+            eliminated += eliminate_in_sequence(n, temporaries)
+    return eliminated
+
+
+def eliminate_in_sequence(instructions, temporaries):
+    groups = {}  # key -> [(statement index, parent, node)] of occurrences with no write between
+    closed = []
+    for index, statement in enumerate(instructions.nodes):
+        for parent, expression in evaluated_expressions(statement):
+            stack = [(parent, expression)]
+            while stack:
+                parent, n = stack.pop()
+                if memoizable(n):
+                    key = expression_key(n)
+                    if key is not None:
+                        groups.setdefault(key, []).append((index, parent, n))
+                stack += [(n, child) for child in children(n)]
+        written = written_names(statement)
+        for key, occurrences in groups.items():
+            if written & read_names(occurrences[0][2]):
+                closed.append(occurrences)
+                del groups[key]
+    closed += groups.values()
+
+    # the largest expressions first, those repeated inside them are then gone
+    closed = [occurrences for occurrences in closed if len(occurrences) > 1]
+    closed.sort(key=lambda occurrences: -len(list(walk(occurrences[0][2]))))
+    removed = set()
+    temporary_assignments = []
+    eliminated = 0
+    for occurrences in closed:
+        occurrences = [o for o in occurrences if o[2] not in removed]
+        if len(occurrences) < 2:
+            continue
+        first = occurrences[0][2]
+        name = 'tmp#{}'.format(next(temporaries))
+        for index, parent, n in occurrences:
+            removed.update(walk(n))
+            replace_child(parent, n, temporary(n, name))
+        target = temporary(first, name)
+        first.assigned_to = target
+        temporary_assignments.append((occurrences[0][0], AST.Assignment(first.lineno, '=', target, first)))
+        size = len(list(walk(first)))
+        eliminated += size * (len(occurrences) - 1)
+        counters['subexpressions eliminated'] += len(occurrences) - 1
+    for index, assignment in sorted(temporary_assignments, key=lambda a: -a[0]):
+        instructions.nodes.insert(index, assignment)
+    counters['nodes eliminated'] += eliminated
+    return eliminated
+
+
+def temporary(expression, name):
+    # a read of temporary <name> holding the value of <expression>
+    variable = AST.Variable(expression.lineno, name)
+    for attribute in ('inferred', 'shape'):
+        if hasattr(expression, attribute):
+            setattr(variable, attribute, getattr(expression, attribute))
+    return variable
+
+
+def always_jumps(statement):
+    # whether <statement> never lets execution continue with the next one
+    if isinstance(statement, (AST.FlowKeyword, AST.Return)):
+        return True
+    if isinstance(statement, AST.Block):
+        return always_jumps(statement.content)
+    if isinstance(statement, AST.Instructions):
+        return any(always_jumps(n) for n in statement.nodes)
+    if isinstance(statement, AST.If):
+        return statement.else_body is not None and always_jumps(statement.body) and \
+            always_jumps(statement.else_body)
+    return False
+
+
+def dead_store(statement):
+    # assignment to a variable nothing reads afterwards, of an expression without file access
+    return isinstance(statement, AST.Assignment) and isinstance(statement.left, AST.Variable) and \
+        statement.left.name not in statement.live_out and not file_access(statement.right)
+
+
+def eliminate_dead_code(node):
+    """Removes statements following a break, continue or return in their sequence, and
+    assignments to variables that are dead afterwards, until liveness finds none left. Element
+    writes are kept, as are prints and assignments reading or writing files. Leaves
+    node.live_out as of the resulting program. Returns the number of nodes removed."""
+    eliminated = 0
+    while True:
+        Liveness().run(node)
+        removed = sweep(node)
+        if not removed:
+            counters['nodes eliminated'] += eliminated
+            return eliminated
+        eliminated += removed
+
+
+def sweep(node):
+    # removes the dead statements of the sequences in <node>, returns the number of nodes removed
+    removed = 0
+    if isinstance(node, AST.Instructions):
+        kept = []
+        for statement in node.nodes:
+            if kept and always_jumps(kept[-1]):
+                counters['unreachable statements removed'] += 1
+            elif dead_store(statement):
+                counters['dead stores removed'] += 1
+            else:
+                kept.append(statement)
+                continue
+            removed += len(list(walk(statement)))
+        node.nodes[:] = kept
+    for child in children(node):
+        removed += sweep(child)
+    return removed
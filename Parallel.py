@@ -0,0 +1,193 @@
+#!/usr/bin/env python2
+
+import sys
+import multiprocessing
+import multiprocessing.pool
+from array import array
+from StringIO import StringIO
+import AST
+from Matrix import ArrayMatrix, matmul_values, result_typecode, array_matmul, array_element_wise
+from Analysis import walk, independent_groups
+from SymbolTable import Variable
+from TypeChecker import TypeChecker
+from Instrumentation import counters
+
+# Matrix kernels split over a persistent pool of workers. Products are split into ranges of rows
+# of the left operand, element-wise operations into ranges of elements. The array kernels hold
+# the GIL, so the pool is made of processes; threads are only worth it for a kernel releasing it.
+# Operations below the thresholds (scalar operations done) stay in the calling process.
+# Type checking is split into groups of top-level statements sharing no written variable.
+
+matmul_threshold = 2000000
+element_wise_threshold = 4000000
+
+pool = None  # the workers operations are split over, None while serial
+jobs = 1
+program = None  # tree the workers got a copy of when forked
+workers = None  # the pool kept across runs, as (count, threads, pool)
+
+
+def configure(count, threads=False, tree=None):
+    # count workers from now on, 1 keeps every operation serial. The pool is made on the first
+    # run asking for it and kept for the next ones, which only pay for another count or kind
+    # of workers. Workers forked after parsing get the tree with them, statements are then
+    # sent as indices into tree.nodes
+    global pool, jobs, program, workers
+    if count <= 1:
+        pool, jobs = None, 1
+        return
+    if workers is None or workers[:2] != (count, threads):
+        shutdown()
+        workers = count, threads, multiprocessing.pool.ThreadPool(count) if threads else multiprocessing.Pool(count)
+        program = tree
+        counters['worker pools started'] += 1
+    elif threads:
+        # threads see the tree of every run
+        program = tree
+    pool, jobs = workers[2], count
+
+
+def shutdown():
+    global pool, jobs, program, workers
+    if workers is not None:
+        workers[2].terminate()
+        workers = None
+    pool = program = None
+    jobs = 1
+
+
+def ranges(size, parts):
+    step = -(-size // parts)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def rows_of(matrix, start, stop):
+    return ArrayMatrix(matrix.data, stop - start, matrix.columns, matrix.row_stride, matrix.column_stride,
+                       matrix.offset + start * matrix.row_stride).copy()
+
+
+# tasks return their part of the result as the bytes of an array, None when it does not fit
+
+def packed(code, values):
+    try:
+        return array(code, values).tostring()
+    except OverflowError:
+        return None
+
+
+def matmul_task(task):
+    left, right = task
+    return packed(*matmul_values(left, right))
+
+
+def element_wise_task(task):
+    op_fun, code, left, right = task
+    return packed(code, map(op_fun, left, right))
+
+
+def join(code, parts, rows, columns):
+    if None in parts:
+        return None
+    data = array(code)
+    for part in parts:
+        data.fromstring(part)
+    return ArrayMatrix(data, rows, columns)
+
+
+def matmul(left, right):
+    # like Matrix.array_matmul
+    if pool is None or left.columns != right.rows or left.columns == 0 \
+            or left.rows * left.columns * right.columns < matmul_threshold:
+        return array_matmul(left, right)
+    right = right.copy()
+    results = pool.map(matmul_task, [(rows_of(left, start, stop), right) for start, stop in ranges(left.rows, jobs)])
+    counters['parallel operations'] += 1
+    return join(result_typecode(left, right), results, left.rows, right.columns)
+
+
+def element_wise(op_fun, left, right):
+    # like Matrix.array_element_wise
+    rows, columns = left.rows, left.columns
+    size = rows * columns
+    if pool is None or size < element_wise_threshold or (rows, columns) != (right.rows, right.columns):
+        return array_element_wise(op_fun, left, right)
+    code = result_typecode(left, right)
+    left, right = left.flat(), right.flat()
+    results = pool.map(element_wise_task, [(op_fun, code, left[start:stop], right[start:stop])
+                                           for start, stop in ranges(size, jobs)])
+    counters['parallel operations'] += 1
+    return join(code, results, rows, columns)
+
+
+def check_task(task):
+    """Type checks top-level statements of independent groups, in order, with a table of their
+    own. Returns the diagnostics of every statement, whether there were any, and the inferred
+    types, as (type, size, name), in the order walk() visits the nodes of the statements."""
+    statements = [program.nodes[i] for i in task] if isinstance(task[0], int) else task
+    checker = TypeChecker()
+    diagnostics = []
+    stdout = sys.stdout
+    try:
+        for statement in statements:
+            sys.stdout = StringIO()
+            checker.visit(statement)
+            diagnostics.append(sys.stdout.getvalue())
+    finally:
+        sys.stdout = stdout
+    inferred = []
+    for statement in statements:
+        types = []
+        for n in walk(statement):
+            variable = getattr(n, 'inferred', None)
+            types.append(variable and (variable.type, variable.size, variable.name))
+        inferred.append(types)
+    return diagnostics, checker.encountered_error, inferred
+
+
+def batches(groups, sizes, parts):
+    # groups of statement indices dealt into <parts> batches of about the same number of nodes
+    loads = [[0, []] for _ in range(parts)]
+    for group in sorted(groups, key=lambda group: -sum(sizes[i] for i in group)):
+        load = min(loads)
+        load[0] += sum(sizes[i] for i in group)
+        load[1].extend(group)
+    return [sorted(indices) for _, indices in loads if indices]
+
+
+def sequential_check(ast, budget=None, cascades=True):
+    checker = TypeChecker(budget, cascades)
+    checker.visit(ast)
+    return checker.encountered_error
+
+
+def type_check(ast, budget=None, cascades=True):
+    """Type checks the program <ast> like TypeChecker().visit with the top-level statements
+    split over the pool, printing the diagnostics in the order a sequential check prints them
+    and setting node.inferred. Returns whether there were errors. A check with an error budget
+    or without cascades depends on the errors before every statement, so it stays sequential."""
+    split = pool is not None and budget is None and cascades and isinstance(ast, AST.Instructions)
+    groups = independent_groups(ast.nodes) if split else []
+    if len(groups) < 2:
+        return sequential_check(ast, budget, cascades)
+    statements = ast.nodes
+    sizes = [len(list(walk(statement))) for statement in statements]
+    parts = batches(groups, sizes, jobs)
+    try:
+        results = pool.map(check_task, [indices if program is ast else [statements[i] for i in indices]
+                                        for indices in parts])
+    except Exception:
+        # the sequential check fails the same way, after the diagnostics preceding the failure
+        return sequential_check(ast)
+    counters['statement groups checked in parallel'] += len(groups)
+    diagnostics = {}
+    encountered_error = False
+    for indices, (texts, error, inferred) in zip(parts, results):
+        encountered_error = encountered_error or error
+        for index, text, types in zip(indices, texts, inferred):
+            diagnostics[index] = text
+            for node, variable in zip(walk(statements[index]), types):
+                if variable is not None:
+                    node.inferred = Variable(*variable)
+    for index in range(len(statements)):
+        sys.stdout.write(diagnostics[index])
+    return encountered_error
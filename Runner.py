@@ -0,0 +1,88 @@
+#!/usr/bin/env python2
+
+import sys
+import time
+import select
+import argparse
+import traceback
+import multiprocessing
+from StringIO import StringIO
+import main
+
+# Runs many scripts concurrently, each in a process of its own forked from this one, so that
+# scripts start with the modules and the parser tables loaded and a slow script holds up only
+# its own slot. A script is killed when it runs past its wall-clock timeout; the step budget
+# (main.py --max-steps) stops runaway loops from inside the Interpreter. Results are yielded
+# as the scripts finish, in any order.
+
+
+def child(connection, argv):
+    # sends back (exit status, output) of main.py <argv>
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = output = StringIO()
+    try:
+        status = main.main(main.argparser.parse_args(argv))
+    except SystemExit as e:
+        status = e.code
+    except Exception:
+        traceback.print_exc()
+        status = 1
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+    connection.send((status or 0, output.getvalue()))
+    connection.close()
+
+
+def run_scripts(filenames, argv=(), workers=None, timeout=None):
+    """Runs main.py <argv> <filename> for every file of <filenames>, at most <workers> at a
+    time (by default one per core). Yields (filename, status, output, seconds) as the scripts
+    end, status being the exit status of main.py, or 'timeout' for a script killed after
+    <timeout> seconds, whose output is lost."""
+    workers = workers or multiprocessing.cpu_count()
+    pending = list(reversed(filenames))
+    running = {}  # connection -> (filename, process, start)
+    while pending or running:
+        while pending and len(running) < workers:
+            filename = pending.pop()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=child, args=(sender, list(argv) + [filename]))
+            # workers are forked with a copy of anything still buffered
+            sys.stdout.flush()
+            process.start()
+            sender.close()
+            running[receiver] = filename, process, time.time()
+        wait = None
+        if timeout is not None:
+            wait = max(0, min(start for _, _, start in running.values()) + timeout - time.time())
+        ready, _, _ = select.select(list(running), [], [], wait)
+        now = time.time()
+        for connection in ready:
+            filename, process, start = running.pop(connection)
+            try:
+                status, output = connection.recv()
+            except EOFError:
+                # died without a word, like the interpreter itself crashing
+                status, output = 'crashed', ''
+            connection.close()
+            process.join()
+            yield filename, status, output, now - start
+        if timeout is not None:
+            for connection, (filename, process, start) in running.items():
+                if now - start >= timeout:
+                    process.terminate()
+                    process.join()
+                    connection.close()
+                    del running[connection]
+                    yield filename, 'timeout', '', now - start
+
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser(usage="%(prog)s [options] FILE... [main.py options]")
+    argparser.add_argument('--workers', type=int, help="scripts run at once (default: one per core)")
+    argparser.add_argument('--timeout', type=float, metavar='SECONDS', help="wall-clock limit of a script")
+    argparser.add_argument('files', nargs='+')
+    args, argv = argparser.parse_known_args()
+    for filename, status, output, seconds in run_scripts(args.files, argv, args.workers, args.timeout):
+        print("== {} status {} in {:.2f} s".format(filename, status, seconds))
+        sys.stdout.write(output)
+        sys.stdout.flush()
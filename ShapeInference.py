@@ -0,0 +1,201 @@
+#!/usr/bin/env python2
+
+import AST
+from Analysis import assigned_names
+from SymbolTable import Variable
+from TypeChecker import TypeChecker
+
+# Static shape inference, run after type checking. Every expression node gets node.shape:
+# () for numbers, (n,) for vectors, (rows, columns) for matrices (nested lists in general, so
+# [[1, 2]] is (1, 2)) or None when the shape depends on values known only at run time.
+# Integer values are propagated alongside, so sizes passed to ones/zeros/eye through variables
+# or arithmetic resolve too. Variables rebound in a loop are unknown inside and after it.
+
+int_op_to_fun = {
+    '+': lambda x, y: x + y,
+    '-': lambda x, y: x - y,
+    '*': lambda x, y: x * y,
+    '/': lambda x, y: x // y if y else None
+}
+
+unknown = (None, None)
+
+
+def binary_shape(op, left, right):
+    if left is None or right is None:
+        return None
+    if left == () and right == ():
+        return ()
+    if op[0] == '.':
+        # element-wise operations stop at the shorter operand, like zip
+        if len(left) != len(right):
+            return None
+        return tuple(min(l, r) for l, r in zip(left, right))
+    if len(left) == 2 and len(right) == 2 and op in ('*', '+'):
+        # matrix product, '+' concatenates rows
+        size = TypeChecker.result_size(op, Variable('matrix', list(left)), Variable('matrix', list(right)))
+        return tuple(size)
+    if op == '+' and left[1:] == right[1:] and len(left) > 0:
+        return (left[0] + right[0],) + left[1:]
+    return None
+
+
+class ShapeInference(object):
+
+    def __init__(self):
+        self.env = {}  # variable name -> (shape, integer value or None)
+
+    def visit(self, node):
+        # expressions return their (shape, value), which is stored on the node
+        result = getattr(self, 'visit_' + node.__class__.__name__)(node)
+        if result is not None:
+            node.shape = result[0]
+        return result
+
+    def kill(self, names):
+        for name in names:
+            self.env[name] = unknown
+
+    def visit_Instructions(self, node):
+        for n in node.nodes:
+            self.visit(n)
+
+    def visit_Block(self, node):
+        env = self.env
+        self.env = dict(env)
+        self.visit(node.content)
+        self.env = env
+
+    def visit_FlowKeyword(self, node):
+        pass
+
+    def visit_Print(self, node):
+        for a in node.arguments:
+            self.visit(a)
+
+    def visit_Return(self, node):
+        if node.value is not None:
+            self.visit(node.value)
+
+    def visit_String(self, node):
+        return unknown
+
+    def visit_Vector(self, node):
+        shapes = [self.visit(e)[0] for e in node.elements]
+        if not shapes:
+            return (0,), None
+        if any(s is None or s != shapes[0] for s in shapes):
+            return unknown
+        return (len(shapes),) + shapes[0], None
+
+    def visit_Matrix(self, node):
+        return self.visit_Vector(node)
+
+    def visit_Reference(self, node):
+        shape = self.visit(node.container)[0]
+        for c in node.coords:
+            self.visit(c)
+        if shape is None or len(node.coords) > len(shape):
+            return unknown
+        return shape[len(node.coords):], None
+
+    def visit_FunctionCall(self, node):
+        if not isinstance(node.arguments, list):
+            return unknown
+        sizes = [self.visit(arg)[1] for arg in node.arguments]
+        if node.name == 'save':
+            # the number of elements written
+            return (), None
+        if len(sizes) == 1:
+            sizes = sizes * 2
+        if len(sizes) != 2 or None in sizes or min(sizes) <= 0:
+            return unknown
+        return tuple(sizes), None
+
+    def visit_While(self, node):
+        names = assigned_names(node.body)
+        self.kill(names)
+        self.visit(node.condition)
+        self.visit(node.body)
+        # the body may have run any number of times, none included
+        self.kill(names)
+
+    def visit_For(self, node):
+        self.visit(node.range)
+        env = self.env
+        self.env = dict(env)
+        self.kill(assigned_names(node.body))
+        self.env[node.iterator.name] = ((), None)
+        self.visit(node.body)
+        self.env = env
+
+    def visit_Range(self, node):
+        self.visit(node.start)
+        self.visit(node.end)
+
+    def visit_Variable(self, node):
+        return self.env.get(node.name, unknown)
+
+    def visit_If(self, node):
+        self.visit(node.condition)
+        env = self.env
+        self.env = dict(env)
+        self.visit(node.body)
+        then_env = self.env
+        self.env = dict(env)
+        if node.else_body is not None:
+            self.visit(node.else_body)
+        # after the statement a variable is known only if both branches agree on it
+        for name in set(then_env) | set(self.env):
+            if then_env.get(name, unknown) != self.env.get(name, unknown):
+                self.env[name] = unknown
+
+    def visit_BinExpr(self, node):
+        left, left_value = self.visit(node.left)
+        right, right_value = self.visit(node.right)
+        value = None
+        if left_value is not None and right_value is not None and node.op in int_op_to_fun:
+            value = int_op_to_fun[node.op](left_value, right_value)
+        return binary_shape(node.op, left, right), value
+
+    def visit_ArithmeticOperation(self, node):
+        return self.visit_BinExpr(node)
+
+    def visit_Assignment(self, node):
+        right = self.visit(node.right)
+        if isinstance(node.left, AST.Variable):
+            name = node.left.name
+            if node.op == '=':
+                self.env[name] = right
+                # lets the Interpreter recognize its previous result held by the target
+                node.right.assigned_to = node.left
+            else:
+                left, left_value = self.env.get(name, unknown)
+                value = None
+                if left_value is not None and right[1] is not None:
+                    value = int_op_to_fun[node.op[0]](left_value, right[1])
+                self.env[name] = binary_shape(node.op[0], left, right[0]), value
+        else:
+            self.visit(node.left)
+
+    def visit_IntNum(self, node):
+        return (), node.value
+
+    def visit_FloatNum(self, node):
+        return (), None
+
+    def visit_UnaryExpr(self, node):
+        shape, value = self.visit(node.operand)
+        if node.operation == 'NEGATE':
+            return shape, -value if value is not None else None
+        if shape is None or len(shape) != 2:
+            return unknown
+        return shape[::-1], None
+
+    def visit_Comparison(self, node):
+        self.visit(node.left)
+        self.visit(node.right)
+        return (), None
+
+    def visit_Error(self, node):
+        return unknown
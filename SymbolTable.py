@@ -18,26 +18,33 @@ class Variable(object):
 
 
 class SymbolTable(object):
-
-    def __init__(self, parent = None): # parent scope and symbol table name
-        self.parent = parent
-        self.symbols = dict()
-        pass
-
-    def put(self, name, symbol): # put variable symbol or fundef under <name> entry
-        self.symbols[name] = symbol
+    """Symbols of all open scopes in one table. Every name maps to a stack of (scope, symbol),
+    the symbol visible being the last one, and every scope lists the names it declares, which
+    are popped when the scope is left."""
+
+    def __init__(self):
+        self.symbols = dict()  # name -> [(scope, symbol)], innermost scope last
+        self.scopes = [[]]  # names declared in each open scope, innermost last
+
+    def put(self, name, symbol): # put variable symbol or fundef under <name> entry of the current scope
+        scope = len(self.scopes) - 1
+        entries = self.symbols.setdefault(name, [])
+        if entries and entries[-1][0] == scope:
+            entries[-1] = (scope, symbol)
+        else:
+            entries.append((scope, symbol))
+            self.scopes[-1].append(name)
 
     def get(self, name): # return symbol of given name or None is the symbol is not known
-        local = self.symbols.get(name)
-        if local is None and self.hasParent():
-            return self.parent.get(name)
-        return local
-
-    def getParentScope(self):
-        return self.parent
-
-    def hasParent(self):
-        return self.parent is not None
-
-    def createChild(self):
-        return SymbolTable(self)
\ No newline at end of file
+        entries = self.symbols.get(name)
+        return entries[-1][1] if entries else None
+
+    def pushScope(self):
+        self.scopes.append([])
+
+    def popScope(self):
+        for name in self.scopes.pop():
+            entries = self.symbols[name]
+            entries.pop()
+            if not entries:
+                del self.symbols[name]
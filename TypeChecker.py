@@ -49,6 +49,13 @@ allowed_operations["NEGATE"]["matrix"]["matrix"] = "matrix"
 allowed_operations["TRANSPOSE"]["matrix"]["matrix"] = "matrix"
 allowed_operations
 
+# argument types of the builtins reading and writing matrix files: load(file) gives a matrix,
+# save(file, matrix) the number of elements written
+file_functions = {
+    'load': ('string',),
+    'save': ('string', 'matrix')
+}
+
 operation_to_string = {
     '=': 'ASSIGN',
     '+': 'ADD',
@@ -78,12 +85,27 @@ class NodeVisitor(object):
     def visit(self, node, *args, **kwargs):
         method = 'visit_' + node.__class__.__name__
         visitor = getattr(self, method)
-        return visitor(node, *args, **kwargs)
+        result = visitor(node, *args, **kwargs)
+        if isinstance(result, Variable):
+            # kept on the node for the Interpreter, which specializes operators by operand types
+            node.inferred = result
+        return result
 
 
 class TypeChecker(NodeVisitor):
+    """Prints a diagnostic for every type error and carries on. With a <budget> (an
+    Exceptions.ErrorBudget) the check stops by raising ErrorBudgetExceeded once it is spent.
+    Without <cascades>, errors following from an undefined value are not reported again:
+    an undefined variable is reported where it is first read, one left undefined by a failed
+    assignment and operations on undefined values are not reported at all."""
     encountered_error = False
 
+    def __init__(self, budget=None, cascades=True):
+        self.budget = budget
+        self.cascades = cascades
+        self.undefined = set()  # names of the undefined variables reported
+        self.symbols = SymbolTable()
+
     def ensure_defined(self, node, variable):
         if variable.type == "undefined":
             self.print_error(node, "undefined variable")
@@ -95,9 +117,9 @@ class TypeChecker(NodeVisitor):
             self.visit(n)
 
     def visit_Block(self, node):
-        self.symbols = self.symbols.createChild()
+        self.symbols.pushScope()
         self.visit(node.content)
-        self.symbols = self.symbols.getParentScope()
+        self.symbols.popScope()
 
     def visit_FlowKeyword(self, node):
         if self.loop == 0:
@@ -144,7 +166,9 @@ class TypeChecker(NodeVisitor):
 
         for c in node.coords:
             c_var = self.visit(c)
-            if c_var.type != 'int':
+            if c_var.isUndefined() and not self.cascades:
+                error = True
+            elif c_var.type != 'int':
                 self.print_error(node, "expected int as array coordinate, have {}".format(c_var.type))
                 error = True
         if error:
@@ -162,10 +186,14 @@ class TypeChecker(NodeVisitor):
             return Variable("vector", [container.size[-1]])
 
     def visit_FunctionCall(self, node):
+        if node.name in file_functions:
+            return self.visit_file_function(node)
         arguments = node.arguments
 
         for arg in arguments:
             arg_var = self.visit(arg)
+            if arg_var.isUndefined() and not self.cascades:
+                return Undefined()
             if arg_var.type != 'int':
                 self.print_error(node, "expected int as array coordinate, have {}".format(arg_var.type))
                 return Undefined()
@@ -181,6 +209,24 @@ class TypeChecker(NodeVisitor):
                 bounds[i] = float('+inf')
         return Variable("matrix", bounds)
 
+    def visit_file_function(self, node):
+        expected = file_functions[node.name]
+        arguments = [self.visit(arg) for arg in node.arguments]
+        if not self.cascades and any(arg.isUndefined() for arg in arguments):
+            return Undefined()
+        if len(arguments) != len(expected):
+            self.print_error(node, "wrong number of arguments to {}: expected {}, have {}".format(
+                node.name, len(expected), len(arguments)))
+            return Undefined()
+        for arg, type in zip(arguments, expected):
+            if arg.type != type:
+                self.print_error(node, "expected {} as argument of {}, have {}".format(type, node.name, arg.type))
+                return Undefined()
+        if node.name == 'load':
+            # the size is that of the file read at run time
+            return Variable("matrix", [float('+inf'), float('+inf')])
+        return Variable("int")
+
     def visit_While(self, node):
         self.loop += 1
         self.visit(node.body)
@@ -189,11 +235,11 @@ class TypeChecker(NodeVisitor):
     def visit_For(self, node):
         self.visit(node.range)
         self.loop += 1
-        self.symbols = self.symbols.createChild()
+        self.symbols.pushScope()
         iterator_var = Variable('int', [], node.iterator.name)
         self.symbols.put(iterator_var.name, iterator_var)
         self.visit(node.body)
-        self.symbols.getParentScope()
+        self.symbols.popScope()
         self.loop -= 1
 
     def visit_Range(self, node):
@@ -203,8 +249,13 @@ class TypeChecker(NodeVisitor):
     def visit_Variable(self, node, allow_undefined=False):
         result = self.symbols.get(node.name)
         if result is None:
-            if not allow_undefined:
+            if allow_undefined:
+                pass
+            elif self.cascades or node.name not in self.undefined:
+                self.undefined.add(node.name)
                 self.print_error(node, "undefined variable {}".format(node.name))
+            else:
+                self.encountered_error = True
             result = Undefined(node.name)
         return result
 
@@ -218,6 +269,8 @@ class TypeChecker(NodeVisitor):
         var_left = self.visit(node.left)
         var_right = self.visit(node.right)
         op = node.op
+        if (var_left.isUndefined() or var_right.isUndefined()) and not self.cascades:
+            return Undefined()
         if var_left.type == "matrix" and var_right.type == "matrix" and op == "*":
             if var_left.size[0] != var_right.size[1] and var_left.size[1] != var_right.size[0]:
                 self.print_error(node, "matrix dimensions not proper for multiplication: {} and {}".format(var_left.size, var_right.size))
@@ -249,6 +302,9 @@ class TypeChecker(NodeVisitor):
         if not overwrite and var_left.isUndefined():
             return None
         if var_right.isUndefined():
+            if overwrite and not is_slice:
+                # left undefined by an error reported already
+                self.undefined.add(var_left.name)
             return None
 
         if is_slice:
@@ -281,6 +337,8 @@ class TypeChecker(NodeVisitor):
 
     def visit_UnaryExpr(self, node):
         operand = self.visit(node.operand)
+        if operand.isUndefined() and not self.cascades:
+            return Undefined()
         if operand.isUndefined():
             self.print_error(node, "undefined variable {}".format(operand.name))
 
@@ -313,3 +371,5 @@ class TypeChecker(NodeVisitor):
     def print_error(self, node, error):
         self.encountered_error = True
         print("Error in line {}: {}".format(node.lineno, error))
+        if self.budget is not None:
+            self.budget.spend()
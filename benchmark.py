@@ -0,0 +1,1078 @@
+#!/usr/bin/env python2
+
+# Throughput benchmarks for the alternative engines, run on the example programs.
+# Every benchmark first checks that the engines it compares agree on the examples.
+
+import os
+import sys
+import json
+import socket
+import glob
+import subprocess
+import multiprocessing
+import random
+import time
+from contextlib import contextmanager
+from StringIO import StringIO
+
+import scanner
+import AST
+import Mparser
+import DescentParser
+from SymbolTable import SymbolTable
+from TypeChecker import TypeChecker
+from ShapeInference import ShapeInference
+from Analysis import Liveness, mark_in_place, mark_borrowed, mark_frameless, walk
+from Fusion import ElementWiseTemplate, mark_fused
+from Optimizer import order_chains, memoize_loops, eliminate_common_subexpressions, eliminate_dead_code
+from Interpreter import Interpreter, BufferedOp, matmul, matrix_element_wise, transpose, builtin_op_to_fun
+from Memory import MemoryStack
+from Matrix import Matrix, ArrayMatrix, SparseMatrix
+from Instrumentation import counters
+from Exceptions import ErrorBudget, ErrorBudgetExceeded, StepBudgetExceeded
+from TreePrinter import TreePrinter
+import Parallel
+import Daemon
+import Runner
+import Checkpoint
+import MatrixFile
+import ASTFile
+import Memory
+from Engine import Execution, time_slice
+
+EXAMPLES = sorted(glob.glob("examples/*/*.m"))
+
+
+def read_examples():
+    return [open(f).read() for f in EXAMPLES]
+
+
+def best_time(fun, repeat=3):
+    best = float('+inf')
+    for _ in range(repeat):
+        start = time.time()
+        fun()
+        best = min(best, time.time() - start)
+    return best
+
+
+@contextmanager
+def quiet():
+    # diagnostics printed by the engines are not part of the measurement
+    stdout, sys.stdout = sys.stdout, StringIO()
+    try:
+        yield
+    finally:
+        sys.stdout = stdout
+
+
+def token_stream(lexer, text):
+    lexer.lineno = 1
+    lexer.input(text)
+    result = []
+    token = lexer.token()
+    while token is not None:
+        result.append((token.type, token.value, token.lineno, token.lexpos))
+        token = lexer.token()
+    return result
+
+
+def fuzz_corpus(count, seed=0):
+    pieces = list("abxyz_019 \t\n.+-*/=<>!()[]{}:',;#\"eE@") + \
+        list(scanner.reserved) + ['1.5e3', '.5', '3.', '2E-4', '"text"', '.+', './', '+=', '==', '!=']
+    rnd = random.Random(seed)
+    return [''.join(rnd.choice(pieces) for _ in range(rnd.randint(0, 200))) for _ in range(count)]
+
+
+def bench_lexer():
+    fast = scanner.FastLexer()
+    corpus = read_examples() + fuzz_corpus(2000)
+    with quiet():
+        for text in corpus:
+            if token_stream(scanner.lexer, text) != token_stream(fast, text):
+                raise AssertionError("lexers disagree on {!r}".format(text))
+
+    text = '\n'.join(read_examples()) * 200
+    count = len(token_stream(fast, text))
+    print("lexer: {} inputs identical, {} tokens per run".format(len(corpus), count))
+    for name, lexer in (('ply', scanner.lexer), ('fast', fast)):
+        seconds = best_time(lambda: token_stream(lexer, text))
+        print("  {:6} {:10.0f} tokens/s".format(name, count / seconds))
+
+
+def random_program(rnd, size):
+    # random syntactically valid program, spread over lines to exercise line tracking
+
+    def sep():
+        return rnd.choice(['', ' ', '\n', ' \n  '])
+
+    def var(depth):
+        name = rnd.choice(['a', 'b', 'x', 'M'])
+        while depth > 0 and rnd.random() < 0.2:
+            name += '[' + ', '.join(numeric(depth - 1) for _ in range(rnd.randint(1, 2))) + ']'
+        return name
+
+    def numeric(depth):
+        choice = rnd.randint(0, 9 if depth > 0 else 2)
+        if choice == 0:
+            return str(rnd.randint(0, 20))
+        elif choice == 1:
+            return rnd.choice(['1.5', '.5', '2.', '3.e2', '1.5E-3'])
+        elif choice == 2:
+            return var(depth)
+        elif choice == 3:
+            return '"s{}"'.format(rnd.randint(0, 9))
+        elif choice == 4:
+            return '-' + sep() + numeric(depth - 1)
+        elif choice == 5:
+            return numeric(depth - 1) + sep() + "'"
+        elif choice == 6:
+            return '(' + sep() + numeric(depth - 1) + sep() + ')'
+        elif choice == 7:
+            op = rnd.choice(['+', '-', '*', '/', '.+', '.-', '.*', './'])
+            return numeric(depth - 1) + sep() + op + sep() + numeric(depth - 1)
+        elif choice == 8:
+            rows = [', '.join(numeric(depth - 1) for _ in range(rnd.randint(1, 3))) for _ in range(rnd.randint(1, 3))]
+            return '[' + (';' + sep()).join(rows) + ']' if rnd.random() < 0.9 else '[]'
+        return rnd.choice(['eye', 'ones', 'zeros']) + '(' + ', '.join(numeric(depth - 1) for _ in range(rnd.randint(1, 2))) + ')'
+
+    def expression(depth):
+        if rnd.random() < 0.3:
+            op = rnd.choice(['<', '>', '==', '!=', '<=', '>='])
+            comparison = numeric(depth) + sep() + op + sep() + numeric(depth)
+            return '(' * rnd.randint(0, 2) and '(' + comparison + ')' or comparison
+        return numeric(depth)
+
+    def instruction(depth):
+        choice = rnd.randint(0, 7 if depth > 0 else 3)
+        if choice == 0:
+            target = var(0)
+            if rnd.random() < 0.3:
+                target += '[' + ', '.join(numeric(1) for _ in range(rnd.randint(1, 2))) + ']'
+            op = rnd.choice(['=', '+=', '-=', '*=', '/='])
+            return target + sep() + op + sep() + expression(2) + ';'
+        elif choice == 1:
+            return 'print ' + ', '.join(expression(2) for _ in range(rnd.randint(1, 3))) + ';'
+        elif choice == 2:
+            return rnd.choice(['break;', 'continue;', 'return;', 'return ' + expression(2) + ';'])
+        elif choice == 3:
+            return 'x = 1;'
+        elif choice == 4:
+            return '{' + sep() + sep().join(instruction(depth - 1) for _ in range(rnd.randint(1, 3))) + sep() + '}'
+        elif choice == 5:
+            result = 'if (' + expression(2) + ')' + sep() + instruction(depth - 1)
+            if rnd.random() < 0.5:
+                result += sep() + 'else ' + instruction(depth - 1)
+            return result
+        elif choice == 6:
+            return 'while (' + expression(2) + ')' + sep() + instruction(depth - 1)
+        return 'for i = ' + numeric(1) + ':' + numeric(1) + ' ' + instruction(depth - 1)
+
+    return '\n'.join(instruction(3) for _ in range(size))
+
+
+def ast_signature(node):
+    if isinstance(node, list):
+        return [ast_signature(n) for n in node]
+    elif isinstance(node, AST.Node):
+        return (node.__class__.__name__,) + tuple(
+            (key, ast_signature(value)) for key, value in sorted(vars(node).items()))
+    return node
+
+
+def parse_with(parser, text):
+    lexer = scanner.FastLexer()
+    lexer.encountered_error = False
+    output = StringIO()
+    stdout, sys.stdout = sys.stdout, output
+    try:
+        ast = parser.parse(text, lexer=lexer, tracking=True)
+    except AttributeError:
+        # p_error fails on an unexpected end of input
+        lexer.encountered_error = True
+        ast = None
+    finally:
+        sys.stdout = stdout
+    return lexer.encountered_error, ast_signature(ast), output.getvalue()
+
+
+def bench_parser():
+    rnd = random.Random(0)
+    valid = read_examples() + [random_program(rnd, rnd.randint(1, 10)) for _ in range(1000)]
+    for text in valid + fuzz_corpus(1000):
+        lalr = parse_with(Mparser.parser, text)
+        descent = parse_with(DescentParser.parser, text)
+        if lalr[0] != descent[0] or (not lalr[0] and lalr != descent):
+            raise AssertionError("parsers disagree on {!r}".format(text))
+
+    text = '\n'.join(random_program(rnd, 20) for _ in range(300))
+    lexer = scanner.FastLexer()
+    lines = text.count('\n') + 1
+    print("parser: {} inputs agree, {} lines per run".format(len(valid) + 1000, lines))
+    for name, parser in (('lalr', Mparser.parser), ('descent', DescentParser.parser)):
+        seconds = best_time(lambda: parser.parse(text, lexer=lexer, tracking=True))
+        print("  {:8} {:10.0f} lines/s".format(name, lines / seconds))
+
+
+def prepare(text, optimize=True):
+    # parsed, checked and analyzed as by main.py
+    ast = DescentParser.parser.parse(text, lexer=scanner.FastLexer())
+    checker = TypeChecker()
+    checker.symbols = SymbolTable()
+    with quiet():
+        checker.visit(ast)
+    if checker.encountered_error:
+        raise AssertionError("benchmark program does not type check:\n" + text)
+    ShapeInference().visit(ast)
+    if optimize:
+        eliminate_common_subexpressions(ast)
+        eliminate_dead_code(ast)
+    Liveness().run(ast)
+    mark_in_place(ast)
+    mark_borrowed(ast)
+    if optimize:
+        mark_frameless(ast)
+        mark_fused(ast)
+        order_chains(ast)
+        memoize_loops(ast)
+    return ast
+
+
+def interpret(ast):
+    # runs with empty memory, returns the printed output
+    interpreter = Interpreter()
+    interpreter.memories = MemoryStack()
+    output = StringIO()
+    stdout, sys.stdout = sys.stdout, output
+    try:
+        ast.accept(interpreter)
+    finally:
+        sys.stdout = stdout
+    return output.getvalue()
+
+
+@contextmanager
+def eager_copies():
+    # assignment copies every row, as scripts had to do before values were copied on write
+    share = Matrix.share
+    Matrix.share = lambda self: Matrix(self.rows.copy() if isinstance(self.rows, ArrayMatrix) else
+                                       [list(row) for row in self.rows], True, True)
+    try:
+        yield
+    finally:
+        Matrix.share = share
+
+
+def bench_assignment():
+    programs = [
+        ('alias', "B = A; C = B;"),
+        ('write', "B = A; B[1, 1] = i;"),
+        ('swap', "T = A; A = B; B = T; A[0, 0] = i;"),
+    ]
+    iterations = 200
+    print("assignment: {} iterations of each loop body".format(iterations))
+    for size in (10, 50, 200):
+        for name, body in programs:
+            text = "A = ones({0}); B = zeros({0});\nfor i = 0:{1} {{ {2} }}\nprint A, B;".format(
+                size, iterations, body)
+            ast = prepare(text)
+            with eager_copies():
+                expected = interpret(ast)
+                eager = best_time(lambda: interpret(ast))
+            if interpret(ast) != expected:
+                raise AssertionError("copy on write changes the result of {!r}".format(text))
+            counters.clear()
+            cow = best_time(lambda: interpret(ast))
+            copies = (counters['rows copied'] + counters['arrays copied']) // 3
+            print("  {:4}x{:<4} {:6} eager {:8.2f} ms  copy on write {:8.2f} ms  copies {:6}".format(
+                size, size, name, eager * 1000, cow * 1000, copies))
+
+
+def nested_size(rows):
+    return sys.getsizeof(rows) + sum(sys.getsizeof(row) + sum(sys.getsizeof(x) for x in row) for row in rows)
+
+
+def bench_storage():
+    rnd = random.Random(0)
+    size = 150
+    rows = [[rnd.random() for _ in range(size)] for _ in range(size)]
+    other = [[rnd.random() for _ in range(size)] for _ in range(size)]
+    arrays = ArrayMatrix.from_rows(rows), ArrayMatrix.from_rows(other)
+    add = matrix_element_wise('.+')
+    if matmul(*arrays).tolist() != matmul(rows, other) or add(*arrays).tolist() != add(rows, other):
+        raise AssertionError("array kernels disagree with nested lists")
+
+    print("storage: {0}x{0} floats".format(size))
+    print("  memory  nested lists {:8} bytes  array {:8} bytes".format(
+        nested_size(rows), sys.getsizeof(arrays[0].data)))
+    for name, kernel in (('mul', matmul), ('.+', add)):
+        nested = best_time(lambda: kernel(rows, other))
+        array = best_time(lambda: kernel(*arrays))
+        print("  {:6}  nested lists {:8.2f} ms  array {:8.2f} ms".format(name, nested * 1000, array * 1000))
+    transposed = best_time(lambda: arrays[0].transpose())
+    print("  '      array view {:8.4f} ms".format(transposed * 1000))
+
+
+def expression_time(ast, name):
+    # time of the right side of the assignment to <name> in <ast> alone, the statements
+    # before it having run once
+    interpreter = Interpreter()
+    interpreter.memories = MemoryStack()
+    for index, statement in enumerate(ast.nodes):
+        if isinstance(statement, AST.Assignment) and statement.left.name == name:
+            break
+        statement.accept(interpreter)
+    expression = ast.nodes[index].right
+    return best_time(lambda: expression.accept(interpreter))
+
+
+def bench_fusion():
+    size = 200
+    rnd = random.Random(0)
+    literals = ''.join("{} = [{}];\n".format(name, "; ".join(", ".join(str(rnd.randint(1, 9)) for _ in range(size))
+                                                           for _ in range(size))) for name in 'ABCD')
+    setups = [
+        ('constants', "A = ones({0}); B = eye({0}); C = zeros({0}); C[1, 2] = 3; D = ones({0}) .+ ones({0});\n"
+         .format(size)),
+        ('arrays', "A = eye({0}) .+ ones({0}); B = A .+ A; C = eye({0}) .- ones({0}); D = B .- A;\n".format(size)),
+        ('lists', literals),
+    ]
+    operands = ['A', 'B', "C'", 'D', "A'", 'B']
+    operators = ['.+', '.*', '.-', '.+', '.*']
+    print("fusion: {0}x{0} operands".format(size))
+    for name, setup in setups:
+        for length in (2, 3, 4, 5, 8, 12):
+            chain = operands[0] + ''.join(' {} {}'.format(operators[i % len(operators)], operands[(i + 1) % len(operands)])
+                                          for i in range(length - 1))
+            # every operand printed, or dead code elimination drops the unused ones
+            text = setup + "R = {};\nprint R[1], A[1, 1], B[1, 1], C[1, 1], D[1, 1];".format(chain)
+            fused, eager = prepare(text), prepare(text, optimize=False)
+            if interpret(fused) != interpret(eager):
+                raise AssertionError("fusion changes the result of {!r}".format(chain))
+            operations = sum(n.template.operations for n in walk(fused)
+                             if isinstance(getattr(n, 'template', None), ElementWiseTemplate))
+            print("  {:9} {:2} operands, {:2} fused operations  eager {:8.2f} ms  fused {:8.2f} ms".format(
+                name, length, operations, expression_time(eager, 'R') * 1000, expression_time(fused, 'R') * 1000))
+
+def bench_chains():
+    chains = [
+        ('thin-wide', [(200, 2), (2, 200), (200, 2), (2, 200)]),
+        ('vector end', [(150, 150), (150, 150), (150, 150), (150, 1)]),
+        ('bottleneck', [(120, 120), (120, 1), (1, 120), (120, 120), (120, 3)]),
+        ('alternating', [(60, 5), (5, 60), (60, 5), (5, 60), (60, 5), (5, 60)]),
+    ]
+    print("chains: left to right against reordered products")
+    for name, sizes in chains:
+        # sizes through variables, unknown to the TypeChecker but found by ShapeInference
+        setup = ''.join("r{0} = {1}; c{0} = {2}; M{0} = ones(r{0}, c{0}); M{0}[0, 0] = {0};\n".format(i, rows, columns)
+                        for i, (rows, columns) in enumerate(sizes))
+        text = setup + "R = {};\nprint R[0];".format(' * '.join('M{}'.format(i) for i in range(len(sizes))))
+        ordered, eager = prepare(text), prepare(text, optimize=False)
+        counters.clear()
+        if interpret(ordered) != interpret(eager):
+            raise AssertionError("reordering changes the result of {!r}".format(text))
+        print("  {:12} {:8} multiplications saved  left to right {:8.2f} ms  reordered {:8.2f} ms".format(
+            name, counters['multiplications saved'], best_time(lambda: interpret(eager)) * 1000,
+            best_time(lambda: interpret(ordered)) * 1000))
+
+
+def bench_parallel():
+    rnd = random.Random(0)
+    size = 200
+    left = ArrayMatrix.from_rows([[rnd.random() for _ in range(size)] for _ in range(size)])
+    right = ArrayMatrix.from_rows([[rnd.random() for _ in range(size)] for _ in range(size)])
+    big = ArrayMatrix.from_rows([[rnd.random() for _ in range(1000)] for _ in range(1000)])
+    kernels = [
+        ('mul {0}x{0}'.format(size), lambda: matmul(left, right)),
+        ('.* 1000x1000', lambda: matrix_element_wise('.*')(big, big)),
+    ]
+    expected = [kernel() for name, kernel in kernels]
+    cores = multiprocessing.cpu_count()
+    print("parallel: 1 to {} jobs on {} cores, speedup over 1 job".format(max(cores, 4), cores))
+    thresholds = Parallel.matmul_threshold, Parallel.element_wise_threshold
+    Parallel.matmul_threshold = Parallel.element_wise_threshold = 0
+    try:
+        for name, kernel in kernels:
+            serial = None
+            curve = []
+            for jobs in range(1, max(cores, 4) + 1):
+                Parallel.configure(jobs)
+                if kernel() != expected[kernels.index((name, kernel))]:
+                    raise AssertionError("{} jobs change the result of {}".format(jobs, name))
+                seconds = best_time(kernel)
+                serial = serial or seconds
+                curve.append("{}: {:.2f}x".format(jobs, serial / seconds))
+            print("  {:14} {:8.2f} ms serial  {}".format(name, serial * 1000, '  '.join(curve)))
+        # what a run pays for the workers, main.py configuring them and going serial again
+        Parallel.shutdown()
+        first = best_time(lambda: (Parallel.configure(4), Parallel.configure(1)), 1)
+        later = best_time(lambda: (Parallel.configure(4), Parallel.configure(1)))
+        print("  4 workers      {:8.2f} ms first run  {:.2f} ms later runs".format(first * 1000, later * 1000))
+    finally:
+        Parallel.shutdown()
+        Parallel.matmul_threshold, Parallel.element_wise_threshold = thresholds
+
+
+def bench_sparse():
+    rnd = random.Random(0)
+    add = matrix_element_wise('.+')
+    print("sparse: eye(n) with n writes against the same dense matrix")
+    for size in (100, 300):
+        sparse = SparseMatrix.eye(size, size)
+        for _ in range(size):
+            sparse.set(rnd.randrange(size), rnd.randrange(size), rnd.randint(1, 9))
+        dense = sparse.dense()
+        other = ArrayMatrix.filled(size, 1, 2)
+        kernels = [
+            ('mul', lambda m: matmul(m, m)),
+            ('mul vector', lambda m: matmul(m, other)),
+            ('.+', lambda m: add(m, m)),
+            ("'", lambda m: transpose(m)),
+        ]
+        print("  {0}x{0}  memory  dense {1:9} bytes  sparse {2:9} bytes".format(
+            size, sys.getsizeof(dense.data), sys.getsizeof(sparse.cells)))
+        for name, kernel in kernels:
+            if ArrayMatrix.from_rows(kernel(sparse)) != kernel(dense):
+                raise AssertionError("sparse kernels disagree on {}".format(name))
+            print("    {:10}  dense {:9.2f} ms  sparse {:9.2f} ms".format(
+                name, best_time(lambda: kernel(dense), 1) * 1000, best_time(lambda: kernel(sparse)) * 1000))
+
+
+@contextmanager
+def eager_constants():
+    # ones, zeros and eye allocate their matrix right away, as they did before being lazy
+    constructors = dict(builtin_op_to_fun)
+
+    def materializing(constructor):
+        return lambda *args: constructor(*args).materialize()
+
+    for name in ('ones', 'zeros', 'eye'):
+        builtin_op_to_fun[name] = materializing(constructors[name])
+    try:
+        yield
+    finally:
+        builtin_op_to_fun.update(constructors)
+
+
+def allocated_cells():
+    # cells allocated by the constructors plus those copied when a shared matrix is written
+    return counters['constant cells materialized'] + counters['array cells copied']
+
+
+def bench_constants():
+    size = 200
+    setup = "n = {0}; M = ones(n); M[1, 2] = 3;\n".format(size)
+    programs = [
+        ('broadcast', "R = M .+ ones(n);"),
+        ('identity', "R = eye(n) * M;"),
+        ('zeros', "R = zeros(n) .* M;"),
+        ('fused', "R = (M .+ ones(n)) .* M .- zeros(n);"),
+        ('overwritten', "R = zeros(n); print R[0, 0]; R = M;"),
+        ('written', "R = ones(n); R[0, 0] = 2;"),
+        ('fusion setup', "A = ones(n); B = eye(n); C = zeros(n); C[1, 2] = 3; R = ones(n) .+ ones(n);"),
+    ]
+    print("constants: {0}x{0} ones, zeros and eye, cells allocated by constructors and writes".format(size))
+    for name, body in programs:
+        ast = prepare(setup + body + "\nprint R[1];")
+        with eager_constants():
+            counters.clear()
+            expected = interpret(ast)
+            eager_cells = allocated_cells()
+            eager = best_time(lambda: interpret(ast))
+        counters.clear()
+        if interpret(ast) != expected:
+            raise AssertionError("lazy constants change the result of {!r}".format(body))
+        lazy_cells = allocated_cells()
+        lazy = best_time(lambda: interpret(ast))
+        print("  {:12}  eager {:8.2f} ms {:7} cells  lazy {:8.2f} ms {:7} cells".format(
+            name, eager * 1000, eager_cells, lazy * 1000, lazy_cells))
+
+
+def bench_memo():
+    size = 60
+    setup = "n = {0}; A = ones(n); A[0, 1] = 2; B = ones(n); B[1, 1] = 3;\n".format(size)
+    programs = [
+        ('invariant', "C = A * B; print C[0, 0];"),
+        ('shadowed', "if (i == 10) A = A .+ ones(n); C = A * B .- B; print C[0, 1];"),
+        ('varying', "C = A .+ B; C[0, 0] = i; D = C * B; print D[0, 0];"),
+    ]
+    iterations = 30
+    print("memo: {0}x{0} matrices, {1} iterations".format(size, iterations))
+    for name, body in programs:
+        text = setup + "for i = 0:{} {{ {} }}".format(iterations, body)
+        memoized, eager = prepare(text), prepare(text, optimize=False)
+        counters.clear()
+        if interpret(memoized) != interpret(eager):
+            raise AssertionError("memoization changes the result of {!r}".format(body))
+        hits = counters['memo hits'], counters['memo misses']
+        print("  {:10}  hits {:3}  misses {:3}  recomputed {:8.2f} ms  memoized {:8.2f} ms".format(
+            name, hits[0], hits[1], best_time(lambda: interpret(eager)) * 1000,
+            best_time(lambda: interpret(memoized)) * 1000))
+
+
+def bench_cse():
+    size = 80
+    setup = "n = {0}; A = ones(n); A[0, 1] = 2; B = ones(n); B[1, 1] = 3;\n".format(size)
+    programs = [
+        ('product', "C = A * B; D = A * B .+ A; print C[0, 0], D[0, 0];"),
+        ('transpose', "C = A' .* A'; D = A' * B; print C[0, 0], D[0, 0];"),
+        ('written', "C = A * B; A[0, 0] = 5; D = A * B; print C[0, 0], D[0, 0];"),
+        ('nested', "C = (A * B)' .+ (A * B)'; D = (A * B)' .- B; print C[0, 0], D[0, 0];"),
+    ]
+    print("cse: {0}x{0} matrices".format(size))
+    for name, body in programs:
+        text = setup + body
+        counters.clear()
+        optimized, plain = prepare(text), prepare(text, optimize=False)
+        eliminated = counters['nodes eliminated']
+        if interpret(optimized) != interpret(plain):
+            raise AssertionError("eliminating common subexpressions changes the result of {!r}".format(body))
+        print("  {:10}  nodes eliminated {:3}  plain {:8.2f} ms  optimized {:8.2f} ms".format(
+            name, eliminated, best_time(lambda: interpret(plain)) * 1000,
+            best_time(lambda: interpret(optimized)) * 1000))
+
+
+def bench_dce():
+    size = 80
+    setup = "n = {0}; A = ones(n); A[0, 1] = 2; B = ones(n); B[1, 1] = 3;\n".format(size)
+    programs = [
+        ('dead store', "C = A * B; D = C .+ A; C = B; print C[0, 0];"),
+        ('overwritten', "C = A * B; C = A .+ B; print C[0, 0];"),
+        ('after break', "for i = 1:3 { print i; break; C = A * B; print C[0, 0]; }"),
+        ('live', "C = A * B; print C[0, 0];"),
+    ]
+    print("dce: {0}x{0} matrices".format(size))
+    for name, body in programs:
+        text = setup + body
+        counters.clear()
+        optimized, plain = prepare(text), prepare(text, optimize=False)
+        eliminated = counters['nodes eliminated']
+        if interpret(optimized) != interpret(plain):
+            raise AssertionError("eliminating dead code changes the result of {!r}".format(body))
+        print("  {:12}  nodes eliminated {:3}  plain {:8.2f} ms  optimized {:8.2f} ms".format(
+            name, eliminated, best_time(lambda: interpret(plain)) * 1000,
+            best_time(lambda: interpret(optimized)) * 1000))
+
+
+class ChainedSymbolTable(object):
+    # the symbol table as it was before scopes were indexed: a dictionary per scope, looked up
+    # through the links to the enclosing ones
+
+    def __init__(self):
+        self.scope = dict(), None  # symbols, enclosing scope
+
+    def put(self, name, symbol):
+        self.scope[0][name] = symbol
+
+    def get(self, name):
+        scope = self.scope
+        while scope is not None:
+            symbol = scope[0].get(name)
+            if symbol is not None:
+                return symbol
+            scope = scope[1]
+        return None
+
+    def pushScope(self):
+        self.scope = dict(), self.scope
+
+    def popScope(self):
+        self.scope = self.scope[1]
+
+
+def nested_blocks(depth, count):
+    # <count> nests of <depth> blocks, each reading variables of the outermost scope
+    lines = ["a = 1;", "b = 2;"]
+    for _ in range(count):
+        lines += ["{ x = a + b;"] * depth + ["print x;"] + ["}"] * depth
+    return '\n'.join(lines)
+
+
+def bench_symbols():
+    print("symbols: type checking nested blocks")
+    for depth, count in ((1, 5000), (10, 500), (100, 50), (500, 10)):
+        ast = DescentParser.parser.parse(nested_blocks(depth, count), lexer=scanner.FastLexer())
+        timings = []
+        for table in (ChainedSymbolTable, SymbolTable):
+            checker = TypeChecker()
+            checker.symbols = table()
+            with quiet():
+                timings.append(best_time(lambda: checker.visit(ast)))
+            if checker.encountered_error:
+                raise AssertionError("nested blocks do not type check with {}".format(table.__name__))
+        print("  depth {:4} x {:5} nests  chained scopes {:8.2f} ms  indexed scopes {:8.2f} ms".format(
+            depth, count, timings[0] * 1000, timings[1] * 1000))
+
+
+def independent_program(count):
+    # <count> groups of statements sharing no variable, one in ten with a type error
+    lines = []
+    for k in range(count):
+        lines.append("a{0} = ones(3); b{0} = a{0} * eye(3); c{0} = b{0}' .+ a{0};".format(k))
+        lines.append("print c{0}{1};".format(k, ' + "text"' if k % 10 == 0 else ''))
+    return '\n'.join(lines)
+
+
+def bench_check():
+    ast = DescentParser.parser.parse(independent_program(3000), lexer=scanner.FastLexer())
+    cores = multiprocessing.cpu_count()
+
+    def sequential():
+        checker = TypeChecker()
+        checker.symbols = SymbolTable()
+        checker.visit(ast)
+
+    output = StringIO()
+    stdout, sys.stdout = sys.stdout, output
+    try:
+        sequential()
+        expected = output.getvalue()
+        serial = best_time(sequential)
+        timings = []
+        for jobs in range(2, max(cores, 4) + 1):
+            Parallel.configure(jobs, tree=ast)
+            try:
+                output.truncate(0)
+                Parallel.type_check(ast)
+                if output.getvalue() != expected:
+                    raise AssertionError("{} jobs change the diagnostics".format(jobs))
+                timings.append((jobs, best_time(lambda: Parallel.type_check(ast))))
+            finally:
+                Parallel.shutdown()
+    finally:
+        sys.stdout = stdout
+    print("check: 12000 statements in 3000 independent groups on {} cores".format(cores))
+    print("  sequential {:8.2f} ms  {}".format(serial * 1000, '  '.join(
+        "{} jobs: {:.2f} ms".format(jobs, seconds * 1000) for jobs, seconds in timings)))
+
+
+def failing_program(count, syntax_error):
+    # an undefined variable early on, read by <count> statements, and one syntax error in ten
+    # lines when asked for
+    lines = ["a = undefined_value + 1;"]
+    for k in range(count):
+        lines.append("b{0} = a * {0}; c{0} = -b{0}; print c{0} .+ ones(3);".format(k))
+        if syntax_error and k % 10 == 0:
+            lines.append("d = ;")
+    return '\n'.join(lines)
+
+
+def verdict(text, max_errors=None, check=False, parser='descent'):
+    # parse and type check as main.py does with the --parser, --check and --max-errors options:
+    # whether the program passes
+    lexer = scanner.FastLexer()
+    streaming = check or max_errors is not None
+    budget = ErrorBudget(max_errors) if streaming else None
+    lexer.encountered_error = False
+    lexer.error_budget = budget
+    lexer.consume = None
+    checker = TypeChecker(budget, cascades=False)
+    checker.symbols = SymbolTable()
+
+    def consume(instruction):
+        if not lexer.encountered_error:
+            checker.visit(instruction)
+    options = {}
+    if streaming and parser == 'descent':
+        options['consume'] = consume
+    elif streaming:
+        lexer.consume = consume
+    with quiet():
+        try:
+            parse = DescentParser.parser.parse if parser == 'descent' else Mparser.parser.parse
+            ast = parse(text, lexer=lexer, tracking=True, **options)
+            if lexer.encountered_error or ast is None:
+                return False
+            if not check:
+                ast.printTree()
+            if streaming:
+                return not checker.encountered_error
+            return not Parallel.sequential_check(ast)
+        except ErrorBudgetExceeded:
+            return False
+
+
+def bench_verdict():
+    print("verdict: time to fail a program of 3000 statements")
+    for name, source in (('syntax errors', failing_program(3000, True)),
+                         ('type errors', failing_program(3000, False))):
+        for parser in ('lalr', 'descent'):
+            for mode, options in (('full', {}), ('--max-errors 10', {'max_errors': 10}),
+                                  ('--check', {'check': True}),
+                                  ('--check --max-errors 10', {'check': True, 'max_errors': 10}),
+                                  ('--check --fail-fast', {'check': True, 'max_errors': 1})):
+                if verdict(source, parser=parser, **options):
+                    raise AssertionError("{} passes in mode {}".format(name, mode))
+                seconds = best_time(lambda: verdict(source, parser=parser, **options))
+                print("  {:13} {:7} {:24} {:8.2f} ms".format(name, parser, mode, seconds * 1000))
+
+
+def start_server(path):
+    server = subprocess.Popen([sys.executable, 'main.py', '--serve', path])
+    while not os.path.exists(path):
+        time.sleep(0.01)
+    return server
+
+
+def stop_server(server, path, timeout=10):
+    # SIGTERM, then the server must end and remove its socket
+    server.terminate()
+    deadline = time.time() + timeout
+    while server.poll() is None and time.time() < deadline:
+        time.sleep(0.01)
+    if server.poll() is None:
+        server.kill()
+        server.wait()
+        raise AssertionError("the server did not end on SIGTERM")
+    if os.path.exists(path):
+        os.unlink(path)
+        raise AssertionError("the server left its socket behind")
+
+
+def bench_daemon():
+    # example9 never ends
+    examples = [f for f in EXAMPLES if not f.endswith('lab5/example9.m')]
+    path = os.path.join(os.path.dirname(Daemon.default_socket), 'mlang-benchmark-{}.sock'.format(os.getpid()))
+    server = start_server(path)
+    try:
+
+        def cold(f):
+            return subprocess.check_output([sys.executable, 'main.py', f], stderr=subprocess.STDOUT)
+
+        def client(f):
+            return subprocess.check_output([sys.executable, 'client.py', '--socket', path, f],
+                                           stderr=subprocess.STDOUT)
+
+        def submitted(f):
+            output = StringIO()
+            Daemon.submit([f], path, output, output)
+            return output.getvalue()
+
+        for f in examples:
+            if cold(f) != client(f) or cold(f) != submitted(f):
+                raise AssertionError("the server runs {} differently".format(f))
+        print("daemon: latency per example, {} examples".format(len(examples)))
+        for name, run in (('cold main.py', cold), ('client.py', client), ('submitted', submitted)):
+            seconds = best_time(lambda: [run(f) for f in examples])
+            print("  {:13} {:8.2f} ms".format(name, seconds * 1000 / len(examples)))
+    finally:
+        stop_server(server, path)
+    # terminated while it writes a reply, or just after, the server still ends
+    for _ in range(10):
+        server = start_server(path)
+        try:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.connect(path)
+            connection.sendall(json.dumps({'argv': [examples[0]], 'cwd': os.getcwd()}))
+            connection.shutdown(socket.SHUT_WR)
+            connection.recv(1)
+            connection.close()
+        finally:
+            stop_server(server, path)
+    print("  terminated after a request: ended and removed the socket 10 times out of 10")
+
+
+def bench_runner():
+    # example9 never ends, the other examples take milliseconds; the runaway scripts come first
+    runaway = [f for f in EXAMPLES if f.endswith('lab5/example9.m')] * 2
+    scripts = runaway + [f for f in EXAMPLES if f not in runaway] * 5
+    print("runner: {} scripts, {} of them endless, on {} cores".format(
+        len(scripts), len(runaway), multiprocessing.cpu_count()))
+    for name, argv, timeout in (('timeout 1 s', [], 1), ('--max-steps 10000', ['--max-steps', '10000'], None)):
+        for workers in (1, 4):
+            start = time.time()
+            quick = None
+            for filename, status, output, seconds in Runner.run_scripts(scripts, argv, workers, timeout):
+                if filename in runaway and status == 0:
+                    raise AssertionError("{} ended".format(filename))
+                if filename not in runaway:
+                    quick = time.time() - start
+            total = time.time() - start
+            print("  {:18} {} workers: last quick script after {:7.2f} ms, all after {:7.2f} ms".format(
+                name, workers, quick * 1000, total * 1000))
+
+
+LOOPS = """
+n = 0;
+for i = 1:20000 {
+    k = i;
+    while (k > i - 3)
+        k -= 1;
+    if (k == 5)
+        continue;
+    if (i == 19999)
+        print i, k;
+}
+"""
+
+
+def run_flat(ast, slice=None):
+    # like interpret, on an Execution yielding every <slice> steps
+    execution = Execution(ast)
+    output = StringIO()
+    stdout, sys.stdout = sys.stdout, output
+    try:
+        for _ in execution.run(slice):
+            pass
+    finally:
+        sys.stdout = stdout
+    return output.getvalue(), execution.steps
+
+
+def bench_engine():
+    ast = prepare(LOOPS)
+    expected = interpret(ast)
+    output, steps = run_flat(ast)
+    if output != expected:
+        raise AssertionError("the engines disagree:\n{}\n{}".format(expected, output))
+    print("engine: loops of {} steps".format(steps))
+    print("  tree walk          {:8.2f} ms".format(best_time(lambda: interpret(ast)) * 1000))
+    for slice in (None, 10000, 100, 1):
+        print("  flat, slice {:6} {:8.2f} ms".format(slice, best_time(lambda: run_flat(ast, slice)) * 1000))
+    # endless scripts do not hold up the others sharing the process
+    programs = [prepare("a = {};\nfor i = 1:200\n    a = a + i;\nprint a;".format(k)) for k in range(100)]
+    endless = prepare("n = 0;\nwhile (n < 1) print n;")
+    runaway = Execution(endless, step_budget=100000)
+    start = time.time()
+    with quiet():
+        ended = list(time_slice([runaway] + [Execution(p) for p in programs], 100))
+    print("  time sliced        {:8.2f} ms for {} programs and one stopped at 100000 steps".format(
+        (time.time() - start) * 1000, len(programs)))
+    if ended[-1][0] is not runaway or not isinstance(ended[-1][1], StepBudgetExceeded):
+        raise AssertionError("the endless program did not end last")
+
+
+CHECKPOINTED = """
+A = ones(500) .+ eye(500);
+B = A .* A;
+M = [{}];
+for i = 1:3
+    print i, A[1, 1], B[1, 1], M[1, 1];
+""".format('; '.join(', '.join(str(i * j) for j in range(200)) for i in range(200)))
+
+
+@contextmanager
+def element_by_element():
+    # every number of a list written on its own, with its tag (arrays are written in bulk anyway)
+    bulk_code = Checkpoint.bulk_code
+    Checkpoint.bulk_code = lambda values: None
+    try:
+        yield
+    finally:
+        Checkpoint.bulk_code = bulk_code
+
+
+def bench_checkpoint():
+    ast = prepare(CHECKPOINTED)
+    program = Checkpoint.fingerprint(CHECKPOINTED, 2)
+    execution = Execution(ast)
+    with quiet():
+        # stops inside the loop
+        next(execution.run(5))
+    path = os.path.join(os.path.dirname(Daemon.default_socket), 'mlang-benchmark-{}.ckpt'.format(os.getpid()))
+    print("checkpoint: 2 arrays of 500x500, nested lists of 200x200 and their loop, pc {}".format(execution.pc))
+    try:
+        for name, mode in (('bulk', None), ('element by element', element_by_element)):
+            with mode() if mode else quiet():
+                save = best_time(lambda: Checkpoint.save(path, execution, program))
+                size = os.path.getsize(path)
+                resumed = Execution(ast)
+                load = best_time(lambda: Checkpoint.restore(path, resumed, program))
+            if resumed.pc != execution.pc or state(resumed) != state(execution):
+                raise AssertionError("the restored run differs")
+            print("  {:18} {:9} bytes  save {:8.2f} ms  restore {:8.2f} ms".format(
+                name, size, save * 1000, load * 1000))
+    finally:
+        os.unlink(path)
+
+
+def bench_load():
+    size = 300
+    rows = [[random.randint(-1000, 1000) for _ in range(size)] for _ in range(size)]
+    path = os.path.join(os.path.dirname(Daemon.default_socket), 'mlang-benchmark-{}.mat'.format(os.getpid()))
+    MatrixFile.save(path, rows)
+    literal = "[" + "; ".join(", ".join(str(v) for v in row) for row in rows) + "]"
+    programs = [
+        ('literal', "A = {};\nprint A[1, 2];\n".format(literal)),
+        ('load, one element', 'A = load("{}");\nprint A[1, 2];\n'.format(path)),
+        ('load, every element', 'A = load("{}");\nB = A .+ A;\nprint B[1, 2];\n'.format(path))
+    ]
+    print("load: a {0}x{0} matrix of ints, {1} bytes of literal, {2} bytes of file".format(
+        size, len(literal), os.path.getsize(path)))
+    try:
+        for name, text in programs:
+            def run():
+                with quiet():
+                    prepare(text).accept(Interpreter())
+            print("  {:20} {:9.2f} ms".format(name, best_time(run) * 1000))
+    finally:
+        os.unlink(path)
+
+
+def bench_ast_file():
+    rnd = random.Random(0)
+    for text in read_examples() + [random_program(rnd, rnd.randint(1, 10)) for _ in range(1000)]:
+        error, ast, _ = parse_with(Mparser.parser, text)
+        if error:
+            continue
+        tree = DescentParser.parser.parse(text, lexer=scanner.FastLexer())
+        if ast_signature(ASTFile.decode(StringIO(ASTFile.encode(tree)))) != ast:
+            raise AssertionError("decoded program differs from {!r}".format(text))
+    numbers = [[rnd.randint(-1000, 1000) for _ in range(200)] for _ in range(200)]
+    programs = [
+        ('code', '\n'.join(random_program(rnd, 20) for _ in range(300))),
+        ('literals', "A = [{}];\nB = [{}];\nprint A[1, 1], B[1, 1];\n".format(
+            "; ".join(", ".join(str(v) for v in row) for row in numbers),
+            "; ".join(", ".join(str(v / 8.0) for v in row) for row in numbers)))
+    ]
+    print("AST files: decoded programs agree with the parsed ones")
+    for name, text in programs:
+        lexer = scanner.FastLexer()
+        parse = best_time(lambda: Mparser.parser.parse(text, lexer=lexer, tracking=True))
+        data = ASTFile.encode(Mparser.parser.parse(text, lexer=lexer, tracking=True))
+        decode = best_time(lambda: ASTFile.decode(StringIO(data)))
+        first = best_time(lambda: next(ASTFile.Decoder(StringIO(data))))
+        print("  {:9} source {:8} bytes  file {:8} bytes ({:4.1f}x)  parse {:8.2f} ms  decode {:7.2f} ms "
+              "({:4.1f}x)  first statement {:5.2f} ms".format(
+                  name, len(text), len(data), len(text) / float(len(data)), parse * 1000, decode * 1000,
+                  parse / decode, first * 1000))
+
+
+ALIASED = """
+A = [1, 2; 3, 4];
+B = [2, 0; 1, 2];
+for i = 1:4 {
+    R = A * B;
+    S = R;
+    R = A * B;
+    R[0, 0] = i;
+    print S, R;
+}
+for i = 1:4 {
+    T = A .* B;
+    U = T';
+    T = A .* B;
+    T[1, 1] = i;
+    print T, U;
+}
+for i = 1:3 {
+    P = A * B;
+    Q = P + A;
+    P[0, 0] = 77;
+    print Q, P, (A * B) .- A;
+}
+"""
+
+
+@contextmanager
+def unbuffered():
+    # every operation allocates its result
+    reusable = BufferedOp.reusable
+    BufferedOp.reusable = lambda self, buffer: False
+    try:
+        yield
+    finally:
+        BufferedOp.reusable = reusable
+
+
+def bench_buffers():
+    # buffers still held by variables, or by rows of other values, are never overwritten
+    ast = prepare(ALIASED, optimize=False)
+    with unbuffered():
+        expected = interpret(ast)
+    counters.clear()
+    if interpret(ast) != expected:
+        raise AssertionError("a reused buffer changed the value of a variable")
+    print("buffers: {} reused and {} allocated in programs sharing results".format(
+        counters['buffers reused'], counters['buffers allocated']))
+    size = 30
+    ast = prepare("A = ones({0}) .+ eye({0}); B = A .+ A;\nfor i = 1:200 {{\n    R = A * B;\n    print R[0, 0];\n}}"
+                  .format(size), optimize=False)
+    with quiet():
+        with unbuffered():
+            allocating = best_time(lambda: interpret(ast))
+        reusing = best_time(lambda: interpret(ast))
+    print("  200 products of {0}x{0}  allocating {1:8.2f} ms  reusing {2:8.2f} ms".format(
+        size, allocating * 1000, reusing * 1000))
+
+
+NESTED = [
+    ('branches', "for i = 0:{0}\n    for j = 0:{0} {{\n        if (i == j) print i;\n    }}"),
+    ('locals', "for i = 0:{0}\n    for j = 0:{0} {{\n        t = i * j;\n        if (t == 49) print t;\n    }}"),
+]
+
+
+@contextmanager
+def framed(ast):
+    # every block opens a frame of its own and popped frames are dropped, as they were
+    # before blocks without variables ran in the frame around them
+    blocks = [n for n in walk(ast) if getattr(n, 'frameless', False)]
+    pool_size = Memory.pool_size
+    Memory.pool_size = 0
+    for n in blocks:
+        del n.frameless
+    try:
+        yield
+    finally:
+        Memory.pool_size = pool_size
+        for n in blocks:
+            n.frameless = True
+
+
+def bench_frames():
+    size = 200
+    print("frames: nested loops of {} iterations".format(size * size))
+    for name, text in NESTED:
+        ast = prepare(text.format(size))
+        expected = interpret(ast)
+        for label, engine in (('tree', interpret), ('flat', lambda ast: run_flat(ast)[0])):
+
+            def measure():
+                counters.clear()
+                if engine(ast) != expected:
+                    raise AssertionError("{} {} output differs".format(name, label))
+                frames = counters['frames allocated'], counters['frames reused']
+                return (best_time(lambda: engine(ast)),) + frames
+            with framed(ast):
+                before, allocated, _ = measure()
+            after, fresh, reused = measure()
+            print("  {:8} {}  per iteration {:6.2f} us -> {:6.2f} us ({:4.2f}x)  frames allocated {:6} -> {} "
+                  "(reused {})".format(name, label, before * 1e6 / size ** 2, after * 1e6 / size ** 2,
+                                       before / after, allocated, fresh, reused))
+
+
+def state(execution):
+    # how the variables of <execution> print, frame by frame
+    return repr([sorted(frame.variables.items()) for frame in execution.interpreter.memories.stack])
+
+
+BENCHMARKS = {
+    'lexer': bench_lexer,
+    'parser': bench_parser,
+    'assignment': bench_assignment,
+    'storage': bench_storage,
+    'buffers': bench_buffers,
+    'fusion': bench_fusion,
+    'chains': bench_chains,
+    'parallel': bench_parallel,
+    'sparse': bench_sparse,
+    'constants': bench_constants,
+    'memo': bench_memo,
+    'cse': bench_cse,
+    'dce': bench_dce,
+    'symbols': bench_symbols,
+    'check': bench_check,
+    'verdict': bench_verdict,
+    'daemon': bench_daemon,
+    'runner': bench_runner,
+    'engine': bench_engine,
+    'checkpoint': bench_checkpoint,
+    'load': bench_load,
+    'ast_file': bench_ast_file,
+    'frames': bench_frames,
+}
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or sorted(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
@@ -0,0 +1,14 @@
+#!/usr/bin/env python2
+
+import sys
+import argparse
+import Daemon
+
+# Runs a script in the server started with main.py --serve, taking the options of main.py.
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser(usage="%(prog)s [--socket SOCKET] [main.py arguments]")
+    argparser.add_argument('--socket', default=Daemon.default_socket,
+                           help="socket the server listens at (default {})".format(Daemon.default_socket))
+    args, argv = argparser.parse_known_args()
+    sys.exit(Daemon.submit(argv, args.socket))
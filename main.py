@@ -1,34 +1,261 @@
 #!/usr/bin/env python2
 
 import sys
+import argparse
+from StringIO import StringIO
 import ply.yacc as yacc
 import Mparser
+import DescentParser
 from TreePrinter import TreePrinter
 from TypeChecker import TypeChecker
+from ShapeInference import ShapeInference
+from Analysis import Liveness, mark_in_place, mark_borrowed, mark_frameless
+from Fusion import mark_fused
+from Optimizer import memo_cache, order_chains, memoize_loops, eliminate_common_subexpressions, eliminate_dead_code
 from Interpreter import Interpreter
-from Exceptions import ReturnValueException
+from Engine import Execution
+from Exceptions import ReturnValueException, StepBudgetExceeded, CheckpointError, MatrixFileError, \
+    ASTFileError, ErrorBudget, ErrorBudgetExceeded
+import Instrumentation
+import Parallel
+import Daemon
+import Checkpoint
+import ASTFile
+
+argparser = argparse.ArgumentParser()
+argparser.add_argument('filename', nargs='?', default="examples/example1.m")
+argparser.add_argument('--lexer', choices=['ply', 'fast'], default='ply',
+                       help="tokenizer engine: ply.lex or the single-pattern FastLexer")
+argparser.add_argument('--parser', choices=['lalr', 'descent'], default='lalr',
+                       help="PLY LALR parser or the recursive-descent DescentParser")
+argparser.add_argument('--jobs', type=int, default=1,
+                       help="worker processes sharing type checking and large matrix operations")
+argparser.add_argument('-O', '--optimize', type=int, choices=[0, 1, 2], default=2,
+                       help="0: interpret the tree as parsed, 1: analyses guiding the interpreter "
+                            "(in-place updates, fusion, product order, blocks without frames), 2: also rewrite the tree "
+                            "(common subexpressions, dead code) and memoize loop bodies")
+argparser.add_argument('--check', action='store_true',
+                       help="only parse and type check, without printing the tree or running the "
+                            "program; the exit status is 1 when there are errors")
+argparser.add_argument('--max-errors', type=int, metavar='N',
+                       help="stop parsing and type checking after N errors, reporting an undefined "
+                            "variable once and no errors following from it. Instructions are checked "
+                            "as soon as they are parsed, so errors come before the tree")
+argparser.add_argument('--fail-fast', dest='max_errors', action='store_const', const=1,
+                       help="stop at the first error, same as --max-errors 1")
+argparser.add_argument('--engine', choices=['tree', 'flat'], default='tree',
+                       help="walk the tree, or run the control flow flattened by Engine.Execution")
+argparser.add_argument('--max-steps', type=int, metavar='N',
+                       help="stop the program after N steps, with exit status 3: loop iterations "
+                            "of the tree engine, instructions of the flat one")
+argparser.add_argument('--checkpoint', metavar='FILE',
+                       help="save the state of the run to FILE every --checkpoint-steps steps or "
+                            "--checkpoint-seconds seconds, with the flat engine")
+argparser.add_argument('--checkpoint-steps', type=int, metavar='N')
+argparser.add_argument('--checkpoint-seconds', type=float, metavar='SECONDS')
+argparser.add_argument('--resume', metavar='FILE',
+                       help="continue the run of the program saved to checkpoint FILE, with the flat engine")
+argparser.add_argument('--compile', metavar='FILE',
+                       help="only parse and type check, writing the program to FILE in the binary "
+                            "form of ASTFile, which runs in place of the source; the exit status "
+                            "is 1 when there are errors")
+argparser.add_argument('--serve', nargs='?', const=Daemon.default_socket, metavar='SOCKET',
+                       help="keep running, executing the scripts client.py submits over the unix "
+                            "socket SOCKET (default {})".format(Daemon.default_socket))
+argparser.add_argument('--stats', action='store_true',
+                       help="print interpreter and optimizer counters to stderr when done")
+
+
+def run(text, args):
+    """Runs the program <text> as told by the command line <args>, printing to sys.stdout and
+    sys.stderr. Returns the exit status."""
+    if text.startswith(ASTFile.magic):
+        return run_compiled(StringIO(text), args)
+    # nothing is left over from the previous run of a daemon
+    Instrumentation.counters.clear()
+    memo_cache.entries.clear()
+    if args.parser == 'descent':
+        parser = DescentParser.parser
+    else:
+        parser = Mparser.parser
+    if args.lexer == 'fast':
+        lexer = Mparser.scanner.FastLexer()
+    else:
+        lexer = Mparser.scanner.lexer
+    lexer.lineno = 1
+    # checking for a verdict: errors are counted and their cascades not reported
+    verdict = args.check or args.max_errors is not None
+    budget = ErrorBudget(args.max_errors) if verdict else None
+    lexer.encountered_error = False
+    lexer.error_budget = budget
+    lexer.consume = None
+    options = {}
+    checker = None
+    if verdict:
+        # instructions are checked as they are parsed, so a spent budget also ends parsing
+        checker = TypeChecker(budget, cascades=False)
+
+        def check(instruction):
+            # a syntax error leaves the program unchecked, as without streaming
+            if not lexer.encountered_error:
+                checker.visit(instruction)
+        if args.parser == 'descent':
+            options['consume'] = check
+        else:
+            lexer.consume = check
+    encountered_error = True
+    status = 0
+    try:
+        ast = parser.parse(text, lexer=lexer, tracking=True, **options)
+        if not lexer.encountered_error and ast is not None:
+            if not (args.check or args.compile):
+                ast.printTree()
+            status, encountered_error = check_and_run(ast, text, args, checker, budget, verdict)
+    except ErrorBudgetExceeded:
+        pass
+
+    if args.stats:
+        Instrumentation.report(sys.stderr)
+    return 1 if (args.check or args.compile) and encountered_error else status
+
+
+def run_compiled(stream, args):
+    """Runs the program written by --compile to file <stream>, like run(). The program was
+    checked when compiled: at -O0 with the tree engine, its statements run as soon as they are
+    decoded, otherwise it is decoded whole and goes through the passes of run()."""
+    Instrumentation.counters.clear()
+    memo_cache.entries.clear()
+    status = 0
+    encountered_error = False
+    try:
+        if args.check or args.compile or args.optimize or args.engine != 'tree' or args.checkpoint \
+                or args.resume:
+            data = stream.read()
+            ast = ASTFile.decode(StringIO(data))
+            if ast is not None:
+                status, encountered_error = check_and_run(ast, data, args)
+        else:
+            status = run_statements(ASTFile.Decoder(stream), args)
+    except ASTFileError as e:
+        sys.stderr.write("Compiled program error: {}\n".format(e))
+        status = 1
+
+    if args.stats:
+        Instrumentation.report(sys.stderr)
+    return 1 if (args.check or args.compile) and encountered_error else status
+
+
+def check_and_run(ast, text, args, checker=None, budget=None, verdict=False):
+    # type checks the program <ast> parsed from <text> unless <checker> did already, then
+    # compiles or runs it. Returns the exit status and whether there were errors
+    # workers are forked with a copy of anything still buffered
+    sys.stdout.flush()
+    Parallel.configure(args.jobs, tree=ast)
+    try:
+        if checker is not None:
+            encountered_error = checker.encountered_error
+        else:
+            encountered_error = Parallel.type_check(ast, budget, cascades=not verdict)
+        if encountered_error or args.check:
+            return 0, encountered_error
+        if args.compile:
+            ASTFile.save(args.compile, ast)
+            return 0, False
+        return execute(ast, text, args), False
+    finally:
+        # serial again until the next run, which finds the workers started
+        Parallel.configure(1)
 
-if __name__ == '__main__':
 
+def execute(ast, text, args):
+    # runs the checked program <ast> parsed from <text>, returns the exit status
+    if args.optimize >= 1:
+        ShapeInference().visit(ast)
+    if args.optimize >= 2:
+        eliminate_common_subexpressions(ast)
+        eliminate_dead_code(ast)
+    if args.optimize >= 1:
+        Liveness().run(ast)
+        mark_in_place(ast)
+        mark_borrowed(ast)
+        mark_frameless(ast)
+        mark_fused(ast)
+        order_chains(ast)
+    if args.optimize >= 2:
+        memoize_loops(ast)
+
+    def program():
+        if args.checkpoint or args.resume:
+            execution = Execution(ast, Interpreter(), args.max_steps)
+            program = Checkpoint.fingerprint(text, args.optimize)
+            if args.resume:
+                Checkpoint.restore(args.resume, execution, program)
+            if args.checkpoint:
+                seconds = args.checkpoint_seconds
+                steps = args.checkpoint_steps or (100000 if seconds is None else None)
+                Checkpoint.run(execution, args.checkpoint, program, steps, seconds)
+            else:
+                execution.finish()
+        elif args.engine == 'flat':
+            Execution(ast, Interpreter(), args.max_steps).finish()
+        else:
+            ast.accept(Interpreter(args.max_steps))
+    return interpret(program)
+
+
+def run_statements(statements, args):
+    # runs the top-level statements of a checked program as <statements> yields them, with the
+    # tree engine and no optimization. Returns the exit status
+    checker = TypeChecker()
+    interpreter = Interpreter(args.max_steps)
+
+    def program():
+        for statement in statements:
+            # the Interpreter specializes operations on the types inferred
+            checker.visit(statement)
+            if checker.encountered_error:
+                return 1
+            statement.accept(interpreter)
+    return interpret(program)
+
+
+def interpret(program):
+    # runs <program>(), reporting how the run ended. Returns the exit status
     try:
-        filename = sys.argv[1] if len(sys.argv) > 1 else "examples/example1.m"
-        file = open(filename, "r")
+        return program() or 0
+    except ReturnValueException as e:
+        print("RETURNED {}".format(e.value))
+    except StepBudgetExceeded as e:
+        sys.stderr.write("Stopped: {}\n".format(e))
+        return 3
+    except CheckpointError as e:
+        sys.stderr.write("Checkpoint error: {}\n".format(e))
+        return 1
+    except MatrixFileError as e:
+        sys.stderr.write("Matrix file error: {}\n".format(e))
+        return 1
+    return 0
+
+
+def main(args):
+    try:
+        filename = args.filename
+        file = open(filename, "rb")
     except IOError:
         print("Cannot open {0} file".format(filename))
-        sys.exit(0)
+        return 0
+    with file:
+        if file.read(len(ASTFile.magic)) == ASTFile.magic:
+            file.seek(0)
+            return run_compiled(file, args)
+        file.seek(0)
+        return run(file.read(), args)
 
-    parser = Mparser.parser
-    text = file.read()
-    lexer = Mparser.scanner.lexer
-    lexer.encountered_error = False
-    ast = parser.parse(text, lexer=lexer, tracking=True)
-    if not lexer.encountered_error and ast is not None:
-        ast.printTree()
-        typeChecker = TypeChecker()
-        typeChecker.visit(ast)
-
-        if not typeChecker.encountered_error:
-            try:
-                ast.accept(Interpreter())
-            except ReturnValueException as e:
-                print("RETURNED {}".format(e.value))
+
+if __name__ == '__main__':
+
+    args = argparser.parse_args()
+    if args.serve is not None:
+        Daemon.serve(args.serve, main, argparser)
+        sys.exit(0)
+    sys.exit(main(args))
@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = "nonassocIFnonassocELSEright=ADDASSIGNSUBASSIGNMULASSIGNDIVASSIGNnonassoc<>EQUALNOTEQUALLEGEleft+-leftDOTADDDOTSUBleft*/leftDOTMULDOTDIVrightUMINUSright'ADDASSIGN BREAK CONTINUE DIVASSIGN DOTADD DOTDIV DOTMUL DOTSUB ELSE EQUAL EYE FLOATNUM FOR GE ID IF INTNUM LE MULASSIGN NOTEQUAL ONES PRINT RETURN STRING SUBASSIGN WHILE ZEROSinstructions : instruction\n                    | instruction instructionsinstruction : block\n                   | conditional\n                   | loop\n                   | statement ';'\n                   | error ';'block : '{' instructions '}'\n             | '{' error '}'conditional : IF '(' expression ')' instruction %prec IF\n                   | IF '(' expression ')' instruction ELSE instructionloop : while\n            | forwhile : WHILE '(' expression ')' instructionfor : FOR ID '=' numeric_expression ':' numeric_expression instructionstatement : assignment\n                 | flow_keyword\n                 | return\n                 | printflow_keyword : BREAK\n                    | CONTINUEreturn : RETURN expression\n              | RETURN print : PRINT print_bodyprint_body : expression ',' print_body\n                  | expressionstring : STRINGassignment_var : var\n                      | array_rangeassignment : assignment_var assignment_operand expression\n                  | assignment_var '=' stringassignment_operand : '='\n                          | ADDASSIGN\n                          | SUBASSIGN\n                          | MULASSIGN\n                          | DIVASSIGNvar : ID\n           | var '[' vector_body ']'number : INTNUM\n              | FLOATNUM\n              | vararray_range : var '[' numeric_expression ',' numeric_expression ']'expression : numeric_expression\n                  | comparison_expressionnumeric_expression : number\n                          | matrix\n                          | vector\n                          | string\n                          | unary_operation\n                          | function\n                          | '(' numeric_expression ')'numeric_expression : numeric_expression '+' numeric_expression\n                          | numeric_expression '-' numeric_expression\n                          | numeric_expression '*' numeric_expression\n                          | numeric_expression '/' numeric_expression\n                          | numeric_expression DOTADD numeric_expression\n                          | numeric_expression DOTSUB numeric_expression\n                          | numeric_expression DOTMUL numeric_expression\n                          | numeric_expression DOTDIV numeric_expressionvector : '[' vector_body ']'\n              | '[' ']'vector_body : numeric_expression\n                   | vector_body ',' numeric_expressionmatrix : '[' matrix_body ']'matrix_body : vector_body\n                   | matrix_body ';' vector_bodyunary_operation : negation\n                       | transpositionnegation : '-' numeric_expression %prec UMINUStransposition : numeric_expression '\\''function : function_name '(' vector_body ')'\n                | function_name '(' error ')'function_name : EYE\n                     | ZEROS\n                     | ONEScomparison_expression : numeric_expression '<' numeric_expression\n                              | numeric_expression '>' numeric_expression\n                              | numeric_expression EQUAL numeric_expression\n                              | numeric_expression NOTEQUAL numeric_expression\n                              | numeric_expression LE numeric_expression\n                              | numeric_expression GE numeric_expression\n                              | '(' comparison_expression ')'"
+_lr_signature = "nonassocIFnonassocELSEright=ADDASSIGNSUBASSIGNMULASSIGNDIVASSIGNnonassoc<>EQUALNOTEQUALLEGEleft+-leftDOTADDDOTSUBleft*/leftDOTMULDOTDIVrightUMINUSright'ADDASSIGN BREAK CONTINUE DIVASSIGN DOTADD DOTDIV DOTMUL DOTSUB ELSE EQUAL EYE FLOATNUM FOR GE ID IF INTNUM LE LOAD MULASSIGN NOTEQUAL ONES PRINT RETURN SAVE STRING SUBASSIGN WHILE ZEROSprogram : instruction\n               | program instructioninstructions : instruction\n                    | instruction instructionsinstruction : block\n                   | conditional\n                   | loop\n                   | statement ';'\n                   | error ';'block : '{' instructions '}'\n             | '{' error '}'conditional : IF '(' expression ')' instruction %prec IF\n                   | IF '(' expression ')' instruction ELSE instructionloop : while\n            | forwhile : WHILE '(' expression ')' instructionfor : FOR ID '=' numeric_expression ':' numeric_expression instructionstatement : assignment\n                 | flow_keyword\n                 | return\n                 | print\n                 | functionflow_keyword : BREAK\n                    | CONTINUEreturn : RETURN expression\n              | RETURN print : PRINT print_bodyprint_body : expression ',' print_body\n                  | expressionstring : STRINGassignment_var : var\n                      | array_rangeassignment : assignment_var assignment_operand expression\n                  | assignment_var '=' stringassignment_operand : '='\n                          | ADDASSIGN\n                          | SUBASSIGN\n                          | MULASSIGN\n                          | DIVASSIGNvar : ID\n           | var '[' vector_body ']'number : INTNUM\n              | FLOATNUM\n              | vararray_range : var '[' numeric_expression ',' numeric_expression ']'expression : numeric_expression\n                  | comparison_expressionnumeric_expression : number\n                          | matrix\n                          | vector\n                          | string\n                          | unary_operation\n                          | function\n                          | '(' numeric_expression ')'numeric_expression : numeric_expression '+' numeric_expression\n                          | numeric_expression '-' numeric_expression\n                          | numeric_expression '*' numeric_expression\n                          | numeric_expression '/' numeric_expression\n                          | numeric_expression DOTADD numeric_expression\n                          | numeric_expression DOTSUB numeric_expression\n                          | numeric_expression DOTMUL numeric_expression\n                          | numeric_expression DOTDIV numeric_expressionvector : '[' vector_body ']'\n              | '[' ']'vector_body : numeric_expression\n                   | vector_body ',' numeric_expressionmatrix : '[' matrix_body ']'matrix_body : vector_body\n                   | matrix_body ';' vector_bodyunary_operation : negation\n                       | transpositionnegation : '-' numeric_expression %prec UMINUStransposition : numeric_expression '\\''function : function_name '(' vector_body ')'\n                | function_name '(' error ')'function_name : EYE\n                     | ZEROS\n                     | ONES\n                     | LOAD\n                     | SAVEcomparison_expression : numeric_expression '<' numeric_expression\n                              | numeric_expression '>' numeric_expression\n                              | numeric_expression EQUAL numeric_expression\n                              | numeric_expression NOTEQUAL numeric_expression\n                              | numeric_expression LE numeric_expression\n                              | numeric_expression GE numeric_expression\n                              | '(' comparison_expression ')'"
     
-_lr_action_items = {'error':([0,2,3,4,5,8,10,11,18,27,28,43,44,45,46,47,48,51,52,53,55,56,57,65,66,86,89,93,96,100,101,103,104,105,106,107,108,109,110,117,120,122,127,129,130,134,135,137,138,140,141,],[7,7,-3,-4,-5,30,-12,-13,-37,-6,-7,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-8,-9,-70,-69,-61,125,7,7,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-10,-14,-71,-72,7,7,-11,-15,]),'{':([0,2,3,4,5,8,10,11,18,27,28,43,44,45,46,47,48,51,52,53,55,56,57,65,66,86,89,93,100,101,103,104,105,106,107,108,109,110,117,120,122,127,129,130,134,135,137,138,140,141,],[8,8,-3,-4,-5,8,-12,-13,-37,-6,-7,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-8,-9,-70,-69,-61,8,8,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-10,-14,-71,-72,8,8,-11,-15,]),'IF':([0,2,3,4,5,8,10,11,18,27,28,43,44,45,46,47,48,51,52,53,55,56,57,65,66,86,89,93,100,101,103,104,105,106,107,108,109,110,117,120,122,127,129,130,134,135,137,138,140,141,],[9,9,-3,-4,-5,9,-12,-13,-37,-6,-7,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-8,-9,-70,-69,-61,9,9,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-10,-14,-71,-72,9,9,-11,-15,]),'WHILE':([0,2,3,4,5,8,10,11,18,27,28,43,44,45,46,47,48,51,52,53,55,56,57,65,66,86,89,93,100,101,103,104,105,106,107,108,109,110,117,120,122,127,129,130,134,135,137,138,140,141,],[16,16,-3,-4,-5,16,-12,-13,-37,-6,-7,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-8,-9,-70,-69,-61,16,16,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-10,-14,-71,-72,16,16,-11,-15,]),'FOR':([0,2,3,4,5,8,10,11,18,27,28,43,44,45,46,47,48,51,52,53,55,56,57,65,66,86,89,93,100,101,103,104,105,106,107,108,109,110,117,120,122,127,129,130,134,135,137,138,140,141,],[17,17,-3,-4,-5,17,-12,-13,-37,-6,-7,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-8,-9,-70,-69,-61,17,17,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-10,-14,-71,-72,17,17,-11,-15,]),'BREAK':([0,2,3,4,5,8,10,11,18,27,28,43,44,45,46,47,48,51,52,53,55,56,57,65,66,86,89,93,100,101,103,104,105,106,107,108,109,110,117,120,122,127,129,130,134,135,137,138,140,141,],[20,20,-3,-4,-5,20,-12,-13,-37,-6,-7,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-8,-9,-70,-69,-61,20,20,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-10,-14,-71,-72,20,20,-11,-15,]),'CONTINUE':([0,2,3,4,5,8,10,11,18,27,28,43,44,45,46,47,48,51,52,53,55,56,57,65,66,86,89,93,100,101,103,104,105,106,107,108,109,110,117,120,122,127,129,130,134,135,137,138,140,141,],[21,21,-3,-4,-5,21,-12,-13,-37,-6,-7,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-8,-9,-70,-69,-61,21,21,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-10,-14,-71,-72,21,21,-11,-15,]),'RETURN':([0,2,3,4,5,8,10,11,18,27,28,43,44,45,46,47,48,51,52,53,55,56,57,65,66,86,89,93,100,101,103,104,105,106,107,108,109,110,117,120,122,127,129,130,134,135,137,138,140,141,],[22,22,-3,-4,-5,22,-12,-13,-37,-6,-7,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-8,-9,-70,-69,-61,22,22,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-10,-14,-71,-72,22,22,-11,-15,]),'PRINT':([0,2,3,4,5,8,10,11,18,27,28,43,44,45,46,47,48,51,52,53,55,56,57,65,66,86,89,93,100,101,103,104,105,106,107,108,109,110,117,120,122,127,129,130,134,135,137,138,140,141,],[23,23,-3,-4,-5,23,-12,-13,-37,-6,-7,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-8,-9,-70,-69,-61,23,23,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-10,-14,-71,-72,23,23,-11,-15,]),'ID':([0,2,3,4,5,8,10,11,17,18,22,23,27,28,31,32,34,35,36,37,38,39,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,64,65,66,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,89,90,91,93,96,97,100,101,103,104,105,106,107,108,109,110,117,120,121,122,123,127,128,129,130,131,134,135,137,138,140,141,],[18,18,-3,-4,-5,18,-12,-13,33,-37,18,18,-6,-7,18,18,18,-32,-33,-34,-35,-36,-45,-46,-47,-48,-49,-50,18,18,-39,-40,-41,18,-27,-67,-68,18,-8,-9,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,-70,-69,18,18,-61,18,18,18,18,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,18,-60,18,-38,18,-10,-14,18,-71,-72,18,18,-11,-15,]),'$end':([1,2,3,4,5,10,11,26,27,28,65,66,129,130,140,141,],[0,-1,-3,-4,-5,-12,-13,-2,-6,-7,-8,-9,-10,-14,-11,-15,]),'}':([2,3,4,5,10,11,26,27,28,29,30,65,66,129,130,140,141,],[-1,-3,-4,-5,-12,-13,-2,-6,-7,65,66,-8,-9,-10,-14,-11,-15,]),'ELSE':([3,4,5,10,11,27,28,65,66,129,130,140,141,],[-3,-4,-5,-12,-13,-6,-7,-8,-9,137,-14,-11,-15,]),';':([6,7,12,13,14,15,18,20,21,22,30,40,41,42,43,44,45,46,47,48,51,52,53,55,56,57,62,63,70,71,86,89,92,93,94,95,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,120,122,126,127,132,133,134,135,],[27,28,-16,-17,-18,-19,-37,-20,-21,-23,28,-22,-43,-44,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-24,-26,-30,-31,-70,-69,121,-61,-65,-62,-52,-53,-54,-55,-56,-57,-58,-59,-76,-77,-78,-79,-80,-81,-51,-82,-64,-60,-25,-38,-66,-63,-71,-72,]),'(':([9,16,22,23,31,32,34,35,36,37,38,39,49,50,54,58,59,60,61,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[31,32,49,49,49,49,49,-32,-33,-34,-35,-36,49,90,90,96,-73,-74,-75,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,49,90,90,90,90,]),'[':([18,22,23,24,31,32,34,35,36,37,38,39,49,50,53,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,127,128,131,],[-37,54,54,64,54,54,54,-32,-33,-34,-35,-36,54,54,91,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,-38,54,54,]),'=':([18,19,24,25,33,127,139,],[-37,35,-28,-29,69,-38,-42,]),'ADDASSIGN':([18,19,24,25,127,139,],[-37,36,-28,-29,-38,-42,]),'SUBASSIGN':([18,19,24,25,127,139,],[-37,37,-28,-29,-38,-42,]),'MULASSIGN':([18,19,24,25,127,139,],[-37,38,-28,-29,-38,-42,]),'DIVASSIGN':([18,19,24,25,127,139,],[-37,39,-28,-29,-38,-42,]),'+':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,95,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,119,120,122,127,133,134,135,136,138,],[-37,72,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,72,-69,-61,72,72,72,-52,-53,-54,-55,-56,-57,-58,-59,72,72,72,72,72,72,-51,72,-64,-60,-38,72,-71,-72,72,72,]),'-':([18,22,23,31,32,34,35,36,37,38,39,41,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,93,95,96,97,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,119,120,121,122,123,127,128,131,133,134,135,136,138,],[-37,50,50,50,50,50,-32,-33,-34,-35,-36,73,-45,-46,-47,-48,-49,-50,50,50,-39,-40,-41,50,-27,-67,-68,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,-70,73,-69,50,50,-61,73,50,50,73,73,-52,-53,-54,-55,-56,-57,-58,-59,73,73,73,73,73,73,-51,73,-64,50,-60,50,-38,50,50,73,-71,-72,73,73,]),'*':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,95,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,119,120,122,127,133,134,135,136,138,],[-37,74,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,74,-69,-61,74,74,74,74,74,-54,-55,74,74,-58,-59,74,74,74,74,74,74,-51,74,-64,-60,-38,74,-71,-72,74,74,]),'/':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,95,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,119,120,122,127,133,134,135,136,138,],[-37,75,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,75,-69,-61,75,75,75,75,75,-54,-55,75,75,-58,-59,75,75,75,75,75,75,-51,75,-64,-60,-38,75,-71,-72,75,75,]),'DOTADD':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,95,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,119,120,122,127,133,134,135,136,138,],[-37,76,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,76,-69,-61,76,76,76,76,76,-54,-55,-56,-57,-58,-59,76,76,76,76,76,76,-51,76,-64,-60,-38,76,-71,-72,76,76,]),'DOTSUB':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,95,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,119,120,122,127,133,134,135,136,138,],[-37,77,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,77,-69,-61,77,77,77,77,77,-54,-55,-56,-57,-58,-59,77,77,77,77,77,77,-51,77,-64,-60,-38,77,-71,-72,77,77,]),'DOTMUL':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,95,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,119,120,122,127,133,134,135,136,138,],[-37,78,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,78,-69,-61,78,78,78,78,78,78,78,78,78,-58,-59,78,78,78,78,78,78,-51,78,-64,-60,-38,78,-71,-72,78,78,]),'DOTDIV':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,95,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,119,120,122,127,133,134,135,136,138,],[-37,79,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,79,-69,-61,79,79,79,79,79,79,79,79,79,-58,-59,79,79,79,79,79,79,-51,79,-64,-60,-38,79,-71,-72,79,79,]),'<':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,103,104,105,106,107,108,109,110,117,120,122,127,134,135,],[-37,80,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,80,-69,-61,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-71,-72,]),'>':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,103,104,105,106,107,108,109,110,117,120,122,127,134,135,],[-37,81,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,81,-69,-61,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-71,-72,]),'EQUAL':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,103,104,105,106,107,108,109,110,117,120,122,127,134,135,],[-37,82,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,82,-69,-61,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-71,-72,]),'NOTEQUAL':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,103,104,105,106,107,108,109,110,117,120,122,127,134,135,],[-37,83,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,83,-69,-61,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-71,-72,]),'LE':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,103,104,105,106,107,108,109,110,117,120,122,127,134,135,],[-37,84,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,84,-69,-61,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-71,-72,]),'GE':([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,103,104,105,106,107,108,109,110,117,120,122,127,134,135,],[-37,85,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,85,-69,-61,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-71,-72,]),"'":([18,41,43,44,45,46,47,48,51,52,53,55,56,57,86,87,89,93,95,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,119,120,122,127,133,134,135,136,138,],[-37,86,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,86,86,-61,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,-51,86,-64,-60,-38,86,-71,-72,86,86,]),',':([18,41,42,43,44,45,46,47,48,51,52,53,55,56,57,63,86,89,93,94,95,98,99,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,120,122,124,127,132,133,134,135,],[-37,-43,-44,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,97,-70,-69,-61,123,-62,123,128,-52,-53,-54,-55,-56,-57,-58,-59,-76,-77,-78,-79,-80,-81,-51,-82,-64,-60,123,-38,123,-63,-71,-72,]),')':([18,41,42,43,44,45,46,47,48,51,52,53,55,56,57,67,68,86,87,88,89,93,95,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,122,124,125,127,133,134,135,],[-37,-43,-44,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,100,101,-70,117,118,-69,-61,-62,-52,-53,-54,-55,-56,-57,-58,-59,-76,-77,-78,-79,-80,-81,-51,-82,117,-64,-60,134,135,-38,-63,-71,-72,]),']':([18,43,44,45,46,47,48,51,52,53,54,55,56,57,86,89,92,93,94,95,98,99,103,104,105,106,107,108,109,110,117,120,122,127,132,133,134,135,136,],[-37,-45,-46,-47,-48,-49,-50,-39,-40,-41,93,-27,-67,-68,-70,-69,120,-61,122,-62,127,-62,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-66,-63,-71,-72,139,]),':':([18,43,44,45,46,47,48,51,52,53,55,56,57,86,89,93,102,103,104,105,106,107,108,109,110,117,120,122,127,134,135,],[-37,-45,-46,-47,-48,-49,-50,-39,-40,-41,-27,-67,-68,-70,-69,-61,131,-52,-53,-54,-55,-56,-57,-58,-59,-51,-64,-60,-38,-71,-72,]),'INTNUM':([22,23,31,32,34,35,36,37,38,39,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[51,51,51,51,51,-32,-33,-34,-35,-36,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,]),'FLOATNUM':([22,23,31,32,34,35,36,37,38,39,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[52,52,52,52,52,-32,-33,-34,-35,-36,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,]),'STRING':([22,23,31,32,34,35,36,37,38,39,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[55,55,55,55,55,-32,-33,-34,-35,-36,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,]),'EYE':([22,23,31,32,34,35,36,37,38,39,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[59,59,59,59,59,-32,-33,-34,-35,-36,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,59,]),'ZEROS':([22,23,31,32,34,35,36,37,38,39,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[60,60,60,60,60,-32,-33,-34,-35,-36,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,60,]),'ONES':([22,23,31,32,34,35,36,37,38,39,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[61,61,61,61,61,-32,-33,-34,-35,-36,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,]),}
+_lr_action_items = {'SUBASSIGN':([13,18,21,23,133,143,],[57,-31,-40,-32,-41,-45,]),'DOTDIV':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,92,93,102,107,108,109,110,111,112,113,114,115,116,117,118,119,120,122,123,124,126,130,131,132,133,137,140,142,],[-40,-43,70,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,70,-72,70,-64,70,-62,70,70,70,70,70,70,70,70,70,70,-61,70,70,-54,70,-67,-63,-74,-75,70,-41,70,70,70,]),'RETURN':([0,3,7,8,21,24,26,28,30,32,34,36,37,40,41,42,43,44,45,46,48,49,54,55,66,68,73,87,93,104,106,107,110,111,112,114,115,116,118,122,124,126,129,130,131,133,135,138,141,142,144,145,146,],[2,-6,-15,2,-40,-1,-14,-7,2,-5,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-2,-8,-9,2,-73,-72,-64,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,2,-74,-75,-41,2,-16,-12,2,2,-17,-13,]),'NOTEQUAL':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,93,107,110,111,112,114,115,116,118,122,124,126,130,131,133,],[-40,-43,71,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,71,-72,-64,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,-74,-75,-41,]),'EQUAL':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,93,107,110,111,112,114,115,116,118,122,124,126,130,131,133,],[-40,-43,77,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,77,-72,-64,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,-74,-75,-41,]),'FLOATNUM':([2,4,38,39,47,53,56,57,58,59,60,61,62,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[34,34,34,34,34,34,34,-37,34,-39,-38,-36,-35,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,]),',':([21,33,34,35,36,37,40,41,42,43,44,45,46,48,49,52,73,87,91,92,93,96,101,102,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,124,126,130,131,133,136,137,],[-40,-47,-43,-46,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,94,-73,-72,127,-65,-64,127,127,134,-62,-84,-85,-55,-57,-56,-83,-58,-60,-59,-86,-61,-81,-82,-87,-54,-67,-63,-74,-75,-41,127,-66,]),'DOTADD':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,92,93,102,107,108,109,110,111,112,113,114,115,116,117,118,119,120,122,123,124,126,130,131,132,133,137,140,142,],[-40,-43,80,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,80,-72,80,-64,80,-62,80,80,80,-57,80,80,-58,-60,-59,80,-61,80,80,-54,80,-67,-63,-74,-75,80,-41,80,80,80,]),'WHILE':([0,3,7,8,21,24,26,28,30,32,34,36,37,40,41,42,43,44,45,46,48,49,54,55,66,68,73,87,93,104,106,107,110,111,112,114,115,116,118,122,124,126,129,130,131,133,135,138,141,142,144,145,146,],[5,-6,-15,5,-40,-1,-14,-7,5,-5,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-2,-8,-9,5,-73,-72,-64,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,5,-74,-75,-41,5,-16,-12,5,5,-17,-13,]),'PRINT':([0,3,7,8,21,24,26,28,30,32,34,36,37,40,41,42,43,44,45,46,48,49,54,55,66,68,73,87,93,104,106,107,110,111,112,114,115,116,118,122,124,126,129,130,131,133,135,138,141,142,144,145,146,],[4,-6,-15,4,-40,-1,-14,-7,4,-5,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-2,-8,-9,4,-73,-72,-64,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,4,-74,-75,-41,4,-16,-12,4,4,-17,-13,]),'DOTMUL':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,92,93,102,107,108,109,110,111,112,113,114,115,116,117,118,119,120,122,123,124,126,130,131,132,133,137,140,142,],[-40,-43,82,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,82,-72,82,-64,82,-62,82,82,82,82,82,82,82,82,82,82,-61,82,82,-54,82,-67,-63,-74,-75,82,-41,82,82,82,]),'INTNUM':([2,4,38,39,47,53,56,57,58,59,60,61,62,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[46,46,46,46,46,46,46,-37,46,-39,-38,-36,-35,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,]),"'":([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,92,93,102,107,108,109,110,111,112,113,114,115,116,117,118,119,120,122,123,124,126,130,131,132,133,137,140,142,],[-40,-43,73,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,73,73,73,-64,73,73,73,73,73,73,73,73,73,73,73,73,73,73,73,-54,73,-67,-63,-74,-75,73,-41,73,73,73,]),')':([21,33,34,35,36,37,40,41,42,43,44,45,46,48,49,73,85,86,87,92,93,95,96,97,103,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,126,130,131,133,137,],[-40,-47,-43,-46,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,121,122,-72,-65,-64,129,130,131,135,-62,-84,-85,-55,-57,-56,-83,-58,-60,-59,-86,-61,-81,-82,-87,-54,122,-67,-63,-74,-75,-41,-66,]),'(':([1,2,4,5,6,11,19,20,22,31,38,39,47,53,56,57,58,59,60,61,62,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[-79,38,38,53,-76,56,-78,-77,65,-80,38,88,88,38,88,-37,38,-39,-38,-36,-35,88,38,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,38,88,88,88,88,88,]),'+':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,92,93,102,107,108,109,110,111,112,113,114,115,116,117,118,119,120,122,123,124,126,130,131,132,133,137,140,142,],[-40,-43,74,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,74,-72,74,-64,74,-62,74,74,-55,-57,-56,74,-58,-60,-59,74,-61,74,74,-54,74,-67,-63,-74,-75,74,-41,74,74,74,]),'*':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,92,93,102,107,108,109,110,111,112,113,114,115,116,117,118,119,120,122,123,124,126,130,131,132,133,137,140,142,],[-40,-43,75,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,75,-72,75,-64,75,-62,75,75,75,-57,75,75,-58,75,75,75,-61,75,75,-54,75,-67,-63,-74,-75,75,-41,75,75,75,]),'-':([2,4,21,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,53,56,57,58,59,60,61,62,64,65,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,86,87,88,89,92,93,94,100,102,107,108,109,110,111,112,113,114,115,116,117,118,119,120,122,123,124,125,126,127,130,131,132,133,134,137,139,140,142,],[39,39,-40,-43,76,-30,-49,39,39,-70,-44,-52,-53,-51,-48,-42,39,-71,-50,39,39,-37,39,-39,-38,-36,-35,39,39,39,39,39,-73,39,39,39,39,39,39,39,39,39,39,39,76,-72,39,39,76,-64,39,39,76,-62,76,76,-55,-57,-56,76,-58,-60,-59,76,-61,76,76,-54,76,-67,39,-63,39,-74,-75,76,-41,39,76,39,76,76,]),'LE':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,93,107,110,111,112,114,115,116,118,122,124,126,130,131,133,],[-40,-43,72,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,72,-72,-64,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,-74,-75,-41,]),'/':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,92,93,102,107,108,109,110,111,112,113,114,115,116,117,118,119,120,122,123,124,126,130,131,132,133,137,140,142,],[-40,-43,78,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,78,-72,78,-64,78,-62,78,78,78,-57,78,78,-58,78,78,78,-61,78,78,-54,78,-67,-63,-74,-75,78,-41,78,78,78,]),'DIVASSIGN':([13,18,21,23,133,143,],[59,-31,-40,-32,-41,-45,]),'ADDASSIGN':([13,18,21,23,133,143,],[61,-31,-40,-32,-41,-45,]),';':([2,9,10,12,14,16,17,21,25,27,29,33,34,35,36,37,40,41,42,43,44,45,46,48,49,50,51,52,69,73,87,90,91,92,93,98,99,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,124,126,128,130,131,133,136,137,],[-26,55,-21,-22,-20,-18,-19,-40,-23,-24,66,-47,-43,-46,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-25,-27,-29,66,-73,-72,125,-68,-65,-64,-33,-34,-62,-84,-85,-55,-57,-56,-83,-58,-60,-59,-86,-61,-81,-82,-87,-54,-67,-63,-28,-74,-75,-41,-69,-66,]),':':([21,34,36,37,40,41,42,43,44,45,46,48,49,73,87,93,107,110,111,112,114,115,116,118,122,124,126,130,131,132,133,],[-40,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,-72,-64,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,-74,-75,139,-41,]),'=':([13,18,21,23,63,133,143,],[62,-31,-40,-32,100,-41,-45,]),'<':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,93,107,110,111,112,114,115,116,118,122,124,126,130,131,133,],[-40,-43,83,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,83,-72,-64,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,-74,-75,-41,]),'$end':([3,7,8,24,26,28,32,54,55,66,104,106,138,141,145,146,],[-6,-15,0,-1,-14,-7,-5,-2,-8,-9,-10,-11,-16,-12,-17,-13,]),'LOAD':([0,2,3,4,7,8,21,24,26,28,30,32,34,36,37,38,39,40,41,42,43,44,45,46,47,48,49,53,54,55,56,57,58,59,60,61,62,64,65,66,68,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,87,88,89,93,94,100,104,106,107,110,111,112,114,115,116,118,122,124,125,126,127,129,130,131,133,134,135,138,139,141,142,144,145,146,],[1,1,-6,1,-15,1,-40,-1,-14,-7,1,-5,-43,-30,-49,1,1,-70,-44,-52,-53,-51,-48,-42,1,-71,-50,1,-2,-8,1,-37,1,-39,-38,-36,-35,1,1,-9,1,1,1,1,-73,1,1,1,1,1,1,1,1,1,1,1,-72,1,1,-64,1,1,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,1,-63,1,1,-74,-75,-41,1,1,-16,1,-12,1,1,-17,-13,]),'EYE':([0,2,3,4,7,8,21,24,26,28,30,32,34,36,37,38,39,40,41,42,43,44,45,46,47,48,49,53,54,55,56,57,58,59,60,61,62,64,65,66,68,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,87,88,89,93,94,100,104,106,107,110,111,112,114,115,116,118,122,124,125,126,127,129,130,131,133,134,135,138,139,141,142,144,145,146,],[6,6,-6,6,-15,6,-40,-1,-14,-7,6,-5,-43,-30,-49,6,6,-70,-44,-52,-53,-51,-48,-42,6,-71,-50,6,-2,-8,6,-37,6,-39,-38,-36,-35,6,6,-9,6,6,6,6,-73,6,6,6,6,6,6,6,6,6,6,6,-72,6,6,-64,6,6,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,6,-63,6,6,-74,-75,-41,6,6,-16,6,-12,6,6,-17,-13,]),'STRING':([2,4,38,39,47,53,56,57,58,59,60,61,62,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[36,36,36,36,36,36,36,-37,36,-39,-38,-36,-35,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,]),'FOR':([0,3,7,8,21,24,26,28,30,32,34,36,37,40,41,42,43,44,45,46,48,49,54,55,66,68,73,87,93,104,106,107,110,111,112,114,115,116,118,122,124,126,129,130,131,133,135,138,141,142,144,145,146,],[15,-6,-15,15,-40,-1,-14,-7,15,-5,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-2,-8,-9,15,-73,-72,-64,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,15,-74,-75,-41,15,-16,-12,15,15,-17,-13,]),'ELSE':([3,7,26,28,32,55,66,104,106,138,141,145,146,],[-6,-15,-14,-7,-5,-8,-9,-10,-11,-16,144,-17,-13,]),'>':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,93,107,110,111,112,114,115,116,118,122,124,126,130,131,133,],[-40,-43,84,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,84,-72,-64,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,-74,-75,-41,]),'GE':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,93,107,110,111,112,114,115,116,118,122,124,126,130,131,133,],[-40,-43,81,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,81,-72,-64,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,-74,-75,-41,]),'ONES':([0,2,3,4,7,8,21,24,26,28,30,32,34,36,37,38,39,40,41,42,43,44,45,46,47,48,49,53,54,55,56,57,58,59,60,61,62,64,65,66,68,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,87,88,89,93,94,100,104,106,107,110,111,112,114,115,116,118,122,124,125,126,127,129,130,131,133,134,135,138,139,141,142,144,145,146,],[19,19,-6,19,-15,19,-40,-1,-14,-7,19,-5,-43,-30,-49,19,19,-70,-44,-52,-53,-51,-48,-42,19,-71,-50,19,-2,-8,19,-37,19,-39,-38,-36,-35,19,19,-9,19,19,19,19,-73,19,19,19,19,19,19,19,19,19,19,19,-72,19,19,-64,19,19,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,19,-63,19,19,-74,-75,-41,19,19,-16,19,-12,19,19,-17,-13,]),'ZEROS':([0,2,3,4,7,8,21,24,26,28,30,32,34,36,37,38,39,40,41,42,43,44,45,46,47,48,49,53,54,55,56,57,58,59,60,61,62,64,65,66,68,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,87,88,89,93,94,100,104,106,107,110,111,112,114,115,116,118,122,124,125,126,127,129,130,131,133,134,135,138,139,141,142,144,145,146,],[20,20,-6,20,-15,20,-40,-1,-14,-7,20,-5,-43,-30,-49,20,20,-70,-44,-52,-53,-51,-48,-42,20,-71,-50,20,-2,-8,20,-37,20,-39,-38,-36,-35,20,20,-9,20,20,20,20,-73,20,20,20,20,20,20,20,20,20,20,20,-72,20,20,-64,20,20,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,20,-63,20,20,-74,-75,-41,20,20,-16,20,-12,20,20,-17,-13,]),'[':([2,4,18,21,38,39,41,47,53,56,57,58,59,60,61,62,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,133,134,139,],[47,47,64,-40,47,47,89,47,47,47,-37,47,-39,-38,-36,-35,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,-41,47,47,]),'DOTSUB':([21,34,35,36,37,40,41,42,43,44,45,46,48,49,73,86,87,92,93,102,107,108,109,110,111,112,113,114,115,116,117,118,119,120,122,123,124,126,130,131,132,133,137,140,142,],[-40,-43,79,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-73,79,-72,79,-64,79,-62,79,79,79,-57,79,79,-58,-60,-59,79,-61,79,79,-54,79,-67,-63,-74,-75,79,-41,79,79,79,]),']':([21,34,36,37,40,41,42,43,44,45,46,47,48,49,73,87,90,91,92,93,101,102,107,110,111,112,114,115,116,118,122,124,126,130,131,133,136,137,140,],[-40,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,93,-71,-50,-73,-72,124,126,-65,-64,133,-65,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,-74,-75,-41,-69,-66,143,]),'ID':([0,2,3,4,7,8,15,21,24,26,28,30,32,34,36,37,38,39,40,41,42,43,44,45,46,47,48,49,53,54,55,56,57,58,59,60,61,62,64,65,66,68,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,87,88,89,93,94,100,104,106,107,110,111,112,114,115,116,118,122,124,125,126,127,129,130,131,133,134,135,138,139,141,142,144,145,146,],[21,21,-6,21,-15,21,63,-40,-1,-14,-7,21,-5,-43,-30,-49,21,21,-70,-44,-52,-53,-51,-48,-42,21,-71,-50,21,-2,-8,21,-37,21,-39,-38,-36,-35,21,21,-9,21,21,21,21,-73,21,21,21,21,21,21,21,21,21,21,21,-72,21,21,-64,21,21,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,21,-63,21,21,-74,-75,-41,21,21,-16,21,-12,21,21,-17,-13,]),'IF':([0,3,7,8,21,24,26,28,30,32,34,36,37,40,41,42,43,44,45,46,48,49,54,55,66,68,73,87,93,104,106,107,110,111,112,114,115,116,118,122,124,126,129,130,131,133,135,138,141,142,144,145,146,],[22,-6,-15,22,-40,-1,-14,-7,22,-5,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-2,-8,-9,22,-73,-72,-64,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,22,-74,-75,-41,22,-16,-12,22,22,-17,-13,]),'BREAK':([0,3,7,8,21,24,26,28,30,32,34,36,37,40,41,42,43,44,45,46,48,49,54,55,66,68,73,87,93,104,106,107,110,111,112,114,115,116,118,122,124,126,129,130,131,133,135,138,141,142,144,145,146,],[25,-6,-15,25,-40,-1,-14,-7,25,-5,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-2,-8,-9,25,-73,-72,-64,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,25,-74,-75,-41,25,-16,-12,25,25,-17,-13,]),'CONTINUE':([0,3,7,8,21,24,26,28,30,32,34,36,37,40,41,42,43,44,45,46,48,49,54,55,66,68,73,87,93,104,106,107,110,111,112,114,115,116,118,122,124,126,129,130,131,133,135,138,141,142,144,145,146,],[27,-6,-15,27,-40,-1,-14,-7,27,-5,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-2,-8,-9,27,-73,-72,-64,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,27,-74,-75,-41,27,-16,-12,27,27,-17,-13,]),'MULASSIGN':([13,18,21,23,133,143,],[60,-31,-40,-32,-41,-45,]),'error':([0,3,7,8,21,24,26,28,30,32,34,36,37,40,41,42,43,44,45,46,48,49,54,55,56,66,68,73,87,93,104,106,107,110,111,112,114,115,116,118,122,124,126,129,130,131,133,135,138,141,142,144,145,146,],[29,-6,-15,29,-40,-1,-14,-7,69,-5,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-2,-8,97,-9,29,-73,-72,-64,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,29,-74,-75,-41,29,-16,-12,29,29,-17,-13,]),'{':([0,3,7,8,21,24,26,28,30,32,34,36,37,40,41,42,43,44,45,46,48,49,54,55,66,68,73,87,93,104,106,107,110,111,112,114,115,116,118,122,124,126,129,130,131,133,135,138,141,142,144,145,146,],[30,-6,-15,30,-40,-1,-14,-7,30,-5,-43,-30,-49,-70,-44,-52,-53,-51,-48,-42,-71,-50,-2,-8,-9,30,-73,-72,-64,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,-63,30,-74,-75,-41,30,-16,-12,30,30,-17,-13,]),'SAVE':([0,2,3,4,7,8,21,24,26,28,30,32,34,36,37,38,39,40,41,42,43,44,45,46,47,48,49,53,54,55,56,57,58,59,60,61,62,64,65,66,68,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,87,88,89,93,94,100,104,106,107,110,111,112,114,115,116,118,122,124,125,126,127,129,130,131,133,134,135,138,139,141,142,144,145,146,],[31,31,-6,31,-15,31,-40,-1,-14,-7,31,-5,-43,-30,-49,31,31,-70,-44,-52,-53,-51,-48,-42,31,-71,-50,31,-2,-8,31,-37,31,-39,-38,-36,-35,31,31,-9,31,31,31,31,-73,31,31,31,31,31,31,31,31,31,31,31,-72,31,31,-64,31,31,-10,-11,-62,-55,-57,-56,-58,-60,-59,-61,-54,-67,31,-63,31,31,-74,-75,-41,31,31,-16,31,-12,31,31,-17,-13,]),'}':([3,7,26,28,32,55,66,67,68,69,104,105,106,138,141,145,146,],[-6,-15,-14,-7,-5,-8,-9,104,-3,106,-10,-4,-11,-16,-12,-17,-13,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'instructions':([0,2,8,],[1,26,29,]),'instruction':([0,2,8,100,101,137,138,],[2,2,2,129,130,140,141,]),'block':([0,2,8,100,101,137,138,],[3,3,3,3,3,3,3,]),'conditional':([0,2,8,100,101,137,138,],[4,4,4,4,4,4,4,]),'loop':([0,2,8,100,101,137,138,],[5,5,5,5,5,5,5,]),'statement':([0,2,8,100,101,137,138,],[6,6,6,6,6,6,6,]),'while':([0,2,8,100,101,137,138,],[10,10,10,10,10,10,10,]),'for':([0,2,8,100,101,137,138,],[11,11,11,11,11,11,11,]),'assignment':([0,2,8,100,101,137,138,],[12,12,12,12,12,12,12,]),'flow_keyword':([0,2,8,100,101,137,138,],[13,13,13,13,13,13,13,]),'return':([0,2,8,100,101,137,138,],[14,14,14,14,14,14,14,]),'print':([0,2,8,100,101,137,138,],[15,15,15,15,15,15,15,]),'assignment_var':([0,2,8,100,101,137,138,],[19,19,19,19,19,19,19,]),'var':([0,2,8,22,23,31,32,34,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,100,101,121,123,128,131,137,138,],[24,24,24,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,24,24,53,53,53,53,24,24,]),'array_range':([0,2,8,100,101,137,138,],[25,25,25,25,25,25,25,]),'assignment_operand':([19,],[34,]),'expression':([22,23,31,32,34,97,],[40,63,67,68,70,63,]),'numeric_expression':([22,23,31,32,34,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[41,41,41,41,41,87,89,95,99,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,119,95,95,41,95,133,136,138,]),'comparison_expression':([22,23,31,32,34,49,97,],[42,42,42,42,42,88,42,]),'number':([22,23,31,32,34,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,]),'matrix':([22,23,31,32,34,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,]),'vector':([22,23,31,32,34,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,]),'string':([22,23,31,32,34,35,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[46,46,46,46,46,71,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,]),'unary_operation':([22,23,31,32,34,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,]),'function':([22,23,31,32,34,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,]),'negation':([22,23,31,32,34,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,]),'transposition':([22,23,31,32,34,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,]),'function_name':([22,23,31,32,34,49,50,54,64,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,90,91,96,97,121,123,128,131,],[58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,]),'print_body':([23,97,],[62,126,]),'matrix_body':([54,],[92,]),'vector_body':([54,64,91,96,121,],[94,98,98,124,132,]),}
+_lr_goto_items = {'matrix_body':([47,],[90,]),'conditional':([0,8,30,68,129,135,142,144,],[3,3,3,3,3,3,3,3,]),'number':([2,4,38,39,47,53,56,58,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,]),'vector_body':([47,56,64,89,125,],[91,96,101,101,136,]),'numeric_expression':([2,4,38,39,47,53,56,58,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[35,35,86,87,92,35,92,35,102,35,107,108,109,110,111,112,113,114,115,116,117,118,119,120,123,92,35,132,92,137,140,142,]),'matrix':([2,4,38,39,47,53,56,58,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,]),'for':([0,8,30,68,129,135,142,144,],[7,7,7,7,7,7,7,7,]),'negation':([2,4,38,39,47,53,56,58,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,]),'program':([0,],[8,]),'statement':([0,8,30,68,129,135,142,144,],[9,9,9,9,9,9,9,9,]),'print':([0,8,30,68,129,135,142,144,],[10,10,10,10,10,10,10,10,]),'unary_operation':([2,4,38,39,47,53,56,58,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,]),'function_name':([0,2,4,8,30,38,39,47,53,56,58,64,65,68,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,129,134,135,139,142,144,],[11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,]),'function':([0,2,4,8,30,38,39,47,53,56,58,64,65,68,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,129,134,135,139,142,144,],[12,43,43,12,12,43,43,43,43,43,43,43,43,12,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,12,43,12,43,12,12,]),'assignment_var':([0,8,30,68,129,135,142,144,],[13,13,13,13,13,13,13,13,]),'return':([0,8,30,68,129,135,142,144,],[14,14,14,14,14,14,14,14,]),'string':([2,4,38,39,47,53,56,58,62,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[44,44,44,44,44,44,44,44,99,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,]),'assignment':([0,8,30,68,129,135,142,144,],[16,16,16,16,16,16,16,16,]),'comparison_expression':([2,4,38,53,58,65,94,],[33,33,85,33,33,33,33,]),'flow_keyword':([0,8,30,68,129,135,142,144,],[17,17,17,17,17,17,17,17,]),'var':([0,2,4,8,30,38,39,47,53,56,58,64,65,68,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,129,134,135,139,142,144,],[18,41,41,18,18,41,41,41,41,41,41,41,41,18,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,18,41,18,41,18,18,]),'assignment_operand':([13,],[58,]),'instructions':([30,68,],[67,105,]),'print_body':([4,94,],[51,128,]),'array_range':([0,8,30,68,129,135,142,144,],[23,23,23,23,23,23,23,23,]),'instruction':([0,8,30,68,129,135,142,144,],[24,54,68,68,138,141,145,146,]),'while':([0,8,30,68,129,135,142,144,],[26,26,26,26,26,26,26,26,]),'vector':([2,4,38,39,47,53,56,58,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,]),'block':([0,8,30,68,129,135,142,144,],[32,32,32,32,32,32,32,32,]),'expression':([2,4,53,58,65,94,],[50,52,95,98,103,52,]),'transposition':([2,4,38,39,47,53,56,58,64,65,70,71,72,74,75,76,77,78,79,80,81,82,83,84,88,89,94,100,125,127,134,139,],[48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,]),'loop':([0,8,30,68,129,135,142,144,],[28,28,28,28,28,28,28,28,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -26,87 +26,92 @@ for _k, _v in _lr_goto_items.items():
        _lr_goto[_x][_k] = _y
 del _lr_goto_items
 _lr_productions = [
-  ("S' -> instructions","S'",1,None,None,None),
-  ('instructions -> instruction','instructions',1,'p_instructions','Mparser.py',39),
-  ('instructions -> instruction instructions','instructions',2,'p_instructions','Mparser.py',40),
-  ('instruction -> block','instruction',1,'p_instruction','Mparser.py',49),
-  ('instruction -> conditional','instruction',1,'p_instruction','Mparser.py',50),
-  ('instruction -> loop','instruction',1,'p_instruction','Mparser.py',51),
-  ('instruction -> statement ;','instruction',2,'p_instruction','Mparser.py',52),
-  ('instruction -> error ;','instruction',2,'p_instruction','Mparser.py',53),
-  ('block -> { instructions }','block',3,'p_block','Mparser.py',60),
-  ('block -> { error }','block',3,'p_block','Mparser.py',61),
-  ('conditional -> IF ( expression ) instruction','conditional',5,'p_conditional','Mparser.py',68),
-  ('conditional -> IF ( expression ) instruction ELSE instruction','conditional',7,'p_conditional','Mparser.py',69),
-  ('loop -> while','loop',1,'p_loop','Mparser.py',80),
-  ('loop -> for','loop',1,'p_loop','Mparser.py',81),
-  ('while -> WHILE ( expression ) instruction','while',5,'p_while','Mparser.py',86),
-  ('for -> FOR ID = numeric_expression : numeric_expression instruction','for',7,'p_for','Mparser.py',91),
-  ('statement -> assignment','statement',1,'p_statement','Mparser.py',98),
-  ('statement -> flow_keyword','statement',1,'p_statement','Mparser.py',99),
-  ('statement -> return','statement',1,'p_statement','Mparser.py',100),
-  ('statement -> print','statement',1,'p_statement','Mparser.py',101),
-  ('flow_keyword -> BREAK','flow_keyword',1,'p_flow_keyword','Mparser.py',106),
-  ('flow_keyword -> CONTINUE','flow_keyword',1,'p_flow_keyword','Mparser.py',107),
-  ('return -> RETURN expression','return',2,'p_return','Mparser.py',112),
-  ('return -> RETURN','return',1,'p_return','Mparser.py',113),
-  ('print -> PRINT print_body','print',2,'p_print','Mparser.py',121),
-  ('print_body -> expression , print_body','print_body',3,'p_print_body','Mparser.py',126),
-  ('print_body -> expression','print_body',1,'p_print_body','Mparser.py',127),
-  ('string -> STRING','string',1,'p_string','Mparser.py',135),
-  ('assignment_var -> var','assignment_var',1,'p_assignment_var','Mparser.py',142),
-  ('assignment_var -> array_range','assignment_var',1,'p_assignment_var','Mparser.py',143),
-  ('assignment -> assignment_var assignment_operand expression','assignment',3,'p_assignment','Mparser.py',148),
-  ('assignment -> assignment_var = string','assignment',3,'p_assignment','Mparser.py',149),
-  ('assignment_operand -> =','assignment_operand',1,'p_assignment_operand','Mparser.py',154),
-  ('assignment_operand -> ADDASSIGN','assignment_operand',1,'p_assignment_operand','Mparser.py',155),
-  ('assignment_operand -> SUBASSIGN','assignment_operand',1,'p_assignment_operand','Mparser.py',156),
-  ('assignment_operand -> MULASSIGN','assignment_operand',1,'p_assignment_operand','Mparser.py',157),
-  ('assignment_operand -> DIVASSIGN','assignment_operand',1,'p_assignment_operand','Mparser.py',158),
-  ('var -> ID','var',1,'p_var','Mparser.py',165),
-  ('var -> var [ vector_body ]','var',4,'p_var','Mparser.py',166),
-  ('number -> INTNUM','number',1,'p_number','Mparser.py',174),
-  ('number -> FLOATNUM','number',1,'p_number','Mparser.py',175),
-  ('number -> var','number',1,'p_number','Mparser.py',176),
-  ('array_range -> var [ numeric_expression , numeric_expression ]','array_range',6,'p_array_range','Mparser.py',186),
-  ('expression -> numeric_expression','expression',1,'p_expression','Mparser.py',193),
-  ('expression -> comparison_expression','expression',1,'p_expression','Mparser.py',194),
-  ('numeric_expression -> number','numeric_expression',1,'p_numeric_expression','Mparser.py',201),
-  ('numeric_expression -> matrix','numeric_expression',1,'p_numeric_expression','Mparser.py',202),
-  ('numeric_expression -> vector','numeric_expression',1,'p_numeric_expression','Mparser.py',203),
-  ('numeric_expression -> string','numeric_expression',1,'p_numeric_expression','Mparser.py',204),
-  ('numeric_expression -> unary_operation','numeric_expression',1,'p_numeric_expression','Mparser.py',205),
-  ('numeric_expression -> function','numeric_expression',1,'p_numeric_expression','Mparser.py',206),
-  ('numeric_expression -> ( numeric_expression )','numeric_expression',3,'p_numeric_expression','Mparser.py',207),
-  ('numeric_expression -> numeric_expression + numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',217),
-  ('numeric_expression -> numeric_expression - numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',218),
-  ('numeric_expression -> numeric_expression * numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',219),
-  ('numeric_expression -> numeric_expression / numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',220),
-  ('numeric_expression -> numeric_expression DOTADD numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',221),
-  ('numeric_expression -> numeric_expression DOTSUB numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',222),
-  ('numeric_expression -> numeric_expression DOTMUL numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',223),
-  ('numeric_expression -> numeric_expression DOTDIV numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',224),
-  ('vector -> [ vector_body ]','vector',3,'p_vector','Mparser.py',231),
-  ('vector -> [ ]','vector',2,'p_vector','Mparser.py',232),
-  ('vector_body -> numeric_expression','vector_body',1,'p_vector_body','Mparser.py',240),
-  ('vector_body -> vector_body , numeric_expression','vector_body',3,'p_vector_body','Mparser.py',241),
-  ('matrix -> [ matrix_body ]','matrix',3,'p_matrix','Mparser.py',249),
-  ('matrix_body -> vector_body','matrix_body',1,'p_matrix_body','Mparser.py',254),
-  ('matrix_body -> matrix_body ; vector_body','matrix_body',3,'p_matrix_body','Mparser.py',255),
-  ('unary_operation -> negation','unary_operation',1,'p_unary_operation','Mparser.py',266),
-  ('unary_operation -> transposition','unary_operation',1,'p_unary_operation','Mparser.py',267),
-  ('negation -> - numeric_expression','negation',2,'p_negation','Mparser.py',272),
-  ("transposition -> numeric_expression '",'transposition',2,'p_transposition','Mparser.py',277),
-  ('function -> function_name ( vector_body )','function',4,'p_function','Mparser.py',284),
-  ('function -> function_name ( error )','function',4,'p_function','Mparser.py',285),
-  ('function_name -> EYE','function_name',1,'p_function_name','Mparser.py',290),
-  ('function_name -> ZEROS','function_name',1,'p_function_name','Mparser.py',291),
-  ('function_name -> ONES','function_name',1,'p_function_name','Mparser.py',292),
-  ('comparison_expression -> numeric_expression < numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',299),
-  ('comparison_expression -> numeric_expression > numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',300),
-  ('comparison_expression -> numeric_expression EQUAL numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',301),
-  ('comparison_expression -> numeric_expression NOTEQUAL numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',302),
-  ('comparison_expression -> numeric_expression LE numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',303),
-  ('comparison_expression -> numeric_expression GE numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',304),
-  ('comparison_expression -> ( comparison_expression )','comparison_expression',3,'p_comparison_expression','Mparser.py',305),
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> instruction','program',1,'p_program','Mparser.py',43),
+  ('program -> program instruction','program',2,'p_program','Mparser.py',44),
+  ('instructions -> instruction','instructions',1,'p_instructions','Mparser.py',60),
+  ('instructions -> instruction instructions','instructions',2,'p_instructions','Mparser.py',61),
+  ('instruction -> block','instruction',1,'p_instruction','Mparser.py',70),
+  ('instruction -> conditional','instruction',1,'p_instruction','Mparser.py',71),
+  ('instruction -> loop','instruction',1,'p_instruction','Mparser.py',72),
+  ('instruction -> statement ;','instruction',2,'p_instruction','Mparser.py',73),
+  ('instruction -> error ;','instruction',2,'p_instruction','Mparser.py',74),
+  ('block -> { instructions }','block',3,'p_block','Mparser.py',81),
+  ('block -> { error }','block',3,'p_block','Mparser.py',82),
+  ('conditional -> IF ( expression ) instruction','conditional',5,'p_conditional','Mparser.py',89),
+  ('conditional -> IF ( expression ) instruction ELSE instruction','conditional',7,'p_conditional','Mparser.py',90),
+  ('loop -> while','loop',1,'p_loop','Mparser.py',101),
+  ('loop -> for','loop',1,'p_loop','Mparser.py',102),
+  ('while -> WHILE ( expression ) instruction','while',5,'p_while','Mparser.py',107),
+  ('for -> FOR ID = numeric_expression : numeric_expression instruction','for',7,'p_for','Mparser.py',112),
+  ('statement -> assignment','statement',1,'p_statement','Mparser.py',119),
+  ('statement -> flow_keyword','statement',1,'p_statement','Mparser.py',120),
+  ('statement -> return','statement',1,'p_statement','Mparser.py',121),
+  ('statement -> print','statement',1,'p_statement','Mparser.py',122),
+  ('statement -> function','statement',1,'p_statement','Mparser.py',123),
+  ('flow_keyword -> BREAK','flow_keyword',1,'p_flow_keyword','Mparser.py',128),
+  ('flow_keyword -> CONTINUE','flow_keyword',1,'p_flow_keyword','Mparser.py',129),
+  ('return -> RETURN expression','return',2,'p_return','Mparser.py',134),
+  ('return -> RETURN','return',1,'p_return','Mparser.py',135),
+  ('print -> PRINT print_body','print',2,'p_print','Mparser.py',143),
+  ('print_body -> expression , print_body','print_body',3,'p_print_body','Mparser.py',148),
+  ('print_body -> expression','print_body',1,'p_print_body','Mparser.py',149),
+  ('string -> STRING','string',1,'p_string','Mparser.py',157),
+  ('assignment_var -> var','assignment_var',1,'p_assignment_var','Mparser.py',164),
+  ('assignment_var -> array_range','assignment_var',1,'p_assignment_var','Mparser.py',165),
+  ('assignment -> assignment_var assignment_operand expression','assignment',3,'p_assignment','Mparser.py',170),
+  ('assignment -> assignment_var = string','assignment',3,'p_assignment','Mparser.py',171),
+  ('assignment_operand -> =','assignment_operand',1,'p_assignment_operand','Mparser.py',176),
+  ('assignment_operand -> ADDASSIGN','assignment_operand',1,'p_assignment_operand','Mparser.py',177),
+  ('assignment_operand -> SUBASSIGN','assignment_operand',1,'p_assignment_operand','Mparser.py',178),
+  ('assignment_operand -> MULASSIGN','assignment_operand',1,'p_assignment_operand','Mparser.py',179),
+  ('assignment_operand -> DIVASSIGN','assignment_operand',1,'p_assignment_operand','Mparser.py',180),
+  ('var -> ID','var',1,'p_var','Mparser.py',187),
+  ('var -> var [ vector_body ]','var',4,'p_var','Mparser.py',188),
+  ('number -> INTNUM','number',1,'p_number','Mparser.py',196),
+  ('number -> FLOATNUM','number',1,'p_number','Mparser.py',197),
+  ('number -> var','number',1,'p_number','Mparser.py',198),
+  ('array_range -> var [ numeric_expression , numeric_expression ]','array_range',6,'p_array_range','Mparser.py',208),
+  ('expression -> numeric_expression','expression',1,'p_expression','Mparser.py',215),
+  ('expression -> comparison_expression','expression',1,'p_expression','Mparser.py',216),
+  ('numeric_expression -> number','numeric_expression',1,'p_numeric_expression','Mparser.py',223),
+  ('numeric_expression -> matrix','numeric_expression',1,'p_numeric_expression','Mparser.py',224),
+  ('numeric_expression -> vector','numeric_expression',1,'p_numeric_expression','Mparser.py',225),
+  ('numeric_expression -> string','numeric_expression',1,'p_numeric_expression','Mparser.py',226),
+  ('numeric_expression -> unary_operation','numeric_expression',1,'p_numeric_expression','Mparser.py',227),
+  ('numeric_expression -> function','numeric_expression',1,'p_numeric_expression','Mparser.py',228),
+  ('numeric_expression -> ( numeric_expression )','numeric_expression',3,'p_numeric_expression','Mparser.py',229),
+  ('numeric_expression -> numeric_expression + numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',239),
+  ('numeric_expression -> numeric_expression - numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',240),
+  ('numeric_expression -> numeric_expression * numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',241),
+  ('numeric_expression -> numeric_expression / numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',242),
+  ('numeric_expression -> numeric_expression DOTADD numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',243),
+  ('numeric_expression -> numeric_expression DOTSUB numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',244),
+  ('numeric_expression -> numeric_expression DOTMUL numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',245),
+  ('numeric_expression -> numeric_expression DOTDIV numeric_expression','numeric_expression',3,'p_binary_numeric_expression','Mparser.py',246),
+  ('vector -> [ vector_body ]','vector',3,'p_vector','Mparser.py',253),
+  ('vector -> [ ]','vector',2,'p_vector','Mparser.py',254),
+  ('vector_body -> numeric_expression','vector_body',1,'p_vector_body','Mparser.py',262),
+  ('vector_body -> vector_body , numeric_expression','vector_body',3,'p_vector_body','Mparser.py',263),
+  ('matrix -> [ matrix_body ]','matrix',3,'p_matrix','Mparser.py',271),
+  ('matrix_body -> vector_body','matrix_body',1,'p_matrix_body','Mparser.py',276),
+  ('matrix_body -> matrix_body ; vector_body','matrix_body',3,'p_matrix_body','Mparser.py',277),
+  ('unary_operation -> negation','unary_operation',1,'p_unary_operation','Mparser.py',288),
+  ('unary_operation -> transposition','unary_operation',1,'p_unary_operation','Mparser.py',289),
+  ('negation -> - numeric_expression','negation',2,'p_negation','Mparser.py',294),
+  ("transposition -> numeric_expression '",'transposition',2,'p_transposition','Mparser.py',299),
+  ('function -> function_name ( vector_body )','function',4,'p_function','Mparser.py',306),
+  ('function -> function_name ( error )','function',4,'p_function','Mparser.py',307),
+  ('function_name -> EYE','function_name',1,'p_function_name','Mparser.py',312),
+  ('function_name -> ZEROS','function_name',1,'p_function_name','Mparser.py',313),
+  ('function_name -> ONES','function_name',1,'p_function_name','Mparser.py',314),
+  ('function_name -> LOAD','function_name',1,'p_function_name','Mparser.py',315),
+  ('function_name -> SAVE','function_name',1,'p_function_name','Mparser.py',316),
+  ('comparison_expression -> numeric_expression < numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',323),
+  ('comparison_expression -> numeric_expression > numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',324),
+  ('comparison_expression -> numeric_expression EQUAL numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',325),
+  ('comparison_expression -> numeric_expression NOTEQUAL numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',326),
+  ('comparison_expression -> numeric_expression LE numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',327),
+  ('comparison_expression -> numeric_expression GE numeric_expression','comparison_expression',3,'p_comparison_expression','Mparser.py',328),
+  ('comparison_expression -> ( comparison_expression )','comparison_expression',3,'p_comparison_expression','Mparser.py',329),
 ]
@@ -1,5 +1,7 @@
 #!/usr/bin/env python2
 
+import re
+from functools import partial
 import ply.lex as lex
 
 reserved = {
@@ -12,6 +14,8 @@ reserved = {
     'eye': 'EYE',
     'zeros': 'ZEROS',
     'ones': 'ONES',
+    'load': 'LOAD',
+    'save': 'SAVE',
     'return': 'RETURN',
     'print': 'PRINT'
 }
@@ -81,3 +85,81 @@ literals = "+-*/=<>()[]{}:',;"
 lexer = lex.lex()
 fh = None
 
+
+class FastLexer(object):
+    # Alternative to the ply lexer producing the same LexToken stream. All rules are compiled into
+    # a single pattern that also swallows the ignored text in front of every token, so the scanning
+    # loop sees exactly one match per token and never calls back into per-rule functions.
+    # Implements the part of the ply lexer interface used by the parsers (input, token, lineno, lexdata).
+
+    def __init__(self):
+        self.lineno = 1
+        self.lexdata = None
+        self.encountered_error = False
+        self.token = lambda: None
+        # operator tokens are plain escaped strings, keyed here by their text
+        self.operators = dict((re.sub(r'\\(.)', r'\1', rule), name[2:]) for name, rule in globals().items()
+                              if name.startswith('t_') and isinstance(rule, str) and name[2:] in tokens)
+        self._pattern = self._compile()
+
+    def _compile(self):
+        ignored = r'(?:[%s]|\n|%s)*' % (re.escape(t_ignore), t_ignore_comment)
+        alternatives = [
+            ('ID', t_ID.__doc__),
+            ('FLOATNUM', t_FLOATNUM.__doc__),
+            ('INTNUM', t_INTNUM.__doc__),
+            ('STRING', t_STRING.__doc__),
+            ('operator', '|'.join(re.escape(op) for op in sorted(self.operators, key=len, reverse=True))),
+            ('literal', '[%s]' % re.escape(literals)),
+            ('end', r'\Z'),
+            ('illegal', r'[\s\S]')
+        ]
+        return re.compile(ignored + '(?:' + '|'.join('(?P<%s>%s)' % a for a in alternatives) + ')')
+
+    def input(self, text):
+        self.lexdata = text
+        # bound directly to the generator, the parser calls token() once per token
+        self.token = partial(next, self._scan(text), None)
+
+    def _scan(self, text):
+        LexToken = lex.LexToken
+        get_reserved = reserved.get
+        operators = self.operators
+        count_lines = text.count
+        lineno = self.lineno
+        last = 0
+
+        for m in self._pattern.finditer(text):
+            kind = m.lastgroup
+            start = m.start(kind)
+            lineno += count_lines('\n', last, start)
+            last = start
+            value = m.group(kind)
+
+            tok = LexToken()
+            if kind == 'ID':
+                tok.type = get_reserved(value, 'ID')
+            elif kind == 'literal':
+                tok.type = value
+            elif kind == 'operator':
+                tok.type = operators[value]
+            elif kind == 'INTNUM':
+                tok.type = kind
+                value = int(value)
+            elif kind == 'FLOATNUM':
+                tok.type = kind
+                value = float(value)
+            elif kind == 'STRING':
+                tok.type = kind
+            elif kind == 'illegal':
+                self.lineno = lineno
+                print("Illegal character %s" % value + " at line %s" % lineno)
+                continue
+            else:
+                break
+            tok.value = value
+            tok.lineno = lineno
+            tok.lexpos = start
+            yield tok
+
+        self.lineno = lineno + count_lines('\n', last)